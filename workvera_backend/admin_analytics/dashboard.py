@@ -0,0 +1,104 @@
+# admin_analytics/dashboard.py
+"""
+Admin dashboard statistics (GET /api/admin_analytics/admin/stats/).
+
+The numbers are computed with conditional aggregation (one query per table) and
+stored in the cache as a snapshot: one key per metric, all expiring together after
+``ADMIN_STATS_SNAPSHOT_TTL`` seconds. Between snapshots the post_save / post_delete
+signals in admin_analytics/models.py adjust the keys with ``cache.incr``/``decr``, so
+a warm read is a single ``get_many`` and no SQL at all.
+
+Changes the signals can't express as +1/-1 (a user's role or a job's is_active flag
+changing on save, queryset.update() calls) drop the snapshot instead; the next read
+recomputes it.
+"""
+from datetime import datetime, time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from jobs.models import Application, JobPost
+from skills.models import SkillTest
+
+KEY_PREFIX = 'admin_analytics:stats:'
+DAY_KEY = KEY_PREFIX + 'day'  # date the snapshot's applications_today refers to
+
+METRICS = (
+    'total_users',
+    'total_job_seekers',
+    'total_employers',
+    'total_job_posts',
+    'active_job_posts',
+    'total_applications',
+    'applications_today',
+    'total_skill_tests',
+)
+
+
+def _ttl():
+    return getattr(settings, 'ADMIN_STATS_SNAPSHOT_TTL', 300)
+
+
+def _key(metric):
+    return KEY_PREFIX + metric
+
+
+def start_of_today():
+    return timezone.make_aware(datetime.combine(timezone.localdate(), time.min))
+
+
+def compute():
+    """All metrics from the database: four aggregate queries, one per table."""
+    users = get_user_model().objects.aggregate(
+        total_users=Count('id'),
+        total_job_seekers=Count('id', filter=Q(role='seeker')),
+        total_employers=Count('id', filter=Q(role='employer')),
+    )
+    jobs = JobPost.objects.aggregate(
+        total_job_posts=Count('id'),
+        active_job_posts=Count('id', filter=Q(is_active=True)),
+    )
+    applications = Application.objects.aggregate(
+        total_applications=Count('id'),
+        applications_today=Count('id', filter=Q(applied_at__gte=start_of_today())),
+    )
+    tests = SkillTest.objects.aggregate(total_skill_tests=Count('id'))
+    return {**users, **jobs, **applications, **tests}
+
+
+def get_stats(refresh=False):
+    """Current metrics, from the cached snapshot when it is complete and from today."""
+    today = timezone.localdate().isoformat()
+    if not refresh:
+        cached = cache.get_many([DAY_KEY, *(_key(metric) for metric in METRICS)])
+        if cached.get(DAY_KEY) == today and all(_key(metric) in cached for metric in METRICS):
+            return {metric: cached[_key(metric)] for metric in METRICS}
+    stats = compute()
+    snapshot = {_key(metric): value for metric, value in stats.items()}
+    snapshot[DAY_KEY] = today
+    cache.set_many(snapshot, _ttl())
+    return stats
+
+
+def invalidate():
+    """Drop the snapshot; the next read recomputes it."""
+    cache.delete_many([DAY_KEY, *(_key(metric) for metric in METRICS)])
+
+
+def adjust(metric, delta):
+    """
+    Apply +1/-1 to a metric of the current snapshot. Without a snapshot there is
+    nothing to adjust: the next read computes fresh numbers anyway.
+    """
+    try:
+        cache.incr(_key(metric), delta)
+    except ValueError:
+        pass
+
+
+def counts_today(moment):
+    """Whether a timestamp falls on the day the snapshot's applications_today is for."""
+    return moment is not None and cache.get(DAY_KEY) == timezone.localdate(moment).isoformat()
@@ -0,0 +1,59 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from admin_analytics import user_import
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-create users with their profiles from a CSV (with a header row) or NDJSON file. "
+        "Columns: email (required), name, first_name, last_name, role, password, bio, career_gap_years, "
+        "linkedin_url, github_url. Emails that already have an account are skipped, so a file can be re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or - for stdin.")
+        parser.add_argument('--format', choices=user_import.FORMATS, default=None,
+                            help="Default: from the file extension (.csv, .ndjson, .jsonl).")
+        parser.add_argument('--batch-size', type=int, default=user_import.DEFAULT_BATCH_SIZE)
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Password hashing processes (default USER_IMPORT_HASH_WORKERS, or one per CPU).")
+        parser.add_argument('--dry-run', action='store_true', help="Only validate the file; create nothing.")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        input_format = options['format'] or user_import.detect_format(path)
+        if input_format is None:
+            raise CommandError("Can't tell the format from the file name; pass --format.")
+        if options['batch_size'] <= 0 or (options['workers'] is not None and options['workers'] <= 0):
+            raise CommandError("--batch-size and --workers must be positive.")
+
+        started = time.monotonic()
+
+        def progress(stats):
+            self.stdout.write(f"[{time.monotonic() - started:7.1f}s] " + ', '.join(f'{n} {name}' for name, n in stats.items()))
+
+        try:
+            stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        except OSError as exc:
+            raise CommandError(str(exc))
+        try:
+            stats, errors = user_import.import_file(
+                stream, input_format, batch_size=options['batch_size'], workers=options['workers'],
+                dry_run=options['dry_run'], progress=progress)
+        except user_import.ImportFormatError as exc:
+            raise CommandError(str(exc))
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+        for error in errors:
+            self.stderr.write(f"Line {error['line']} ({error['email'] or 'no email'}): {error['error']}")
+        if stats['invalid'] > len(errors):
+            self.stderr.write(f"... and {stats['invalid'] - len(errors)} more invalid rows.")
+        verb = "Would create" if options['dry_run'] else "Created"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {stats['created']} users in {time.monotonic() - started:.1f}s "
+            f"({stats['skipped']} skipped, {stats['invalid']} invalid of {stats['rows']} rows)."))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from admin_analytics import rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Add rows created since the last run to the daily rollups (DailyMetric) read by "
+        "/api/admin_analytics/admin/timeseries/. Run periodically (e.g. every 5 minutes)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--metric', action='append', choices=rollups.METRICS,
+                            help="Only this metric (repeatable). Default: all of them.")
+        parser.add_argument('--lag', type=int, default=rollups.DEFAULT_LAG_SECONDS,
+                            help="Leave rows newer than this many seconds for the next run.")
+        parser.add_argument('--rebuild', action='store_true',
+                            help="Drop the rollups and watermarks and recount from the start.")
+
+    def handle(self, *args, **options):
+        metrics = options['metric'] or rollups.METRICS
+        if options['rebuild']:
+            rollups.reset(metrics)
+        for metric, count in rollups.rollup_all(metrics, lag=options['lag']).items():
+            self.stdout.write(f"{metric}: {count} new rows")
+        self.stdout.write(self.style.SUCCESS("Daily rollups are up to date."))
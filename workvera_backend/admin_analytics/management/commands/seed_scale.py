@@ -0,0 +1,48 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from admin_analytics import seeding
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate production-scale synthetic data for load testing (users with profiles, job posts, "
+        "applications, skill tests and results, community posts and comment threads). "
+        "Adds to the current database; deterministic for a given --seed and --until."
+    )
+
+    def add_arguments(self, parser):
+        for name, default in seeding.DEFAULT_COUNTS.items():
+            parser.add_argument(f"--{name.replace('_', '-')}", type=int, dest=name, default=None,
+                                help=f"Number of rows (default {default}, times --scale).")
+        parser.add_argument('--scale', type=float, default=1.0,
+                            help="Multiply the default counts, e.g. 0.01 for a quick local dataset.")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--until', type=date.fromisoformat, default=None,
+                            help="Last day of generated activity, YYYY-MM-DD (default today).")
+        parser.add_argument('--days', type=int, default=365, help="Days of history before --until.")
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--password', default=None,
+                            help="Password for every generated user (default: unusable password).")
+
+    def handle(self, *args, **options):
+        if options['scale'] <= 0 or options['batch_size'] <= 0:
+            raise CommandError("--scale and --batch-size must be positive.")
+        counts = {}
+        for name, default in seeding.DEFAULT_COUNTS.items():
+            value = options[name] if options[name] is not None else max(1, round(default * options['scale']))
+            if value < 0:
+                raise CommandError(f"--{name.replace('_', '-')} can't be negative.")
+            counts[name] = value
+
+        started = time.monotonic()
+        seeder = seeding.ScaleSeeder(
+            counts, seed=options['seed'], until=options['until'], days=options['days'],
+            batch_size=options['batch_size'], password=options['password'],
+            log=lambda message: self.stdout.write(f"[{time.monotonic() - started:7.1f}s] {message}"),
+        )
+        seeder.run()
+        self.stdout.write(self.style.SUCCESS(
+            f"Done in {time.monotonic() - started:.1f}s. Run `manage.py rollup_daily_metrics` to update the daily rollups."))
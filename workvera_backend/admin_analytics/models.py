@@ -1,3 +1,145 @@
+import uuid
+
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+
+class DailyMetric(models.Model):
+    """
+    One per-day aggregate, e.g. (applications, "submitted", 2025-06-01) -> 42.
+    Filled by `manage.py rollup_daily_metrics` (admin_analytics/rollups.py) and read by
+    the timeseries endpoint, which never touches the raw tables.
+    ``dimension`` is the breakdown value (a user role, an application status) or ''.
+    """
+    metric = models.CharField(max_length=50)
+    dimension = models.CharField(max_length=50, blank=True, default='')
+    date = models.DateField()
+    value = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'date', 'dimension'], name='admin_analytics_dailymetric_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.metric}[{self.dimension}] {self.date}: {self.value}"
+
+
+class RollupWatermark(models.Model):
+    """Highest source row id already counted into DailyMetric, per metric."""
+    metric = models.CharField(max_length=50, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.metric} up to id {self.last_id}"
+
+
+class UserImport(models.Model):
+    """
+    A bulk user import started through the admin API (admin_analytics/user_import.py).
+    The counters are updated after every batch, so clients can poll the progress.
+    """
+    FORMAT_CHOICES = (
+        ('csv', 'CSV'),
+        ('ndjson', 'NDJSON'),
+    )
+    STATUS_CHOICES = (
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='+')
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    rows = models.PositiveIntegerField(default=0) # input rows read so far
+    created = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0, help_text="Rows whose email already has an account or came earlier in the file.")
+    invalid = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True, help_text="The first invalid rows: [{line, email, error}].")
+    error = models.TextField(blank=True) # why a failed import stopped
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"User import {self.id} ({self.status}, {self.created}/{self.rows} rows created)"
+
+
+# Signals that keep the cached dashboard snapshot (admin_analytics/dashboard.py) current
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from jobs.models import Application, JobPost
+from skills.models import SkillTest
+from . import dashboard
+
+CustomUser = get_user_model()
+
+USER_ROLE_METRICS = {'seeker': 'total_job_seekers', 'employer': 'total_employers'}
+
+
+def _changes(update_fields, field):
+    return update_fields is None or field in update_fields
+
+@receiver(post_save, sender=CustomUser)
+def count_user(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if created:
+        dashboard.adjust('total_users', 1)
+        if instance.role in USER_ROLE_METRICS:
+            dashboard.adjust(USER_ROLE_METRICS[instance.role], 1)
+    elif _changes(update_fields, 'role'):
+        # The role may have changed (logins only save last_login and are skipped here)
+        dashboard.invalidate()
+
+@receiver(post_delete, sender=CustomUser)
+def uncount_user(sender, instance, **kwargs):
+    dashboard.adjust('total_users', -1)
+    if instance.role in USER_ROLE_METRICS:
+        dashboard.adjust(USER_ROLE_METRICS[instance.role], -1)
+
+@receiver(post_save, sender=JobPost)
+def count_job_post(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if created:
+        dashboard.adjust('total_job_posts', 1)
+        if instance.is_active:
+            dashboard.adjust('active_job_posts', 1)
+    elif _changes(update_fields, 'is_active'):
+        dashboard.invalidate()
+
+@receiver(post_delete, sender=JobPost)
+def uncount_job_post(sender, instance, **kwargs):
+    dashboard.adjust('total_job_posts', -1)
+    if instance.is_active:
+        dashboard.adjust('active_job_posts', -1)
+
+@receiver(post_save, sender=Application)
+def count_application(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        dashboard.adjust('total_applications', 1)
+        if dashboard.counts_today(instance.applied_at):
+            dashboard.adjust('applications_today', 1)
+
+@receiver(post_delete, sender=Application)
+def uncount_application(sender, instance, **kwargs):
+    dashboard.adjust('total_applications', -1)
+    if dashboard.counts_today(instance.applied_at):
+        dashboard.adjust('applications_today', -1)
+
+@receiver(post_save, sender=SkillTest)
+def count_skill_test(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        dashboard.adjust('total_skill_tests', 1)
+
+@receiver(post_delete, sender=SkillTest)
+def uncount_skill_test(sender, instance, **kwargs):
+    dashboard.adjust('total_skill_tests', -1)
@@ -0,0 +1,14 @@
+# admin_analytics/password_hashing.py
+"""
+Password hashing for the bulk user import (admin_analytics/user_import.py).
+
+Runs inside the import's worker processes, which are spawned without Django being set
+up, so this module never touches settings, models or the database. The importer picks
+the configured hasher in the main process and sends the instance along with each
+chunk of passwords; hashers only need their class attributes and django.utils.crypto.
+"""
+
+
+def hash_passwords(hasher, passwords):
+    """Encoded hashes of ``passwords``, in order, each with a fresh salt (what make_password stores)."""
+    return [hasher.encode(password, hasher.salt()) for password in passwords]
@@ -0,0 +1,362 @@
+# admin_analytics/seeding.py
+"""
+Synthetic production-scale data for load testing (``manage.py seed_scale``).
+
+Rows are generated in memory and written with batched ``bulk_create``, so none of the
+per-row signals run (no Profile per user via create_or_update_user_profile, no funnel,
+search index or comment counter updates). Instead the generator assigns primary keys
+itself and fills in everything those signals would have produced:
+- a Profile for every user,
+- JobPostSkill links and the full-text index for job posts,
+- a JobApplicationStats funnel row per job,
+- Comment.path / depth / replies_count and Post.comments_count / last_activity_at / hot_score.
+
+The same seed, counts and ``until`` date on the same starting database give the same rows.
+New rows only reference each other, so a run can be added on top of existing data.
+"""
+import contextlib
+import random
+from collections import Counter
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+
+from community import ranking, threads
+from community.models import Comment, Post
+from jobs import list_cache, recommendations, search
+from jobs.models import Application, JobApplicationStats, JobPost, JobPostSkill
+from jobs.skill_tags import get_or_create_skills, parse_skill_tags
+from skills.models import SkillResult, SkillTest
+from users.models import Profile
+from . import dashboard
+
+DEFAULT_COUNTS = {
+    'employers': 1000,
+    'seekers': 50000,
+    'jobs': 20000,
+    'applications': 1000000,
+    'skill_tests': 50,
+    'skill_results': 100000,
+    'posts': 10000,
+    'comments': 100000,
+}
+
+SKILLS = (
+    'Python', 'Django', 'JavaScript', 'TypeScript', 'React', 'Vue', 'Node.js', 'Java', 'Spring',
+    'Kotlin', 'Swift', 'Go', 'Rust', 'C++', 'C#', '.NET', 'PHP', 'Laravel', 'Ruby', 'Rails',
+    'SQL', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP',
+    'Terraform', 'Linux', 'Git', 'GraphQL', 'REST', 'HTML', 'CSS', 'Figma', 'Excel', 'Tableau',
+    'Power BI', 'Machine Learning', 'Data Analysis', 'Pandas', 'Spark', 'Airflow', 'Scrum',
+    'Project Management', 'Customer Support', 'Sales', 'Marketing', 'SEO', 'Content Writing',
+    'Accounting', 'Recruiting', 'QA', 'Selenium', 'Cybersecurity', 'Networking', 'Android',
+)
+LEVELS = ('Junior', 'Mid-level', 'Senior', 'Lead', 'Principal')
+ROLES = ('Developer', 'Engineer', 'Analyst', 'Designer', 'Consultant', 'Specialist', 'Manager', 'Administrator')
+LOCATIONS = ('Remote', 'Bengaluru', 'Mumbai', 'Delhi', 'Hyderabad', 'Pune', 'Chennai', 'London',
+             'Berlin', 'New York', 'Toronto', 'Singapore', None)
+JOB_TYPES = ('Full-time', 'Part-time', 'Contract', 'Internship', 'Returnship')
+WORDS = ('team', 'product', 'customers', 'growth', 'platform', 'data', 'remote', 'flexible', 'career',
+         'break', 'return', 'learning', 'mentoring', 'interview', 'salary', 'skills', 'project',
+         'experience', 'support', 'hiring', 'community', 'work', 'balance', 'confidence', 'resume')
+# Relative frequency of each application status
+STATUS_WEIGHTS = {
+    'submitted': 45, 'reviewed': 20, 'shortlisted': 10, 'interviewing': 7,
+    'offered': 3, 'rejected': 13, 'withdrawn': 2,
+}
+TOP_LEVEL_SHARE = 0.4  # share of comments that are not replies
+MAX_REPLY_DEPTH = 8
+
+
+@contextlib.contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep the auto_now / auto_now_add values we generate."""
+    fields = [field for model in models for field in model._meta.concrete_fields
+              if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class ScaleSeeder:
+    def __init__(self, counts, seed=42, until=None, days=365, batch_size=5000, password=None, log=None):
+        self.counts = {**DEFAULT_COUNTS, **counts}
+        self.rng = random.Random(seed)
+        until = until or datetime.now(dt_timezone.utc).date()
+        self.end = datetime.combine(until, time.min, tzinfo=dt_timezone.utc).timestamp()
+        self.start = self.end - days * 86400
+        self.batch_size = batch_size
+        # One hash for every user: hashing per row would dominate the run time
+        self.password = make_password(password)
+        self.log = log or (lambda message: None)
+
+    def run(self):
+        self.log("Seeding with " + ', '.join(f'{name}={n}' for name, n in self.counts.items()))
+        with explicit_timestamps(JobPost, Application, SkillTest, SkillResult, Post, Comment):
+            employers = self.seed_users('employer', self.counts['employers'])
+            seekers = self.seed_users('seeker', self.counts['seekers'])
+            jobs = self.seed_jobs(employers, self.counts['jobs'])
+            self.seed_applications(seekers, jobs, self.counts['applications'])
+            tests = self.seed_skill_tests(self.counts['skill_tests'])
+            self.seed_skill_results(seekers, tests, self.counts['skill_results'])
+            self.seed_community(employers + seekers, self.counts['posts'], self.counts['comments'])
+        self.finish()
+
+    # Helpers ---------------------------------------------------------------
+
+    def next_id(self, model):
+        return (model.objects.aggregate(top=Max('pk'))['top'] or 0) + 1
+
+    def moment(self, after=None):
+        """Random timestamp in [after, end), biased towards recent days."""
+        low = max(after or self.start, self.start)
+        return low + (self.end - low) * (1 - self.rng.random() ** 2)
+
+    @staticmethod
+    def as_datetime(timestamp):
+        return datetime.fromtimestamp(timestamp, dt_timezone.utc)
+
+    def text(self, words):
+        return ' '.join(self.rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+    def skewed_index(self, n, skew=2.0):
+        """0..n-1 with low indexes more likely (a few popular jobs, employers, posts)."""
+        return min(n - 1, int(n * self.rng.random() ** skew))
+
+    def bulk_insert(self, model, rows):
+        """bulk_create an iterable of instances in batches, one transaction per batch. Returns the count."""
+        total = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                total += self._write(model, batch)
+                batch = []
+        if batch:
+            total += self._write(model, batch)
+        return total
+
+    def _write(self, model, batch):
+        with transaction.atomic():
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+        return len(batch)
+
+    # Generators --------------------------------------------------------------
+
+    def seed_users(self, role, n):
+        """Users and their profiles; returns [(id, date_joined timestamp)]."""
+        user_model = get_user_model()
+        first_id = self.next_id(user_model)
+        users = [(first_id + i, self.moment()) for i in range(n)]
+
+        def rows():
+            for user_id, joined in users:
+                yield user_model(
+                    id=user_id, email=f'{role}{user_id}@scale.workvera.test', role=role,
+                    name=f'{role.capitalize()} {user_id}', password=self.password,
+                    date_joined=self.as_datetime(joined),
+                )
+
+        def profiles():
+            for user_id, _ in users:
+                yield Profile(
+                    user_id=user_id,
+                    career_gap_years=self.rng.choice((0, 0, 0, 1, 2, 3, 5)) if role == 'seeker' else 0,
+                    bio=self.text(12),
+                )
+
+        self.bulk_insert(user_model, rows())
+        self.bulk_insert(Profile, profiles())
+        self.log(f"{n} {role}s with profiles")
+        return users
+
+    def seed_jobs(self, employers, n):
+        """Job posts with skill links, funnel rows and search index; returns [(id, posted_at timestamp)]."""
+        if not employers:
+            return []
+        tags_by_name = {}
+        for name in SKILLS:
+            tags_by_name.update(parse_skill_tags(name))
+        skill_ids = get_or_create_skills(tags_by_name)
+        first_id = self.next_id(JobPost)
+        jobs = []
+        links = []
+
+        def rows():
+            for i in range(n):
+                job_id = first_id + i
+                employer_id, joined = employers[self.skewed_index(len(employers))]
+                posted = self.moment(after=joined)
+                tags = self.rng.sample(SKILLS, self.rng.randint(2, 6))
+                jobs.append((job_id, posted))
+                links.extend(JobPostSkill(job_id=job_id, skill_id=skill_ids[key]) for key in parse_skill_tags(','.join(tags)))
+                posted_at = self.as_datetime(posted)
+                yield JobPost(
+                    id=job_id, employer_id=employer_id, skill_tags=','.join(tags),
+                    title=f'{self.rng.choice(LEVELS)} {tags[0]} {self.rng.choice(ROLES)}',
+                    description=self.text(self.rng.randint(40, 120)),
+                    gap_friendly=self.rng.random() < 0.3, location=self.rng.choice(LOCATIONS),
+                    job_type=self.rng.choice(JOB_TYPES), is_active=self.rng.random() < 0.85,
+                    posted_at=posted_at, updated_at=posted_at,
+                )
+
+        self.bulk_insert(JobPost, rows())
+        self.bulk_insert(JobPostSkill, links)
+        self.log(f"{n} job posts, {len(links)} skill links")
+        return jobs
+
+    def seed_applications(self, seekers, jobs, n):
+        if not seekers or not jobs:
+            return
+        # Each (seeker, job) pair at most once; leave room so picking a free pair stays cheap
+        n = min(n, len(seekers) * len(jobs) // 2)
+        statuses = list(STATUS_WEIGHTS)
+        weights = list(STATUS_WEIGHTS.values())
+        first_id = self.next_id(Application)
+        taken = set()
+        funnels = {job_id: Counter() for job_id, _ in jobs}
+
+        def rows():
+            for i in range(n):
+                while True:
+                    seeker = self.rng.randrange(len(seekers))
+                    job = self.skewed_index(len(jobs))
+                    pair = seeker * len(jobs) + job
+                    if pair not in taken:
+                        taken.add(pair)
+                        break
+                user_id, joined = seekers[seeker]
+                job_id, posted = jobs[job]
+                status = self.rng.choices(statuses, weights)[0]
+                funnels[job_id][status] += 1
+                yield Application(
+                    id=first_id + i, user_id=user_id, job_id=job_id, status=status,
+                    applied_at=self.as_datetime(self.moment(after=max(joined, posted))),
+                    cover_letter=self.text(30) if self.rng.random() < 0.3 else None,
+                )
+                if (i + 1) % 100000 == 0:
+                    self.log(f"  {i + 1} applications")
+
+        self.bulk_insert(Application, rows())
+        self.bulk_insert(JobApplicationStats, (JobApplicationStats(job_id=job_id, **counts)
+                                               for job_id, counts in funnels.items()))
+        self.log(f"{n} applications")
+
+    def seed_skill_tests(self, n):
+        tags = {}
+        for name in SKILLS:
+            tags.update(parse_skill_tags(name))
+        skill_ids = get_or_create_skills(tags)
+        first_id = self.next_id(SkillTest)
+        tests = []
+
+        def rows():
+            for i in range(n):
+                key = self.rng.choice(list(tags))
+                created = self.as_datetime(self.moment())
+                tests.append(first_id + i)
+                yield SkillTest(id=first_id + i, title=f'{tags[key]} assessment {i + 1}', description=self.text(20),
+                                skill_id=skill_ids[key], created_at=created, updated_at=created)
+
+        self.bulk_insert(SkillTest, rows())
+        self.log(f"{n} skill tests")
+        return tests
+
+    def seed_skill_results(self, seekers, tests, n):
+        if not seekers or not tests:
+            return
+        n = min(n, len(seekers) * len(tests) // 2)
+        first_id = self.next_id(SkillResult)
+        taken = set()
+
+        def rows():
+            for i in range(n):
+                while True:
+                    seeker = self.rng.randrange(len(seekers))
+                    test = self.skewed_index(len(tests), skew=1.5)
+                    pair = seeker * len(tests) + test
+                    if pair not in taken:
+                        taken.add(pair)
+                        break
+                user_id, joined = seekers[seeker]
+                correct = self.rng.randint(0, 20)
+                yield SkillResult(id=first_id + i, user_id=user_id, test_id=tests[test], score=correct * 5.0,
+                                  details={'correct': correct, 'total': 20},
+                                  submitted_at=self.as_datetime(self.moment(after=joined)))
+
+        self.bulk_insert(SkillResult, rows())
+        self.log(f"{n} skill results")
+
+    def seed_community(self, users, n_posts, n_comments):
+        """Posts and threaded comments, with every denormalized column already filled in."""
+        if not users or not n_posts:
+            return
+        first_post_id = self.next_id(Post)
+        next_comment_id = self.next_id(Comment)
+        # Skewed comment counts: a few busy threads, many quiet ones
+        per_post = Counter(self.skewed_index(n_posts, skew=3.0) for _ in range(n_comments))
+        posts, comments = [], []
+
+        for i in range(n_posts):
+            post_id = first_post_id + i
+            author_id, joined = users[self.rng.randrange(len(users))]
+            created = self.moment(after=joined)
+            thread = []  # [comment, ...] of this post, in creation order
+            moment = created
+            for _ in range(per_post[i]):
+                moment = moment + (self.end - moment) * self.rng.random() * 0.1
+                parent = None
+                if thread and self.rng.random() > TOP_LEVEL_SHARE:
+                    parent = thread[self.skewed_index(len(thread), skew=0.5)]
+                    if parent.depth >= MAX_REPLY_DEPTH:
+                        parent = None
+                comment_at = self.as_datetime(moment)
+                comment = Comment(
+                    id=next_comment_id, post_id=post_id, author_id=users[self.rng.randrange(len(users))][0],
+                    content=self.text(self.rng.randint(5, 40)), created_at=comment_at, updated_at=comment_at,
+                    parent_comment_id=parent.pk if parent else None,
+                    depth=parent.depth + 1 if parent else 0,
+                    path=threads.build_path(parent.path if parent else '', next_comment_id),
+                )
+                if parent is not None:
+                    parent.replies_count += 1
+                thread.append(comment)
+                next_comment_id += 1
+            created_at = self.as_datetime(created)
+            comment_times = [comment.created_at for comment in thread]
+            posts.append(Post(
+                id=post_id, author_id=author_id, title=self.text(self.rng.randint(4, 10))[:-1],
+                content=self.text(self.rng.randint(20, 80)), created_at=created_at, updated_at=created_at,
+                comments_count=len(thread), last_activity_at=max([created_at, *comment_times]),
+                hot_score=ranking.hot_score(created_at, comment_times),
+            ))
+            comments.extend(thread)
+            if len(comments) >= self.batch_size * 4:
+                self.bulk_insert(Post, posts)
+                self.bulk_insert(Comment, comments)
+                posts, comments = [], []
+        self.bulk_insert(Post, posts)
+        self.bulk_insert(Comment, comments)
+        self.log(f"{n_posts} posts, {n_comments} comments")
+
+    def finish(self):
+        # Explicit ids don't advance sequences on databases that have them (PostgreSQL)
+        models = [get_user_model(), Profile, JobPost, JobPostSkill, Application, SkillTest, SkillResult, Post, Comment]
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+        total = search.rebuild_index(JobPost.objects.order_by('pk').iterator(chunk_size=self.batch_size))
+        self.log(f"Search index rebuilt ({total} job posts)")
+        recommendations.invalidate()
+        list_cache.invalidate()
+        dashboard.invalidate()
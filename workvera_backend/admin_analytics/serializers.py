@@ -1,14 +1,27 @@
 from rest_framework import serializers
 
+from .models import UserImport
+
 class BasicDashboardStatsSerializer(serializers.Serializer):
     """
     Serializer for basic dashboard statistics.
-    This is a read-only serializer as data is aggregated in the view.
+    This is a read-only serializer; the numbers come from admin_analytics/dashboard.py.
     """
     total_users = serializers.IntegerField()
     total_job_seekers = serializers.IntegerField()
     total_employers = serializers.IntegerField()
     total_job_posts = serializers.IntegerField()
+    active_job_posts = serializers.IntegerField()
     total_applications = serializers.IntegerField()
+    applications_today = serializers.IntegerField()
     total_skill_tests = serializers.IntegerField()
-    
\ No newline at end of file
+    
+
+class UserImportSerializer(serializers.ModelSerializer):
+    """Status and progress of a bulk user import (admin_analytics/user_import.py)."""
+
+    class Meta:
+        model = UserImport
+        fields = ['id', 'format', 'status', 'rows', 'created', 'skipped', 'invalid', 'errors', 'error',
+                  'created_at', 'finished_at']
+        read_only_fields = fields
@@ -1,3 +1,377 @@
-from django.test import TestCase
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from itertools import count
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from community.models import Comment, Post
+from jobs import funnel
+from jobs.models import Application, JobApplicationStats, JobPost
+from skills.models import SkillTest
+
+from users.models import CustomUser, Profile
+from . import dashboard, rollups, user_import
+from .models import DailyMetric, UserImport
+from workvera_backend import instrumentation
+from workvera_backend.testing import QueryBudgetMixin
+
+
+class AdminAnalyticsQueryBudgetTests(QueryBudgetMixin, APITestCase):
+
+    stats_url = '/api/admin_analytics/admin/stats/'
+
+    def setUp(self):
+        cache.clear()
+        self.sequence = count()
+        self.admin = CustomUser.objects.create_superuser(email='admin@example.com', name='Admin')
+        self.client.force_authenticate(self.admin)
+
+    def create_users(self, n):
+        for _ in range(n):
+            i = next(self.sequence)
+            CustomUser.objects.create_user(email=f'user{i}@example.com', name=f'User {i}',
+                                           role='employer' if i % 2 else 'seeker')
+
+    def test_user_list(self):
+        self.assertConstantQueries('/api/admin_analytics/admin/users/', self.create_users, max_queries=1)
+
+    def test_dashboard_stats_are_aggregated_once_then_cached(self):
+        self.create_users(4)
+        _, queries = self.count_queries(self.stats_url)
+        self.assertLessEqual(len(queries), 4) # one aggregate per table
+
+        # New rows are counted by the signals; no query needed to see them
+        self.create_users(2)
+        employer = CustomUser.objects.get(email='user1@example.com')
+        JobPost.objects.create(title='Backend developer', description='Django', employer=employer)
+        response, queries = self.count_queries(self.stats_url)
+        self.assertEqual(queries, [])
+        self.assertEqual(response.data, {
+            # the admin's role defaults to 'seeker'
+            'total_users': 7, 'total_job_seekers': 4, 'total_employers': 3,
+            'total_job_posts': 1, 'active_job_posts': 1,
+            'total_applications': 0, 'applications_today': 0, 'total_skill_tests': 0,
+        })
+
+    def test_incremental_counters_match_a_fresh_snapshot(self):
+        self.client.get(self.stats_url)
+        self.create_users(3)
+        seeker = CustomUser.objects.get(email='user0@example.com')
+        employer = CustomUser.objects.get(email='user1@example.com')
+        job = JobPost.objects.create(title='Backend developer', description='Django', employer=employer)
+        Application.objects.create(user=seeker, job=job)
+        SkillTest.objects.create(title='Python', description='Basics')
+        employer.delete() # cascades to the job and its application
+        cached = self.client.get(self.stats_url).data
+        self.assertEqual(cached, self.client.get(self.stats_url, {'refresh': 1}).data)
+        self.assertEqual((cached['total_users'], cached['total_job_posts'], cached['total_applications']), (3, 0, 0))
+
+    def test_role_change_drops_the_snapshot(self):
+        self.create_users(1)
+        self.client.get(self.stats_url)
+        user = CustomUser.objects.get(email='user0@example.com')
+        user.role = 'employer'
+        user.save()
+        self.assertEqual(self.client.get(self.stats_url).data['total_employers'], 1)
+
+    def test_cache_stats(self):
+        response = self.client.get('/api/admin_analytics/admin/cache-stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data['job_list']), {'hits', 'misses', 'hit_rate', 'version'})
+
+
+class DailyRollupTests(QueryBudgetMixin, APITestCase):
+
+    url = '/api/admin_analytics/admin/timeseries/'
+
+    def setUp(self):
+        self.admin = CustomUser.objects.create_superuser(email='admin@example.com', name='Admin')
+        self.employer = CustomUser.objects.create_user(email='employer@example.com', name='Employer', role='employer')
+        self.job = JobPost.objects.create(title='Backend developer', description='Django', employer=self.employer)
+        self.client.force_authenticate(self.admin)
+        self.today = timezone.localdate()
+
+    def apply(self, n, status='submitted', days_ago=0):
+        for _ in range(n):
+            seeker = CustomUser.objects.create_user(email=f'seeker{CustomUser.objects.count()}@example.com', name='Seeker')
+            application = Application.objects.create(user=seeker, job=self.job, status=status)
+            if days_ago:
+                Application.objects.filter(pk=application.pk).update(
+                    applied_at=timezone.now() - timedelta(days=days_ago))
+
+    def test_rollups_count_rows_per_day_and_dimension(self):
+        self.apply(2)
+        self.apply(1, status='shortlisted', days_ago=2)
+        rollups.rollup_all(lag=0)
+        applications = dict(((date, dim), value) for date, dim, value in
+                             DailyMetric.objects.filter(metric='applications').values_list('date', 'dimension', 'value'))
+        self.assertEqual(applications, {
+            (self.today, 'submitted'): 2,
+            (self.today - timedelta(days=2), 'shortlisted'): 1,
+        })
+        signups = DailyMetric.objects.get(metric='signups', date=self.today, dimension='seeker')
+        self.assertEqual(signups.value, 4) # three seekers, and the admin's role defaults to 'seeker'
+        self.assertEqual(DailyMetric.objects.get(metric='job_posts').value, 1)
+
+    def test_runs_only_process_rows_past_the_watermark(self):
+        self.apply(2)
+        self.assertEqual(rollups.rollup_metric('applications', lag=0), 2)
+        self.assertEqual(rollups.rollup_metric('applications', lag=0), 0)
+        self.apply(3)
+        self.assertEqual(rollups.rollup_metric('applications', lag=0), 3)
+        self.assertEqual(DailyMetric.objects.get(metric='applications', date=self.today).value, 5)
+        # Rows younger than the lag wait for a later run
+        self.apply(1)
+        self.assertEqual(rollups.rollup_metric('applications', lag=3600), 0)
+
+    def test_timeseries_reads_only_the_rollup_table(self):
+        self.apply(2)
+        self.apply(1, status='rejected', days_ago=1)
+        rollups.rollup_all(lag=0)
+        start = self.today - timedelta(days=3)
+        response, queries = self.count_queries(self.url, {'metric': 'applications', 'from': start, 'to': self.today})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 1)
+        self.assertIn('"admin_analytics_dailymetric"', queries[0]['sql'])
+        self.assertNotIn('"jobs_application"', queries[0]['sql'])
+
+        self.assertEqual(response.data['total'], 3)
+        self.assertEqual([point['value'] for point in response.data['points']], [0, 0, 1, 2]) # zero-filled
+        self.assertEqual(response.data['points'][-1]['by'], {'submitted': 2})
+
+        response = self.client.get(self.url, {'metric': 'applications', 'from': start, 'dimension': 'rejected'})
+        self.assertEqual(response.data['total'], 1)
+
+    def test_timeseries_validates_its_parameters(self):
+        self.assertEqual(self.client.get(self.url, {'metric': 'nope'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'metric': 'signups', 'from': 'yesterday'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'metric': 'signups', 'from': '2020-01-01', 'to': '2024-01-01'}).status_code, 400)
+        response = self.client.get(self.url, {'metric': 'signups'})
+        self.assertEqual(len(response.data['points']), 30)
+
+
+@override_settings(PERF_INSTRUMENTATION_ENABLED=True)
+class RequestInstrumentationTests(APITestCase):
+
+    url = '/api/admin_analytics/admin/performance/'
+
+    def setUp(self):
+        instrumentation.get_recorder().reset()
+        self.admin = CustomUser.objects.create_superuser(email='admin@example.com', name='Admin')
+        employer = CustomUser.objects.create_user(email='employer@example.com', name='Employer', role='employer')
+        JobPost.objects.create(title='Backend developer', description='Django', employer=employer)
+
+    def test_requests_are_recorded_per_endpoint(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get('/api/jobs/posts/', {'format': 'json'}).status_code, 200)
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(self.url, {'recent': 2})
+        self.assertEqual(response.status_code, 200)
+
+        endpoint = next(row for row in response.data['endpoints'] if row['endpoint'] == 'GET /api/jobs/posts/')
+        self.assertEqual(endpoint['count'], 3)
+        self.assertLessEqual(endpoint['p50_ms'], endpoint['p99_ms'])
+        latest = response.data['recent'][0]
+        self.assertEqual((latest['view'], latest['action'], latest['status']),
+                         ('jobs.views.JobPostViewSet', 'list', 200))
+        self.assertGreater(latest['response_bytes'], 0)
+        self.assertEqual(len(response.data['recent']), 2)
+
+        # The first request missed the list cache: it ran queries and serialized the job
+        first = self.client.get(self.url, {'recent': 10}).data['recent'][-1]
+        self.assertGreater(first['sql_count'], 0)
+        self.assertGreater(first['serializer_ms'], 0)
+
+    @override_settings(PERF_SLOW_REQUEST_MS=0)
+    def test_slow_requests_are_logged_with_their_sql(self):
+        self.client.force_authenticate(self.admin)
+        with self.assertLogs('workvera.performance', level='WARNING') as logs:
+            self.client.get('/api/admin_analytics/admin/users/')
+        self.assertIn('Slow request GET /api/admin_analytics/admin/users/', logs.output[0])
+        self.assertIn('SELECT', logs.output[0])
+
+    def test_staff_only(self):
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        self.client.force_authenticate(self.admin)
+        self.assertEqual(self.client.delete(self.url).status_code, 204)
+        # Only the DELETE itself is left
+        endpoints = instrumentation.get_recorder().snapshot()['endpoints']
+        self.assertEqual([row['endpoint'] for row in endpoints], ['DELETE /api/admin_analytics/admin/performance/'])
+
+
+class SeedScaleTests(APITestCase):
+
+    def seed(self, **counts):
+        args = [f"--{name.replace('_', '-')}={n}" for name, n in counts.items()]
+        call_command('seed_scale', *args, '--seed=7', '--until=2025-06-01', '--batch-size=50', stdout=StringIO())
+
+    def funnels(self):
+        return {stats.job_id: [getattr(stats, status) for status in funnel.statuses()]
+                for stats in JobApplicationStats.objects.all()}
+
+    def test_generated_rows_and_denormalized_columns(self):
+        self.seed(employers=3, seekers=40, jobs=20, applications=300, skill_tests=4, skill_results=60, posts=10, comments=120)
+        self.assertEqual(CustomUser.objects.filter(role='seeker').count(), 40)
+        self.assertEqual(Profile.objects.count(), 43)
+        self.assertEqual(Application.objects.count(), 300)
+        self.assertEqual(Comment.objects.count(), 120)
+
+        # What the skipped signals would have maintained is already in place
+        seeded = self.funnels()
+        funnel.rebuild()
+        self.assertEqual(seeded, self.funnels())
+        self.assertEqual(sum(Post.objects.values_list('comments_count', flat=True)), 120)
+        reply = Comment.objects.filter(parent_comment__isnull=False).select_related('parent_comment').first()
+        self.assertTrue(reply.path.startswith(reply.parent_comment.path))
+        self.assertEqual(self.client.get('/api/jobs/posts/', {'q': JobPost.objects.first().title}).status_code, 200)
+
+    def test_same_seed_same_data(self):
+        self.seed(employers=2, seekers=10, jobs=5, applications=20, skill_tests=1, skill_results=5, posts=2, comments=5)
+        first = list(Application.objects.order_by('pk').values_list('user__email', 'job__title', 'status', 'applied_at'))
+        CustomUser.objects.all().delete()
+        self.seed(employers=2, seekers=10, jobs=5, applications=20, skill_tests=1, skill_results=5, posts=2, comments=5)
+        second = list(Application.objects.order_by('pk').values_list('user__email', 'job__title', 'status', 'applied_at'))
+        self.assertEqual([row[1:] for row in first], [row[1:] for row in second])
+
+
+# Cheap hashing keeps the tests fast; the worker processes get the configured hasher all the same
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+IMPORT_CSV = (
+    "Email,Name,Role,Password,Career_Gap_Years,LinkedIn_URL\n"
+    "ana@Partner.test,Ana,seeker,Correct-Horse-42,3,https://linkedin.com/in/ana\n"
+    "bo@partner.test,Bo,Employer,,,\n"
+    "existing@partner.test,Already There,seeker,,,\n"
+    "ana@partner.test,Ana Again,seeker,,,\n"
+    "not-an-email,Bad,seeker,,,\n"
+    "cy@partner.test,Cy,admin,,,\n"
+    "di@partner.test,Di,seeker,12345,,\n"
+)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS, USER_IMPORT_HASH_WORKERS=1)
+class UserImportCommandTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        CustomUser.objects.create_user(email='existing@partner.test', name='Existing')
+        handle, self.path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'w') as csv_file:
+            csv_file.write(IMPORT_CSV)
+        self.addCleanup(os.remove, self.path)
+
+    def run_import(self, *args):
+        out, err = StringIO(), StringIO()
+        call_command('import_users', self.path, '--batch-size=2', *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_users_and_profiles_created_in_batches(self):
+        dashboard.get_stats()  # a cached snapshot the import has to keep current
+        out, err = self.run_import()
+        self.assertIn("Created 2 users", out)
+        self.assertIn("2 skipped, 3 invalid of 7 rows", out)
+        self.assertIn("Line 6 (not-an-email): email:", err)
+        self.assertIn("Line 7 (cy@partner.test): role:", err)
+        self.assertIn("Line 8 (di@partner.test): password:", err)
+
+        ana = CustomUser.objects.get(email='ana@partner.test')
+        self.assertTrue(ana.check_password('Correct-Horse-42'))
+        self.assertEqual((ana.profile.career_gap_years, ana.profile.linkedin_url), (3, 'https://linkedin.com/in/ana'))
+        bo = CustomUser.objects.get(email='bo@partner.test')
+        self.assertEqual(bo.role, 'employer')
+        self.assertFalse(bo.has_usable_password())
+        self.assertTrue(Profile.objects.filter(user=bo).exists())
+        self.assertEqual(Profile.objects.count(), CustomUser.objects.count())
+
+        stats = dashboard.get_stats()
+        self.assertEqual((stats['total_users'], stats['total_employers']), (3, 1))
+        self.assertEqual(stats, dashboard.get_stats(refresh=True))
+
+    def test_rerun_skips_imported_users(self):
+        self.run_import()
+        out, _ = self.run_import()
+        self.assertIn("Created 0 users", out)
+        self.assertIn("4 skipped", out)
+        self.assertEqual(CustomUser.objects.count(), 3)
+
+    def test_dry_run_creates_nothing(self):
+        out, _ = self.run_import('--dry-run')
+        self.assertIn("Would create 2 users", out)
+        self.assertEqual(CustomUser.objects.count(), 1)
+
+    def test_ndjson(self):
+        lines = [
+            '{"email": "ed@partner.test", "name": "Ed", "career_gap_years": 2}',
+            '',
+            '["not", "an", "object"]',
+            '{"email": "fay@partner.test", "password": "Correct-Horse-43"}',
+        ]
+        stream = StringIO('\n'.join(lines) + '\n')
+        records = user_import.read_records(stream, 'ndjson')
+        importer = user_import.UserImporter(batch_size=10)
+        stats = importer.run(records)
+        self.assertEqual(stats, {'rows': 3, 'created': 2, 'skipped': 0, 'invalid': 1})
+        self.assertEqual(importer.errors, [{'line': 3, 'email': '', 'error': "Not a JSON object."}])
+        self.assertEqual(CustomUser.objects.get(email='ed@partner.test').profile.career_gap_years, 2)
+        self.assertTrue(CustomUser.objects.get(email='fay@partner.test').check_password('Correct-Horse-43'))
+
+    def test_csv_without_email_column(self):
+        with self.assertRaises(user_import.ImportFormatError):
+            list(user_import.read_records(StringIO("name,role\nAna,seeker\n"), 'csv'))
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS, USER_IMPORT_HASH_WORKERS=1)
+class UserImportAPITests(APITransactionTestCase):
+
+    url = '/api/admin_analytics/admin/users/import/'
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.addClassCleanup(user_import.shutdown)
+
+    def setUp(self):
+        cache.clear()
+        self.admin = CustomUser.objects.create_superuser(email='admin@example.com', name='Admin')
+        self.client.force_authenticate(self.admin)
+
+    def test_import_runs_in_background_and_reports_progress(self):
+        response = self.client.generic('POST', self.url, IMPORT_CSV.encode(), content_type='text/csv')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], 'queued')
+        self.assertTrue(user_import.wait(timeout=30))
+
+        detail = self.client.get(f"{self.url}{response.data['id']}/")
+        self.assertEqual(detail.data['status'], 'done')
+        self.assertEqual([detail.data[name] for name in ('rows', 'created', 'skipped', 'invalid')], [7, 3, 1, 3])
+        self.assertEqual([error['line'] for error in detail.data['errors']], [6, 7, 8])
+        self.assertTrue(CustomUser.objects.get(email='ana@partner.test').check_password('Correct-Horse-42'))
+        self.assertEqual(self.client.get(self.url).data['results'][0]['id'], response.data['id'])
+
+    def test_bad_file_fails_the_import(self):
+        response = self.client.generic('POST', self.url + '?file_format=csv', b"name\nAna\n", content_type='text/plain')
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(user_import.wait(timeout=30))
+        job = UserImport.objects.get(pk=response.data['id'])
+        self.assertEqual(job.status, 'failed')
+        self.assertIn("'email' column", job.error)
+
+    def test_format_and_size_checked_up_front(self):
+        response = self.client.generic('POST', self.url, b"{}", content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        with override_settings(USER_IMPORT_MAX_BYTES=10):
+            response = self.client.generic('POST', self.url, IMPORT_CSV.encode(), content_type='text/csv')
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(UserImport.objects.exists())
+
+    def test_admins_only(self):
+        user = CustomUser.objects.create_user(email='seeker@example.com', name='Seeker')
+        self.client.force_authenticate(user)
+        response = self.client.generic('POST', self.url, IMPORT_CSV.encode(), content_type='text/csv')
+        self.assertEqual(response.status_code, 403)
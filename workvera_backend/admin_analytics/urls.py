@@ -1,9 +1,15 @@
 from django.urls import path
-from .views import AdminDashboardStatsAPIView, AdminUserListAPIView
+from .views import AdminDashboardStatsAPIView, AdminCacheStatsAPIView, AdminPerformanceAPIView, AdminTimeseriesAPIView, AdminUserListAPIView, AdminUserImportAPIView, AdminUserImportDetailAPIView
 
 app_name = 'core'
 
 urlpatterns = [
     path('admin/stats/', AdminDashboardStatsAPIView.as_view(), name='admin-dashboard-stats'),
+    path('admin/cache-stats/', AdminCacheStatsAPIView.as_view(), name='admin-cache-stats'),
+    path('admin/performance/', AdminPerformanceAPIView.as_view(), name='admin-performance'),
+    path('admin/timeseries/', AdminTimeseriesAPIView.as_view(), name='admin-timeseries'),
     path('admin/users/', AdminUserListAPIView.as_view(), name='admin-user-list'),
+    # Bulk user import from CSV / NDJSON (admin_analytics/user_import.py)
+    path('admin/users/import/', AdminUserImportAPIView.as_view(), name='admin-user-import'),
+    path('admin/users/import/<uuid:pk>/', AdminUserImportDetailAPIView.as_view(), name='admin-user-import-detail'),
 ]
\ No newline at end of file
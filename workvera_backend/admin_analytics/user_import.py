@@ -0,0 +1,372 @@
+# admin_analytics/user_import.py
+"""
+Bulk user import for onboarding partner organisations: ``manage.py import_users`` and
+POST /api/admin_analytics/admin/users/import/.
+
+The input is CSV with a header row or NDJSON (one JSON object per line). It is read a
+line at a time, so memory use doesn't depend on the file size. Columns:
+
+    email (required), name, first_name, last_name, role (seeker or employer, default seeker),
+    password, bio, career_gap_years, linkedin_url, github_url
+
+Values are checked against the model fields, and passwords against AUTH_PASSWORD_VALIDATORS
+like a registration. A row is skipped when its email already has an account or appears
+earlier in the file, so re-running a file after an interruption only adds the missing
+users. Rows without a password get an unusable one; those users choose their password
+through the reset flow.
+
+CustomUserManager.create_user costs one INSERT, one password hash and, through the
+create_or_update_user_profile signal, one more INSERT per user. Here:
+- passwords are hashed by a pool of worker processes (USER_IMPORT_HASH_WORKERS, default
+  one per CPU, see admin_analytics/password_hashing.py) while the main process reads,
+  checks and inserts the batches around them,
+- each batch of users is written with bulk_create, and their Profiles right after, in one
+  transaction per batch. No per-row signals run; the dashboard counters they would have
+  bumped are adjusted per batch.
+
+With passwords, hashing sets the pace: Django's PBKDF2 hasher is made to take about half
+a second per password on one core, so the run time is rows x 0.5s / workers. Rows without
+passwords cost a few queries per batch of DEFAULT_BATCH_SIZE.
+
+Imports started through the API run on a background thread of the web process (one at a
+time) and record their progress in UserImport. An import in flight when the process
+exits stays ``running``; uploading the same file again finishes it.
+"""
+import csv
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait as wait_futures
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+from users.models import Profile
+from . import dashboard, password_hashing
+from .models import USER_ROLE_METRICS, UserImport
+
+FORMATS = ('csv', 'ndjson')
+USER_FIELDS = ('email', 'name', 'first_name', 'last_name', 'role')
+PROFILE_FIELDS = ('bio', 'career_gap_years', 'linkedin_url', 'github_url')
+DEFAULT_BATCH_SIZE = 1000
+# Passwords per task sent to a hashing worker: small enough to spread a batch over every worker
+HASH_CHUNK_SIZE = 50
+# Only the first invalid rows are reported back
+MAX_REPORTED_ERRORS = 100
+# Largest file the API accepts (USER_IMPORT_MAX_BYTES); about a million rows
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+COPY_BLOCK = 64 * 1024
+
+ImportRow = namedtuple('ImportRow', 'line user profile password')
+
+_executor = None
+_executor_lock = threading.Lock()
+_futures = set()
+
+
+class ImportFormatError(ValueError):
+    """The input can't be read as the given format at all (as opposed to a single bad row)."""
+
+
+def detect_format(name):
+    """'csv' or 'ndjson' from a file name or a Content-Type; None if it's neither."""
+    name = (name or '').split(';')[0].strip().lower()
+    if name.endswith(('.csv', '/csv')):
+        return 'csv'
+    if name.endswith(('.ndjson', '.jsonl', '/x-ndjson', '/ndjson', '/jsonl', '/x-jsonlines')):
+        return 'ndjson'
+    return None
+
+
+def read_lines(stream):
+    """Decoded lines of a binary file-like object (an open file, request.stream), one at a time."""
+    for line in iter(stream.readline, b''):
+        yield line.decode('utf-8-sig', errors='replace')
+
+
+def read_records(lines, input_format):
+    """(line number, {column: value}) per input row; the dict is None for NDJSON lines that aren't objects."""
+    if input_format not in FORMATS:
+        raise ImportFormatError(f"Unknown format {input_format!r}; use one of: {', '.join(FORMATS)}.")
+    if input_format == 'ndjson':
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield number, record if isinstance(record, dict) else None
+        return
+
+    reader = csv.DictReader(lines)
+    try:
+        if reader.fieldnames is None:
+            return  # empty file
+        reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+        if 'email' not in reader.fieldnames:
+            raise ImportFormatError("The CSV header has no 'email' column.")
+        for row in reader:
+            yield reader.line_num, row
+    except csv.Error as exc:
+        raise ImportFormatError(f"Line {reader.line_num}: {exc}")
+
+
+def _value(record, name):
+    value = record.get(name)
+    if value is None:
+        return ''
+    return value.strip() if isinstance(value, str) else value
+
+
+def clean_record(record):
+    """(user fields, profile fields, password) of one input row; raises ValidationError."""
+    if record is None:
+        raise ValidationError("Not a JSON object.")
+    user_model = get_user_model()
+    user, profile = {}, {}
+    for model, names, cleaned in ((user_model, USER_FIELDS, user), (Profile, PROFILE_FIELDS, profile)):
+        for name in names:
+            value = _value(record, name)
+            if value == '':
+                continue  # the model default
+            if name == 'email':
+                value = user_model.objects.normalize_email(str(value))
+            elif name == 'role':
+                value = str(value).lower()
+            try:
+                cleaned[name] = model._meta.get_field(name).clean(value, None)
+            except ValidationError as exc:
+                raise ValidationError(f"{name}: {' '.join(exc.messages)}")
+    if 'email' not in user:
+        raise ValidationError("email: This field is required.")
+
+    password = _value(record, 'password')
+    if not isinstance(password, str):
+        raise ValidationError("password: Must be a string.")
+    if password:
+        try:
+            validate_password(password, user_model(**user))
+        except ValidationError as exc:
+            raise ValidationError(f"password: {' '.join(exc.messages)}")
+    return user, profile, password
+
+
+class UserImporter:
+    """
+    Imports (line, record) pairs from ``read_records``. ``stats`` counts the input rows
+    and what became of them; ``progress(stats)`` is called after every batch.
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, workers=None, dry_run=False, progress=None):
+        self.batch_size = batch_size
+        self.workers = workers or getattr(settings, 'USER_IMPORT_HASH_WORKERS', None) or os.cpu_count() or 1
+        self.dry_run = dry_run
+        self.progress = progress or (lambda stats: None)
+        self.stats = {'rows': 0, 'created': 0, 'skipped': 0, 'invalid': 0}
+        self.errors = []  # the first MAX_REPORTED_ERRORS invalid rows
+        self.seen = set()
+        self.hasher = get_hasher()
+        self._pool = None
+
+    def run(self, records):
+        # One batch is inserted while the next one is being hashed
+        pending = deque()
+        try:
+            for batch in self.batches(records):
+                pending.append(self.hash_batch(batch))
+                if len(pending) > 1:
+                    self.write(*pending.popleft())
+            while pending:
+                self.write(*pending.popleft())
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+        return self.stats
+
+    def reject(self, line, email, message):
+        self.stats['invalid'] += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'email': email, 'error': message})
+
+    def existing_emails(self, emails):
+        return set(get_user_model().objects.filter(email__in=emails).values_list('email', flat=True))
+
+    def batches(self, records):
+        """Lists of valid ImportRows whose emails are new, at most batch_size long."""
+        batch = []
+        for line, record in records:
+            self.stats['rows'] += 1
+            try:
+                user, profile, password = clean_record(record)
+            except ValidationError as exc:
+                email = _value(record, 'email') if record is not None else ''
+                self.reject(line, str(email), exc.messages[0])
+                continue
+            if user['email'] in self.seen:
+                self.stats['skipped'] += 1
+                continue
+            self.seen.add(user['email'])
+            batch.append(ImportRow(line, user, profile, password))
+            if len(batch) >= self.batch_size:
+                yield self.drop_existing(batch)
+                batch = []
+        if batch:
+            yield self.drop_existing(batch)
+
+    def drop_existing(self, batch):
+        # Checked before hashing, so re-running a file doesn't hash the passwords of users it already added
+        taken = self.existing_emails([row.user['email'] for row in batch])
+        self.stats['skipped'] += len(taken)
+        return [row for row in batch if row.user['email'] not in taken]
+
+    def get_pool(self):
+        if self._pool is None:
+            # spawn: worker processes start clean instead of forking a threaded web server
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+        return self._pool
+
+    def hash_batch(self, batch):
+        """Start hashing the batch's passwords; returns (batch, [future, ...]) for ``write``."""
+        passwords = [row.password for row in batch if row.password]
+        if self.dry_run or not passwords:
+            return batch, []
+        pool = self.get_pool()
+        return batch, [pool.submit(password_hashing.hash_passwords, self.hasher, passwords[i:i + HASH_CHUNK_SIZE])
+                       for i in range(0, len(passwords), HASH_CHUNK_SIZE)]
+
+    def write(self, batch, hashing):
+        if self.dry_run:
+            self.stats['created'] += len(batch)
+            self.progress(self.stats)
+            return
+        hashes = iter([encoded for future in hashing for encoded in future.result()])
+        rows = [(row, next(hashes) if row.password else make_password(None)) for row in batch]
+        while True:
+            try:
+                created = self.insert(rows)
+            except IntegrityError:
+                # Someone signed up with one of the emails since drop_existing; skip them and retry
+                taken = self.existing_emails([row.user['email'] for row, _ in rows])
+                if not taken:
+                    raise
+                self.stats['skipped'] += len(taken)
+                rows = [(row, password) for row, password in rows if row.user['email'] not in taken]
+            else:
+                break
+
+        self.stats['created'] += len(created)
+        dashboard.adjust('total_users', len(created))
+        for role, metric in USER_ROLE_METRICS.items():
+            dashboard.adjust(metric, sum(1 for user in created if user.role == role))
+        self.progress(self.stats)
+
+    def insert(self, rows):
+        """Users and their Profiles in one transaction; returns the users."""
+        user_model = get_user_model()
+        users = [user_model(password=password, **row.user) for row, password in rows]
+        with transaction.atomic():
+            user_model.objects.bulk_create(users, batch_size=self.batch_size)
+            if any(user.pk is None for user in users):
+                # Databases that can't return the new ids from a bulk INSERT (MySQL)
+                ids = dict(user_model.objects.filter(email__in=[user.email for user in users])
+                           .values_list('email', 'pk'))
+                for user in users:
+                    user.pk = ids[user.email]
+            # What create_or_update_user_profile does for users created one at a time
+            Profile.objects.bulk_create([Profile(user_id=user.pk, **row.profile) for user, (row, _) in zip(users, rows)],
+                                        batch_size=self.batch_size)
+        return users
+
+
+def import_file(stream, input_format, **options):
+    """Import a binary file-like object; returns (stats, errors)."""
+    importer = UserImporter(**options)
+    importer.run(read_records(read_lines(stream), input_format))
+    return importer.stats, importer.errors
+
+
+def spool(stream, max_bytes):
+    """Copy a request body to a temporary file for the background import; returns its path, None if too large."""
+    total = 0
+    with tempfile.NamedTemporaryFile(dir=settings.FILE_UPLOAD_TEMP_DIR, suffix='.import', delete=False) as handle:
+        for block in iter(lambda: stream.read(COPY_BLOCK), b''):
+            total += len(block)
+            if total > max_bytes:
+                break
+            handle.write(block)
+    if total > max_bytes:
+        os.remove(handle.name)
+        return None
+    return handle.name
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # One import at a time per process; each one already keeps every CPU busy hashing
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='user-import')
+        return _executor
+
+
+def shutdown(wait=True):
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+def wait(timeout=None):
+    """Block until the imports started so far are finished (for tests)."""
+    with _executor_lock:
+        pending = set(_futures)
+    done, not_done = wait_futures(pending, timeout=timeout)
+    return not not_done
+
+
+def run_import(import_id, path):
+    """Import the spooled file of a UserImport, recording progress on it; removes the file."""
+    try:
+        user_import = UserImport.objects.get(pk=import_id)
+        UserImport.objects.filter(pk=import_id).update(status='running')
+        importer = UserImporter(progress=lambda stats: UserImport.objects.filter(pk=import_id).update(
+            errors=importer.errors, **stats))
+        try:
+            with open(path, 'rb') as handle:
+                importer.run(read_records(read_lines(handle), user_import.format))
+        except Exception as exc:
+            message = str(exc) if isinstance(exc, ImportFormatError) else f"{type(exc).__name__}: {exc}"
+            UserImport.objects.filter(pk=import_id).update(
+                status='failed', error=message[:1000], errors=importer.errors, finished_at=timezone.now(),
+                **importer.stats)
+        else:
+            UserImport.objects.filter(pk=import_id).update(
+                status='done', errors=importer.errors, finished_at=timezone.now(), **importer.stats)
+    finally:
+        os.remove(path)
+        close_old_connections()
+
+
+def _import_finished(future):
+    with _executor_lock:
+        _futures.discard(future)
+
+
+def start(user_import, path):
+    """Run the import of ``path`` (a spooled upload, removed afterwards) in the background."""
+    future = get_executor().submit(run_import, user_import.pk, path)
+    with _executor_lock:
+        _futures.add(future)
+    future.add_done_callback(_import_finished)
+    return future
@@ -1,12 +1,21 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import permissions, generics
+from rest_framework import permissions, generics, serializers, status
+from django.conf import settings
 from django.contrib.auth import get_user_model 
 from users.models import Profile 
+from users import authentication
 from jobs.models import JobPost, Application
+from jobs import list_cache
 from skills.models import SkillTest, SkillResult
 from users.serializers import CustomUserSerializer 
-from .serializers import BasicDashboardStatsSerializer
+from .models import UserImport
+from .serializers import BasicDashboardStatsSerializer, UserImportSerializer
+from . import dashboard, rollups, user_import
+from datetime import timedelta
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from workvera_backend import instrumentation
 from django_filters.rest_framework import DjangoFilterBackend 
 
 CustomUser = get_user_model()
@@ -14,24 +23,101 @@ CustomUser = get_user_model()
 class AdminDashboardStatsAPIView(APIView):
     """
     API endpoint for basic admin dashboard statistics.
-    GET /api/core/admin/stats/
+    GET /api/admin_analytics/admin/stats/
+    GET /api/admin_analytics/admin/stats/?refresh=1 - bypass the cached snapshot
     """
     permission_classes = [permissions.IsAdminUser] 
 
     def get(self, request, *args, **kwargs):
-        stats = {
-            'total_users': CustomUser.objects.count(),
-            'total_job_seekers': CustomUser.objects.filter(role='seeker').count(),
-            'total_employers': CustomUser.objects.filter(role='employer').count(),
-            'total_job_posts': JobPost.objects.count(),
-            'total_applications': Application.objects.count(),
-            'total_skill_tests': SkillTest.objects.count(),
-            # 'active_job_posts': JobPost.objects.filter(is_active=True).count(),
-            # 'applications_today': Application.objects.filter(applied_at__date=timezone.now().date()).count(),
-        }
-        serializer = BasicDashboardStatsSerializer(data=stats)
-        serializer.is_valid() # Data is constructed, so it should be valid
-        return Response(serializer.data)
+        # Cached snapshot kept current by signals; ?refresh=1 recomputes it (see dashboard.py)
+        refresh = request.query_params.get('refresh', '').lower() in ('1', 'true')
+        stats = dashboard.get_stats(refresh=refresh)
+        return Response(BasicDashboardStatsSerializer(stats).data)
+
+
+class AdminCacheStatsAPIView(APIView):
+    """
+    Hit/miss counters of the public job listing cache and of the token authentication cache.
+    GET /api/admin_analytics/admin/cache-stats/
+    DELETE /api/admin_analytics/admin/cache-stats/ - reset the counters
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response({'job_list': list_cache.stats(), 'auth_tokens': authentication.stats()})
+
+    def delete(self, request, *args, **kwargs):
+        list_cache.reset_stats()
+        authentication.reset_stats()
+        return Response({'job_list': list_cache.stats(), 'auth_tokens': authentication.stats()})
+
+
+class AdminPerformanceAPIView(APIView):
+    """
+    Per-request timings recorded by the instrumentation middleware (this process only).
+    GET /api/admin_analytics/admin/performance/ - latency percentiles, SQL and serializer time per endpoint
+    GET /api/admin_analytics/admin/performance/?recent=100 - also the last 100 requests (default 50)
+    DELETE /api/admin_analytics/admin/performance/ - clear the recorded data
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        try:
+            recent = max(0, int(request.query_params.get('recent', 50)))
+        except ValueError:
+            raise serializers.ValidationError({'recent': "Must be a number."})
+        data = instrumentation.get_recorder().snapshot(recent=recent)
+        return Response({'enabled': instrumentation.is_enabled(), **data})
+
+    def delete(self, request, *args, **kwargs):
+        instrumentation.get_recorder().reset()
+        return Response(status=204)
+
+
+class AdminTimeseriesAPIView(APIView):
+    """
+    Daily time series from the rollup tables (filled by `manage.py rollup_daily_metrics`).
+    GET /api/admin_analytics/admin/timeseries/?metric=applications&from=2025-01-01&to=2025-01-31
+    Optional: &dimension=<role or status> to keep one breakdown only.
+    metric: signups, job_posts, applications, skill_results, community_posts.
+    from/to default to the last 30 days; at most MAX_DAYS days per request.
+    Only reads DailyMetric, never the raw tables, so the cost depends on the range, not the data size.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    MAX_DAYS = 366
+    DEFAULT_DAYS = 30
+
+    def get_date(self, name, default):
+        value = self.request.query_params.get(name)
+        if not value:
+            return default
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise serializers.ValidationError({name: "Use the YYYY-MM-DD format."})
+        return parsed
+
+    def get(self, request, *args, **kwargs):
+        metric = request.query_params.get('metric')
+        if metric not in rollups.METRICS:
+            raise serializers.ValidationError({'metric': f"Must be one of: {', '.join(rollups.METRICS)}."})
+        end = self.get_date('to', timezone.localdate())
+        start = self.get_date('from', end - timedelta(days=self.DEFAULT_DAYS - 1))
+        if start > end:
+            raise serializers.ValidationError({'from': "Must not be after 'to'."})
+        if (end - start).days >= self.MAX_DAYS:
+            raise serializers.ValidationError({'from': f"At most {self.MAX_DAYS} days per request."})
+
+        points = rollups.timeseries(metric, start, end, dimension=request.query_params.get('dimension'))
+        return Response({
+            'metric': metric,
+            'from': start,
+            'to': end,
+            'total': sum(point['value'] for point in points),
+            'points': points,
+        })
 
 
 class AdminUserListAPIView(generics.ListAPIView):
@@ -43,7 +129,53 @@ class AdminUserListAPIView(generics.ListAPIView):
     queryset = CustomUser.objects.all().order_by('email')
     serializer_class = CustomUserSerializer 
     permission_classes = [permissions.IsAdminUser]
+    cursor_ordering = ('email',) # Keyset pagination on the unique email index
     filter_backends = [DjangoFilterBackend] 
     filterset_fields = ['role', 'is_active', 'is_staff'] 
     # search_fields = ['email', 'name', 'profile__location'] 
-    # filterset_class = UserFilterSet (define this class in a filters.py file)
\ No newline at end of file
+    # filterset_class = UserFilterSet (define this class in a filters.py file)
+
+
+class AdminUserImportAPIView(generics.ListCreateAPIView):
+    """
+    Bulk-create users with their profiles from a CSV or NDJSON file (admin_analytics/user_import.py).
+    POST /api/admin_analytics/admin/users/import/ - the file as the raw body, Content-Type text/csv or
+        application/x-ndjson (or ?file_format=csv|ndjson). Answers 202 with the import, which runs in the background.
+    GET /api/admin_analytics/admin/users/import/ - recent imports, newest first
+    GET /api/admin_analytics/admin/users/import/<id>/ - progress of one import
+    """
+    queryset = UserImport.objects.all()
+    serializer_class = UserImportSerializer
+    permission_classes = [permissions.IsAdminUser]
+    cursor_ordering = ('-created_at', '-id')
+
+    def create(self, request, *args, **kwargs):
+        input_format = request.query_params.get('file_format') or user_import.detect_format(request.content_type)
+        if input_format not in user_import.FORMATS:
+            raise serializers.ValidationError(
+                {'file_format': "Send text/csv or application/x-ndjson, or pass ?file_format=csv|ndjson."})
+        max_bytes = getattr(settings, 'USER_IMPORT_MAX_BYTES', user_import.DEFAULT_MAX_BYTES)
+        try:
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            length = 0
+        if length > max_bytes:
+            return Response({'detail': f"The file is larger than {max_bytes} bytes."},
+                            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        if request.stream is None:
+            raise serializers.ValidationError({'detail': "The request body is empty."})
+
+        # request.stream is copied to disk in blocks; request.data is never touched, so nothing buffers the body
+        path = user_import.spool(request.stream, max_bytes)
+        if path is None:
+            return Response({'detail': f"The file is larger than {max_bytes} bytes."},
+                            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        job = UserImport.objects.create(created_by=request.user, format=input_format)
+        user_import.start(job, path)
+        return Response(UserImportSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+class AdminUserImportDetailAPIView(generics.RetrieveAPIView):
+    queryset = UserImport.objects.all()
+    serializer_class = UserImportSerializer
+    permission_classes = [permissions.IsAdminUser]
@@ -0,0 +1,116 @@
+"""
+Concurrent apply benchmark for POST /api/jobs/posts/<id>/apply/.
+
+Seeds a temporary database, then runs many threads that apply to jobs at the same
+time. Every seeker applies to each of its jobs twice (the second time as a retry
+with the same Idempotency-Key) and some seekers race each other on the same
+(seeker, job) pair without a key. Reports throughput, latency percentiles and the
+response status mix. The run fails if any request returns a 5xx or if the number
+of stored applications is wrong.
+
+Usage (from workvera_backend/):
+    python -m benchmarks.apply_concurrency --threads 8 --seekers 200 --jobs 20
+"""
+import argparse
+import logging
+import random
+import statistics
+import threading
+import time
+from collections import Counter
+
+from benchmarks.common import setup_django, temporary_database
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def seed(n_seekers, n_jobs):
+    from jobs.models import JobPost
+    from users.models import CustomUser
+
+    employer = CustomUser.objects.create_user(email='bench-employer@example.com', role='employer', name='Bench Employer')
+    jobs = [JobPost.objects.create(title=f'Job {i}', description='Benchmark job', employer=employer) for i in range(n_jobs)]
+    seekers = [CustomUser.objects.create_user(email=f'bench-seeker{i}@example.com', role='seeker', name=f'Seeker {i}')
+               for i in range(n_seekers)]
+    return seekers, jobs
+
+
+def run(threads, n_seekers, n_jobs, jobs_per_seeker, seed_value):
+    from django.db import connection
+    from rest_framework.test import APIClient
+    from jobs.models import Application
+
+    seekers, jobs = seed(n_seekers, n_jobs)
+    rng = random.Random(seed_value)
+    requests = []
+    for seeker in seekers:
+        for job in rng.sample(jobs, jobs_per_seeker):
+            key = f'{seeker.pk}-{job.pk}'
+            requests.append((seeker, job, key))      # first attempt
+            requests.append((seeker, job, key))      # client retry with the same key
+            requests.append((seeker, job, None))     # duplicate without a key
+    rng.shuffle(requests)
+    expected_rows = n_seekers * jobs_per_seeker
+
+    lock = threading.Lock()
+    latencies, statuses = [], Counter()
+    queue = iter(requests)
+
+    def worker():
+        client = APIClient()
+        while True:
+            with lock:
+                item = next(queue, None)
+            if item is None:
+                break
+            seeker, job, key = item
+            client.force_authenticate(seeker)
+            headers = {'HTTP_IDEMPOTENCY_KEY': key} if key else {}
+            start = time.perf_counter()
+            response = client.post(f'/api/jobs/posts/{job.pk}/apply/', {'cover_letter': 'Hello'}, format='json', **headers)
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+                statuses[response.status_code] += 1
+        connection.close()
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    rows = Application.objects.count()
+    print(f"requests: {len(requests)}  threads: {threads}  wall: {wall:.2f}s  throughput: {len(requests) / wall:.0f} req/s")
+    print(f"latency ms  p50: {statistics.median(latencies):.2f}  p95: {percentile(latencies, 0.95):.2f}  "
+          f"p99: {percentile(latencies, 0.99):.2f}  max: {latencies[-1]:.2f}")
+    print("status codes: " + ', '.join(f'{code}={n}' for code, n in sorted(statuses.items())))
+    print(f"applications stored: {rows} (expected {expected_rows})")
+
+    server_errors = sum(n for code, n in statuses.items() if code >= 500)
+    if server_errors or rows != expected_rows:
+        raise SystemExit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--seekers', type=int, default=200)
+    parser.add_argument('--jobs', type=int, default=20)
+    parser.add_argument('--jobs-per-seeker', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    setup_django()
+    logging.getLogger('django.request').setLevel(logging.ERROR)  # expected 400s for duplicates
+    with temporary_database():
+        run(args.threads, args.seekers, args.jobs, args.jobs_per_seeker, args.seed)
+
+
+if __name__ == '__main__':
+    main()
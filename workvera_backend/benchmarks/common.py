@@ -0,0 +1,41 @@
+"""
+Helpers shared by the benchmark scripts.
+
+Benchmarks never touch db.sqlite3: ``temporary_database()`` creates a throw-away
+SQLite file (migrated from scratch) the same way the test runner does, and removes
+it afterwards.
+"""
+import contextlib
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_django():
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'workvera_backend.settings')
+    import django
+    django.setup()
+
+
+@contextlib.contextmanager
+def temporary_database(keep=False):
+    """Create, migrate and (unless keep=True) destroy a file-based SQLite benchmark database."""
+    from django.conf import settings
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    # Real files (rather than the test runner's in-memory DB) so several threads can share it
+    path = os.path.join(tempfile.mkdtemp(prefix='workvera-bench-'), 'bench.sqlite3')
+    settings.DATABASES['default'].setdefault('TEST', {})['NAME'] = path
+    settings.ALLOWED_HOSTS = list(settings.ALLOWED_HOSTS) + ['testserver']
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=False)
+    try:
+        yield path
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keep)
+        teardown_test_environment()
@@ -0,0 +1,253 @@
+"""
+Endpoint latency benchmark with regression baselines.
+
+Seeds a temporary database with ``seed_scale`` data (admin_analytics/seeding.py), then
+drives the main endpoints in-process through the full Django stack (middleware, token
+authentication, views, serializers, JSON rendering) and reports throughput and
+latency percentiles per scenario. Runs offline on one machine; nothing listens on a port.
+
+Results can be saved as a baseline JSON file and compared against later runs: the run
+fails (exit status 1) when a scenario's p50 or p95 grows by more than --threshold
+(a fraction, 0.25 = 25% slower) plus --min-delta-ms, which keeps sub-millisecond noise
+from failing the build. Baselines are only comparable on the same machine and scale.
+
+Usage (from workvera_backend/):
+    python -m benchmarks.endpoints                                # compare with benchmarks/baselines/endpoints.json
+    python -m benchmarks.endpoints --save-baseline                # record a new baseline
+    python -m benchmarks.endpoints --only job_list apply --requests 500
+    python -m benchmarks.endpoints --scale 0.1 --baseline benchmarks/baselines/endpoints-0.1.json
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import time
+from datetime import date, datetime, timezone as dt_timezone
+
+from benchmarks.common import BACKEND_DIR, setup_django, temporary_database
+
+DEFAULT_BASELINE = os.path.join(BACKEND_DIR, 'benchmarks', 'baselines', 'endpoints.json')
+SEED_UNTIL = date(2025, 6, 1)  # fixed so every run generates the same data
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+class Fixtures:
+    """The users and rows the scenarios act on, picked from the seeded data."""
+
+    def __init__(self, n_fresh):
+        from django.db.models import Count
+        from rest_framework.authtoken.models import Token
+        from community.models import Comment
+        from jobs.models import Application, JobPost
+        from skills.models import SkillTest
+        from users.models import CustomUser
+
+        self.employer = CustomUser.objects.get(pk=JobPost.objects.values('employer_id').annotate(n=Count('id'))
+                                               .order_by('-n', 'employer_id')[0]['employer_id'])
+        self.seeker = CustomUser.objects.get(pk=Application.objects.values('user_id').annotate(n=Count('id'))
+                                             .order_by('-n', 'user_id')[0]['user_id'])
+        self.admin = CustomUser.objects.create_superuser(email='bench-admin@example.com', name='Bench Admin')
+        self.job_ids = list(JobPost.objects.filter(is_active=True).order_by('pk').values_list('pk', flat=True)[:500])
+        self.application_ids = list(Application.objects.filter(job__employer=self.employer)
+                                    .order_by('pk').values_list('pk', flat=True)[:500])
+        self.post_id = (Comment.objects.values('post_id').annotate(n=Count('id'))
+                        .order_by('-n', 'post_id')[0]['post_id'])
+        self.test_ids = list(SkillTest.objects.order_by('pk').values_list('pk', flat=True))
+        # Seekers without applications or results, so every apply / submit request is a first one
+        fresh = CustomUser.objects.bulk_create(
+            [CustomUser(email=f'bench-fresh{i}@example.com', name=f'Fresh {i}', role='seeker', password='!')
+             for i in range(n_fresh)])
+        self.tokens = {user.pk: Token.objects.create(user=user).key
+                       for user in [self.employer, self.seeker, self.admin, *fresh]}
+        self.fresh_ids = [user.pk for user in fresh]
+
+
+def scenarios(fixtures):
+    """name -> (user id or None, iterator of (method, path, params or body))"""
+    job_ids = itertools.cycle(fixtures.job_ids)
+    application_ids = itertools.cycle(fixtures.application_ids)
+    statuses = itertools.cycle(['reviewed', 'shortlisted', 'interviewing', 'rejected'])
+    apply_pairs = zip(fixtures.fresh_ids, job_ids)
+    submit_pairs = zip(fixtures.fresh_ids, itertools.cycle(fixtures.test_ids))
+    seeker, employer, admin = fixtures.seeker.pk, fixtures.employer.pk, fixtures.admin.pk
+
+    return {
+        'job_list': (seeker, itertools.repeat(('get', '/api/jobs/posts/', {}))),
+        'job_list_anonymous': (None, itertools.repeat(('get', '/api/jobs/posts/', {'format': 'json'}))),
+        'job_search': (seeker, itertools.cycle([('get', '/api/jobs/posts/', {'q': q})
+                                                for q in ('python', 'senior engineer', 'remote', 'data*', 'react')])),
+        'job_detail': (seeker, (('get', f'/api/jobs/posts/{job_id}/', {}) for job_id in job_ids)),
+        'apply': (None, ((user_id, 'post', f'/api/jobs/posts/{job_id}/apply/', {'cover_letter': 'Hello'})
+                         for user_id, job_id in apply_pairs)),
+        'my_posts': (employer, itertools.repeat(('get', '/api/jobs/posts/my-posts/', {}))),
+        'application_list': (employer, itertools.repeat(('get', '/api/jobs/applications/', {}))),
+        'status_update': (employer, (('patch', f'/api/jobs/applications/{application_id}/update-status/',
+                                      {'status': next(statuses)}) for application_id in application_ids)),
+        'skill_submit': (None, ((user_id, 'post', f'/api/skills/tests/{test_id}/submit/', {'score': 80})
+                                for user_id, test_id in submit_pairs)),
+        'comment_tree': (seeker, itertools.repeat(('get', f'/api/community/posts/{fixtures.post_id}/comments/', {}))),
+        'admin_stats': (admin, itertools.repeat(('get', '/api/admin_analytics/admin/stats/', {}))),
+    }
+
+
+def run_scenario(fixtures, user_id, requests, n_requests, warmup):
+    from rest_framework.test import APIClient
+
+    clients = {}
+
+    def client_for(uid):
+        client = clients.get(uid)
+        if client is None:
+            client = clients[uid] = APIClient()
+            if uid is not None:
+                client.credentials(HTTP_AUTHORIZATION=f'Token {fixtures.tokens[uid]}')
+        return client
+
+    latencies = []
+    started = None
+    for i in range(warmup + n_requests):
+        request = next(requests)
+        if len(request) == 4:  # per-request user (apply / submit)
+            uid, method, path, data = request
+        else:
+            uid, (method, path, data) = user_id, request
+        client = client_for(uid)
+        if i == warmup:
+            started = time.perf_counter()
+        start = time.perf_counter()
+        if method == 'get':
+            response = client.get(path, data)
+        else:
+            response = getattr(client, method)(path, data, format='json')
+        elapsed = (time.perf_counter() - start) * 1000
+        if response.status_code >= 400:
+            raise SystemExit(f"{method.upper()} {path} returned {response.status_code}: {response.content[:300]!r}")
+        if i >= warmup:
+            latencies.append(elapsed)
+    wall = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'count': len(latencies),
+        'rps': round(len(latencies) / wall, 1),
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+        'max_ms': round(latencies[-1], 3),
+    }
+
+
+def compare(results, baseline, threshold, min_delta_ms):
+    """Regressions of ``results`` against ``baseline``, as printable lines."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if previous is None:
+            continue
+        for metric in ('p50_ms', 'p95_ms'):
+            limit = previous[metric] * (1 + threshold) + min_delta_ms
+            if current[metric] > limit:
+                regressions.append(f"{name} {metric}: {current[metric]:.2f}ms > {limit:.2f}ms "
+                                   f"(baseline {previous[metric]:.2f}ms)")
+    return regressions
+
+
+def run(args):
+    from django.core.cache import cache
+    from django.test import override_settings
+    from admin_analytics.seeding import ScaleSeeder, DEFAULT_COUNTS
+
+    counts = {name: max(1, round(n * args.scale)) for name, n in DEFAULT_COUNTS.items()}
+    started = time.perf_counter()
+    ScaleSeeder(counts, seed=args.seed, until=SEED_UNTIL, batch_size=5000).run()
+    n_fresh = args.requests + args.warmup
+    fixtures = Fixtures(n_fresh)
+    print(f"seeded {counts['applications']} applications, {counts['jobs']} jobs, "
+          f"{counts['comments']} comments in {time.perf_counter() - started:.1f}s")
+
+    selected = scenarios(fixtures)
+    if args.only:
+        unknown = set(args.only) - set(selected)
+        if unknown:
+            raise SystemExit(f"unknown scenarios: {', '.join(sorted(unknown))}; choose from {', '.join(selected)}")
+        selected = {name: selected[name] for name in args.only}
+
+    results = {}
+    print(f"{'scenario':<20} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    # DEBUG would record every query; the instrumentation middleware is measured separately
+    with override_settings(DEBUG=False, PERF_INSTRUMENTATION_ENABLED=False):
+        for name, (user_id, requests) in selected.items():
+            cache.clear()
+            result = results[name] = run_scenario(fixtures, user_id, requests, args.requests, args.warmup)
+            print(f"{name:<20} {result['rps']:>8} {result['p50_ms']:>9} {result['p95_ms']:>9} "
+                  f"{result['p99_ms']:>9} {result['max_ms']:>9}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=float, default=0.01, help="seed_scale --scale for the dataset (default 0.01).")
+    parser.add_argument('--requests', type=int, default=200, help="Measured requests per scenario.")
+    parser.add_argument('--warmup', type=int, default=20, help="Unmeasured requests per scenario.")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--only', nargs='+', metavar='SCENARIO')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON file to compare with or save to.")
+    parser.add_argument('--save-baseline', action='store_true', help="Write the results to --baseline instead of comparing.")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed slowdown as a fraction (default 0.25).")
+    parser.add_argument('--min-delta-ms', type=float, default=1.0, help="Slowdowns smaller than this never fail.")
+    parser.add_argument('--output', help="Also write this run's results to a JSON file.")
+    args = parser.parse_args()
+
+    setup_django()
+    import django
+
+    with temporary_database():
+        results = run(args)
+
+    report = {
+        'meta': {
+            'created_at': datetime.now(dt_timezone.utc).isoformat(timespec='seconds'),
+            'scale': args.scale,
+            'requests': args.requests,
+            'seed': args.seed,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'machine': f'{platform.system()} {platform.machine()}',
+        },
+        'scenarios': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(report, handle, indent=2)
+
+    if args.save_baseline:
+        if args.only and os.path.exists(args.baseline):
+            # Keep the scenarios that weren't run this time
+            with open(args.baseline) as handle:
+                report['scenarios'] = {**json.load(handle).get('scenarios', {}), **results}
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w') as handle:
+            json.dump(report, handle, indent=2)
+            handle.write('\n')
+        print(f"baseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+    with open(args.baseline) as handle:
+        baseline = json.load(handle)
+    if baseline.get('meta', {}).get('scale') != args.scale:
+        print(f"warning: baseline was recorded at scale {baseline.get('meta', {}).get('scale')}, this run used {args.scale}")
+    regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+    if regressions:
+        print("REGRESSIONS:\n  " + '\n  '.join(regressions))
+        raise SystemExit(1)
+    print(f"no regressions against {args.baseline} (threshold {args.threshold:.0%} + {args.min_delta_ms}ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Overhead of the request instrumentation middleware (workvera_backend/instrumentation.py).
+
+Seeds a temporary database, then requests a few typical endpoints in alternating
+rounds with PERF_INSTRUMENTATION_ENABLED off and on, and compares the median time
+per round. The run fails if the instrumented rounds are more than --max-overhead
+percent slower.
+
+Usage (from workvera_backend/):
+    python -m benchmarks.instrumentation_overhead --rounds 30 --jobs 200
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.common import setup_django, temporary_database
+
+ENDPOINTS = (
+    ('/api/jobs/posts/', {'page_size': 50}),
+    ('/api/jobs/applications/', {'page_size': 50}),
+    ('/api/community/posts/', {'page_size': 20}),
+)
+
+
+def seed(n_jobs):
+    from community.models import Post
+    from jobs.models import Application, JobPost
+    from users.models import CustomUser
+
+    employer = CustomUser.objects.create_user(email='bench-employer@example.com', role='employer', name='Bench Employer')
+    seekers = [CustomUser.objects.create_user(email=f'bench-seeker{i}@example.com', role='seeker', name=f'Seeker {i}')
+               for i in range(20)]
+    jobs = JobPost.objects.bulk_create(
+        JobPost(title=f'Job {i}', description='Benchmark job', employer=employer, skill_tags='Python,Django')
+        for i in range(n_jobs))
+    for job in jobs[:50]:
+        for seeker in seekers[:5]:
+            Application.objects.create(user=seeker, job=job)
+    for i in range(50):
+        Post.objects.create(author=seekers[i % len(seekers)], title=f'Post {i}', content='Benchmark post')
+    return employer
+
+
+def timed_round(user, requests_per_endpoint):
+    from rest_framework.test import APIClient
+
+    client = APIClient()  # new handler, so the middleware is (not) loaded per the current settings
+    client.force_authenticate(user)
+    start = time.perf_counter()
+    for url, params in ENDPOINTS:
+        for _ in range(requests_per_endpoint):
+            response = client.get(url, params)
+            assert response.status_code == 200, (url, response.status_code)
+    return time.perf_counter() - start
+
+
+def run(rounds, n_jobs, requests_per_endpoint, max_overhead):
+    from django.test import override_settings
+    from workvera_backend import instrumentation
+
+    user = seed(n_jobs)
+    timings = {False: [], True: []}
+    for enabled in (False, True):  # warm-up
+        with override_settings(PERF_INSTRUMENTATION_ENABLED=enabled, PERF_SLOW_REQUEST_MS=None):
+            timed_round(user, requests_per_endpoint)
+    for _ in range(rounds):
+        for enabled in (False, True):
+            with override_settings(PERF_INSTRUMENTATION_ENABLED=enabled, PERF_SLOW_REQUEST_MS=None):
+                timings[enabled].append(timed_round(user, requests_per_endpoint))
+
+    off, on = statistics.median(timings[False]), statistics.median(timings[True])
+    overhead = (on - off) / off * 100
+    per_round = requests_per_endpoint * len(ENDPOINTS)
+    print(f"rounds: {rounds}  requests/round: {per_round}")
+    print(f"median round  off: {off * 1000:.1f}ms  on: {on * 1000:.1f}ms  overhead: {overhead:+.2f}%")
+    for row in instrumentation.get_recorder().snapshot(recent=0)['endpoints']:
+        print(f"  {row['endpoint']:<40} p50 {row['p50_ms']}ms  p95 {row['p95_ms']}ms  "
+              f"sql {row['avg_sql_count']} ({row['avg_sql_ms']}ms)  serializers {row['avg_serializer_ms']}ms")
+    if overhead > max_overhead:
+        raise SystemExit(f"instrumentation overhead {overhead:.2f}% is above {max_overhead}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=30)
+    parser.add_argument('--jobs', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=5, help="Requests per endpoint per round.")
+    parser.add_argument('--max-overhead', type=float, default=5.0, help="Percent.")
+    args = parser.parse_args()
+
+    setup_django()
+    with temporary_database():
+        run(args.rounds, args.jobs, args.requests, args.max_overhead)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""
+Query plan benchmark for the hot list queries and their composite indexes.
+
+Seeds a temporary SQLite database, then for each hot query shape prints the
+EXPLAIN QUERY PLAN output and the median / p95 latency of fetching one page,
+first with the composite indexes from the *_hot_query_indexes migrations dropped
+("before") and then with them in place ("after"). A plan that still says
+"USE TEMP B-TREE FOR ORDER BY" sorts every matching row for each page.
+
+Usage (from workvera_backend/):
+    python -m benchmarks.query_plans
+    python -m benchmarks.query_plans --jobs 50000 --applications 200000 --repeat 50
+"""
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.common import setup_django, temporary_database
+
+PAGE_SIZE = 20
+
+# (app_label, model name, index name) added for the hot query shapes
+HOT_INDEXES = [
+    ('jobs', 'JobPost', 'jobs_post_active_posted_idx'),
+    ('jobs', 'JobPost', 'jobs_post_employer_posted_idx'),
+    ('jobs', 'Application', 'jobs_app_job_applied_idx'),
+    ('skills', 'SkillResult', 'skills_result_user_sub_idx'),
+    ('community', 'Comment', 'community_comment_thread_idx'),
+]
+
+
+def spread_timestamps(model, field, seed_value):
+    # bulk_create() overwrites auto_now_add fields with "now"; scatter them over a year instead
+    from django.db import connection
+
+    table = model._meta.db_table
+    column = model._meta.get_field(field).column
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {table} SET {column} = strftime('%%Y-%%m-%%d %%H:%%M:%%f', "
+            f"1700000000 + ((id * 2654435761 + %s) %% 31536000), 'unixepoch')",
+            [seed_value],
+        )
+
+
+def seed(n_employers, n_seekers, n_jobs, n_applications, n_results, n_posts, n_comments, seed_value):
+    from django.db import transaction
+
+    from community.models import Comment, Post
+    from jobs.models import Application, JobPost
+    from skills.models import SkillResult, SkillTest
+    from users.models import CustomUser
+
+    rng = random.Random(seed_value)
+    with transaction.atomic():
+        CustomUser.objects.bulk_create(
+            [CustomUser(email=f'employer{i}@example.com', name=f'Employer {i}', role='employer', password='!')
+             for i in range(n_employers)]
+            + [CustomUser(email=f'seeker{i}@example.com', name=f'Seeker {i}', role='seeker', password='!')
+               for i in range(n_seekers)],
+            batch_size=2000,
+        )
+        employer_ids = list(CustomUser.objects.filter(role='employer').values_list('id', flat=True))
+        seeker_ids = list(CustomUser.objects.filter(role='seeker').values_list('id', flat=True))
+
+        JobPost.objects.bulk_create(
+            [JobPost(title=f'Job {i}', description='Benchmark job', employer_id=rng.choice(employer_ids),
+                     is_active=rng.random() < 0.8)
+             for i in range(n_jobs)],
+            batch_size=2000,
+        )
+        job_ids = list(JobPost.objects.values_list('id', flat=True))
+
+        pairs = set()
+        while len(pairs) < min(n_applications, len(seeker_ids) * len(job_ids)):
+            pairs.add((rng.choice(seeker_ids), rng.choice(job_ids)))
+        Application.objects.bulk_create(
+            [Application(user_id=user_id, job_id=job_id) for user_id, job_id in pairs], batch_size=2000)
+
+        tests = SkillTest.objects.bulk_create([SkillTest(title=f'Test {i}', description='Benchmark') for i in range(200)])
+        test_ids = [test.pk for test in tests]
+        pairs = set()
+        while len(pairs) < min(n_results, len(seeker_ids) * len(test_ids)):
+            pairs.add((rng.choice(seeker_ids), rng.choice(test_ids)))
+        SkillResult.objects.bulk_create(
+            [SkillResult(user_id=user_id, test_id=test_id, score=rng.random() * 100) for user_id, test_id in pairs],
+            batch_size=2000,
+        )
+
+        Post.objects.bulk_create(
+            [Post(author_id=rng.choice(seeker_ids), title=f'Post {i}', content='Benchmark') for i in range(n_posts)])
+        post_ids = list(Post.objects.values_list('id', flat=True))
+        Comment.objects.bulk_create(
+            [Comment(post_id=rng.choice(post_ids), author_id=rng.choice(seeker_ids), content='Benchmark')
+             for _ in range(n_comments)],
+            batch_size=2000,
+        )
+        # Roughly a third of the comments become replies to an earlier comment on the same post
+        roots = {}
+        replies = []
+        for comment in Comment.objects.order_by('id').only('id', 'post_id'):
+            if comment.post_id in roots and rng.random() < 0.35:
+                comment.parent_comment_id = rng.choice(roots[comment.post_id])
+                replies.append(comment)
+            else:
+                roots.setdefault(comment.post_id, []).append(comment.id)
+        Comment.objects.bulk_update(replies, ['parent_comment'], batch_size=2000)
+
+        for model, field in ((JobPost, 'posted_at'), (Application, 'applied_at'),
+                             (SkillResult, 'submitted_at'), (Comment, 'created_at')):
+            spread_timestamps(model, field, seed_value)
+
+    # A typical employer / seeker / post to run the queries for
+    from django.db.models import Count
+    busiest_employer = (JobPost.objects.values('employer_id').annotate(n=Count('id')).order_by('-n')[0]['employer_id'])
+    busiest_seeker = (SkillResult.objects.values('user_id').annotate(n=Count('id')).order_by('-n')[0]['user_id'])
+    busiest_post = (Comment.objects.values('post_id').annotate(n=Count('id')).order_by('-n')[0]['post_id'])
+    return busiest_employer, busiest_seeker, busiest_post
+
+
+def hot_queries(employer_id, seeker_id, post_id):
+    """The list queries of the views, sliced to one page as the paginator does."""
+    from community.models import Comment
+    from jobs.models import Application, JobPost
+    from skills.models import SkillResult
+
+    return [
+        ('public job list', JobPost.objects.filter(is_active=True).order_by('-posted_at', '-id')),
+        ('employer my-posts', JobPost.objects.filter(employer_id=employer_id).order_by('-posted_at', '-id')),
+        ('employer applications', Application.objects.filter(job__employer_id=employer_id).order_by('-applied_at', '-id')),
+        ('seeker skill results', SkillResult.objects.filter(user_id=seeker_id).order_by('-submitted_at', '-id')),
+        ('post top-level comments', Comment.objects.filter(post_id=post_id, parent_comment__isnull=True).order_by('created_at', 'id')),
+    ]
+
+
+def measure(queries, repeat):
+    results = {}
+    for label, queryset in queries:
+        page = queryset[:PAGE_SIZE]
+        plan = page.explain()
+        list(page)  # warm up
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            list(page.all())
+            samples.append((time.perf_counter() - start) * 1000)
+        samples.sort()
+        results[label] = {
+            'plan': plan,
+            'p50': statistics.median(samples),
+            'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        }
+    return results
+
+
+def set_hot_indexes(enabled):
+    from django.apps import apps
+    from django.db import connection
+
+    with connection.schema_editor() as schema_editor:
+        for app_label, model_name, index_name in HOT_INDEXES:
+            model = apps.get_model(app_label, model_name)
+            index = next(index for index in model._meta.indexes if index.name == index_name)
+            if enabled:
+                schema_editor.add_index(model, index)
+            else:
+                schema_editor.remove_index(model, index)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def report(before, after):
+    print(f"{'query':<26} {'before p50 ms':>14} {'after p50 ms':>13} {'before p95':>11} {'after p95':>10} {'speedup':>8}")
+    for label in before:
+        b, a = before[label], after[label]
+        speedup = b['p50'] / a['p50'] if a['p50'] else float('inf')
+        print(f"{label:<26} {b['p50']:>14.3f} {a['p50']:>13.3f} {b['p95']:>11.3f} {a['p95']:>10.3f} {speedup:>7.1f}x")
+    for label in before:
+        print(f"\n== {label}")
+        print("-- before\n" + before[label]['plan'])
+        print("-- after\n" + after[label]['plan'])
+
+
+def run(args):
+    from django.db import connection
+
+    if connection.vendor != 'sqlite':
+        raise SystemExit("EXPLAIN QUERY PLAN output is SQLite-specific; run against the default SQLite settings.")
+    start = time.perf_counter()
+    employer_id, seeker_id, post_id = seed(args.employers, args.seekers, args.jobs, args.applications,
+                                           args.results, args.posts, args.comments, args.seed)
+    print(f"Seeded in {time.perf_counter() - start:.1f}s "
+          f"({args.jobs} jobs, {args.applications} applications, {args.results} skill results, {args.comments} comments)\n")
+
+    queries = hot_queries(employer_id, seeker_id, post_id)
+    set_hot_indexes(False)
+    before = measure(queries, args.repeat)
+    set_hot_indexes(True)
+    after = measure(queries, args.repeat)
+    report(before, after)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--employers', type=int, default=200)
+    parser.add_argument('--seekers', type=int, default=5000)
+    parser.add_argument('--jobs', type=int, default=20000)
+    parser.add_argument('--applications', type=int, default=100000)
+    parser.add_argument('--results', type=int, default=50000)
+    parser.add_argument('--posts', type=int, default=500)
+    parser.add_argument('--comments', type=int, default=30000)
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    setup_django()
+    with temporary_database():
+        run(args)
+
+
+if __name__ == '__main__':
+    main()
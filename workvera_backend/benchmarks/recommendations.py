@@ -0,0 +1,79 @@
+"""
+Standalone benchmark for the job recommendation scoring (jobs/recommendations.py).
+
+Builds synthetic job feature matrices (no database needed) and reports the time to
+load the matrix, score one seeker, and apply a single-job incremental update.
+
+Usage (from workvera_backend/):
+    python -m benchmarks.recommendations
+    python -m benchmarks.recommendations --sizes 10000 100000 1000000 --repeat 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'workvera_backend.settings')
+
+from jobs.recommendations import JobFeatureMatrix  # noqa: E402
+
+
+def synthetic_jobs(n_jobs, n_skills, max_tags, rng):
+    job_ids = np.arange(1, n_jobs + 1)
+    gap_friendly = rng.random(n_jobs) < 0.3
+    posted_at = 1.7e9 + rng.random(n_jobs) * 3e7
+    tags_per_job = rng.integers(1, max_tags + 1, size=n_jobs)
+    link_job_ids = np.repeat(job_ids, tags_per_job)
+    link_skill_ids = rng.integers(1, n_skills + 1, size=len(link_job_ids))
+    return job_ids, gap_friendly, posted_at, link_job_ids, link_skill_ids
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def run(sizes, n_skills, max_tags, repeat, seed):
+    rng = np.random.default_rng(seed)
+    seeker = {int(skill_id): float(rng.random()) for skill_id in rng.choice(np.arange(1, n_skills + 1), 12, replace=False)}
+
+    print(f"{'jobs':>10} {'load ms':>10} {'score p50 ms':>13} {'score p95 ms':>13} {'upsert p50 us':>14}")
+    for n_jobs in sizes:
+        data = synthetic_jobs(n_jobs, n_skills, max_tags, rng)
+        matrix = JobFeatureMatrix()
+        load_ms = timed(lambda: matrix.load(*data), 1)[0]
+
+        matrix.score(seeker, career_gap_years=2)  # warm up
+        score_ms = sorted(timed(lambda: matrix.score(seeker, career_gap_years=2, limit=100), repeat))
+
+        job_ids = rng.integers(1, n_jobs + 1, size=repeat)
+        upserts = iter(job_ids.tolist())
+        upsert_us = [ms * 1000 for ms in timed(
+            lambda: matrix.upsert(next(upserts), True, 1.75e9, [1, 2, 3]), repeat)]
+
+        p95 = score_ms[min(len(score_ms) - 1, int(len(score_ms) * 0.95))]
+        print(f"{n_jobs:>10} {load_ms:>10.1f} {statistics.median(score_ms):>13.2f} {p95:>13.2f} "
+              f"{statistics.median(upsert_us):>14.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--skills', type=int, default=2000, help="Number of distinct skills")
+    parser.add_argument('--max-tags', type=int, default=12, help="Maximum skill tags per job")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    run(args.sizes, args.skills, args.max_tags, args.repeat, args.seed)
+
+
+if __name__ == '__main__':
+    main()
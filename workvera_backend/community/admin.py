@@ -10,16 +10,14 @@ class CommentInline(admin.TabularInline):
 
 
 class PostAdmin(admin.ModelAdmin):
-    list_display = ('title', 'author', 'created_at', 'comments_count_admin')
+    list_display = ('title', 'author', 'created_at', 'comments_count', 'last_activity_at')
     list_filter = ('created_at', 'author')
     search_fields = ('title', 'content', 'author__email')
     raw_id_fields = ('author',)
+    list_select_related = ('author',)
+    readonly_fields = ('comments_count', 'last_activity_at')
     inlines = [CommentInline]
 
-    def comments_count_admin(self, obj):
-        return obj.comments.count()
-    comments_count_admin.short_description = 'Comments Count'
-
 
 class CommentAdmin(admin.ModelAdmin):
     list_display = ('content_snippet', 'author', 'post', 'parent_comment', 'created_at')
@@ -0,0 +1,24 @@
+# community/counters.py
+"""
+Bulk recomputation of the denormalized Post counters (comments_count, last_activity_at).
+Normally they are maintained by the Comment signals in community/models.py; this is
+for repairs after bulk loads, raw SQL or any other drift.
+"""
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+
+def recompute_post_counters(post_model, comment_model, posts=None):
+    """
+    Recompute the counters of ``posts`` (a Post queryset, all posts by default) with one
+    UPDATE ... SET col = (correlated subquery). Takes the models as arguments so data
+    migrations can pass their historical versions. Returns the number of posts updated.
+    """
+    comments = comment_model.objects.filter(post=OuterRef('pk')).order_by().values('post')
+    count = comments.annotate(n=Count('pk')).values('n')
+    newest = comments.annotate(newest=Max('created_at')).values('newest')
+    posts = posts if posts is not None else post_model.objects.all()
+    return posts.update(
+        comments_count=Coalesce(Subquery(count, output_field=IntegerField()), Value(0)),
+        last_activity_at=Coalesce(Greatest('created_at', Subquery(newest)), 'created_at'),
+    )
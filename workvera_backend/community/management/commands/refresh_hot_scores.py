@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from community import ranking
+from community.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Post.hot_score from the comments of recently active posts. "
+        "Run periodically (e.g. hourly) to account for deleted comments and any drift."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7,
+                            help="Only posts with activity in the last N days (default 7).")
+        parser.add_argument('--all', action='store_true', help="Recompute every post.")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        posts = Post.objects.all()
+        if not options['all']:
+            posts = posts.filter(last_activity_at__gte=timezone.now() - timedelta(days=options['days']))
+        total = ranking.refresh(posts, Comment, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Refreshed hot scores of {total} posts."))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from community.counters import recompute_post_counters
+from community.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = "Recompute Post.comments_count and Post.last_activity_at from the comments table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--post', type=int, action='append', dest='post_ids',
+                            help="Only repair this post id (can be repeated).")
+
+    def handle(self, *args, **options):
+        posts = Post.objects.all()
+        if options['post_ids']:
+            posts = posts.filter(pk__in=options['post_ids'])
+        total = recompute_post_counters(Post, Comment, posts)
+        self.stdout.write(self.style.SUCCESS(f"Repaired counters of {total} posts."))
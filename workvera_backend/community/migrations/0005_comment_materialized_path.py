@@ -0,0 +1,57 @@
+# Generated by Django 5.2.1 on 2026-10-17 01:45
+
+from django.db import migrations, models
+
+from community.threads import build_path
+
+
+def fill_comment_paths(apps, schema_editor):
+    Comment = apps.get_model('community', 'Comment')
+    parents = dict(Comment.objects.values_list('id', 'parent_comment_id'))
+    children = {}
+    for comment_id, parent_id in parents.items():
+        children.setdefault(parent_id, []).append(comment_id)
+
+    # Walk the tree from the top-level comments down so every parent's path is known first
+    paths = {}
+    depths = {}
+    stack = [(comment_id, '', 0) for comment_id in children.get(None, [])]
+    while stack:
+        comment_id, parent_path, depth = stack.pop()
+        paths[comment_id] = build_path(parent_path, comment_id)
+        depths[comment_id] = depth
+        stack.extend((child_id, paths[comment_id], depth + 1) for child_id in children.get(comment_id, []))
+
+    comments = list(Comment.objects.only('id'))
+    for comment in comments:
+        comment.path = paths.get(comment.id, build_path('', comment.id))
+        comment.depth = depths.get(comment.id, 0)
+        comment.replies_count = len(children.get(comment.id, []))
+    Comment.objects.bulk_update(comments, ['path', 'depth', 'replies_count'], batch_size=1000)
+
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0004_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='path',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=248),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='replies_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_comment_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-17 01:46
+
+import django.utils.timezone
+from django.db import migrations, models
+
+from community.counters import recompute_post_counters
+
+
+def fill_post_counters(apps, schema_editor):
+    recompute_post_counters(apps.get_model('community', 'Post'), apps.get_model('community', 'Comment'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0005_comment_materialized_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.RunPython(fill_post_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.1 on 2026-10-17 01:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+from community import ranking
+
+
+def fill_hot_scores(apps, schema_editor):
+    Post = apps.get_model('community', 'Post')
+    ranking.refresh(Post.objects.all(), apps.get_model('community', 'Comment'))
+
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0006_post_comment_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='hot_score',
+            field=models.FloatField(default=0.0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-hot_score', '-id'], name='community_post_hot_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['last_activity_at'], name='community_post_activity_idx'),
+        ),
+        migrations.RunPython(fill_hot_scores, migrations.RunPython.noop),
+    ]
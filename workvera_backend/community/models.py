@@ -1,5 +1,10 @@
 from django.db import models
+from django.db.models import Exists, F, OuterRef, QuerySet, Subquery
+from django.db.models.functions import Coalesce
 from django.conf import settings 
+from django.utils import timezone
+from workvera_backend import pubsub
+from . import ranking, threads
 
 class Post(models.Model):
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='community_posts')
@@ -8,9 +13,27 @@ class Post(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     # Example: tags = TaggableManager() (using django-taggit)
+    # Denormalized by the Comment signals below; `manage.py repair_post_counters` recomputes them
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
+    last_activity_at = models.DateTimeField(default=timezone.now, editable=False) # newest comment, or creation
+    # Time-shifted log of the decayed activity (see community/ranking.py); only ever compared, never shown
+    hot_score = models.FloatField(default=0.0, editable=False)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination (-created_at, -id)
+            models.Index(fields=['-created_at', '-id'], name='community_post_created_id_idx'),
+            # ?sort=hot feed, keyset on (-hot_score, -id)
+            models.Index(fields=['-hot_score', '-id'], name='community_post_hot_idx'),
+            # Recently active posts for `manage.py refresh_hot_scores`
+            models.Index(fields=['last_activity_at'], name='community_post_activity_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            self.hot_score = ranking.hot_score(self.last_activity_at)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.title
@@ -23,9 +46,80 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     parent_comment = models.ForeignKey('self', null=True, blank=True, on_delete=models.CASCADE, related_name='replies') # For threaded comments
+    # Materialized path: the fixed-width ids of all ancestors and of the comment itself, so a whole
+    # subtree is one indexed range scan (path >= root.path AND path < root.path + '~'); see community/threads.py
+    path = models.CharField(max_length=threads.PATH_MAX_LENGTH, db_index=True, editable=False, default='')
+    depth = models.PositiveSmallIntegerField(default=0, editable=False) # 0 for top-level comments
+    replies_count = models.PositiveIntegerField(default=0, editable=False) # direct replies only
 
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            # Top-level comments of a post: filter(post=p, parent_comment__isnull=True).order_by('created_at', 'id')
+            models.Index(fields=['post', 'parent_comment', 'created_at', 'id'], name='community_comment_thread_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if not self.path:
+            # The path ends with our own id, so it can only be set once the row exists
+            parent = self.parent_comment
+            self.depth = parent.depth + 1 if parent else 0
+            self.path = threads.build_path(parent.path if parent else '', self.pk)
+            Comment.objects.filter(pk=self.pk).update(path=self.path, depth=self.depth)
+        if adding:
+            # Push to clients watching the post (community/streams.py); here rather than in
+            # post_save, so the event carries the path and depth set above
+            from .serializers import CommentSerializer
+            from .streams import post_topic
+            pubsub.publish_on_commit(post_topic(self.post_id), {'event': 'comment', 'data': CommentSerializer(self).data})
 
     def __str__(self):
-        return f"Comment by {self.author.email} on '{self.post.title}'"
\ No newline at end of file
+        return f"Comment by {self.author.email} on '{self.post.title}'"
+
+
+# Signals to keep Comment.replies_count and Post.comments_count / last_activity_at / hot_score current.
+# Deleting a comment cascades to its replies; Django sends post_delete for each of them,
+# so every removed comment is subtracted once.
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+@receiver(post_save, sender=Comment)
+def count_comment(sender, instance, created, raw=False, **kwargs):
+    if not created or raw:
+        return
+    Post.objects.filter(pk=instance.post_id).update(
+        comments_count=F('comments_count') + 1,
+        last_activity_at=instance.created_at,
+        hot_score=ranking.add_comment_expression(instance.created_at),
+    )
+    if instance.parent_comment_id:
+        Comment.objects.filter(pk=instance.parent_comment_id).update(replies_count=F('replies_count') + 1)
+
+@receiver(post_delete, sender=Comment)
+def uncount_comment(sender, instance, origin=None, **kwargs):
+    # Deleting posts only cascades to their own comments, so there is no counter left to keep
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is Post:
+        return
+    # A reply deleted along with an ancestor: its parent is gone too, and the ancestor's own
+    # signal fixes last_activity_at / hot_score
+    cascaded = isinstance(origin, Comment) and instance is not origin
+
+    Post.objects.filter(pk=instance.post_id, comments_count__gt=0).update(comments_count=F('comments_count') - 1)
+    if cascaded:
+        return
+    if instance.parent_comment_id:
+        Comment.objects.filter(pk=instance.parent_comment_id, replies_count__gt=0).update(replies_count=F('replies_count') - 1)
+
+    # If the newest comment went (this one or a reply deleted with it), move last_activity_at back
+    # to the newest remaining one and recompute hot_score; older deleted comments stay in the score
+    # until `manage.py refresh_hot_scores` (see ranking.py)
+    remaining = Comment.objects.filter(post_id=OuterRef('pk'))
+    newest = remaining.order_by('-created_at').values('created_at')[:1]
+    stale = (Post.objects.filter(pk=instance.post_id)
+             .exclude(last_activity_at=F('created_at'))
+             .exclude(Exists(remaining.filter(created_at__gte=OuterRef('last_activity_at')))))
+    if stale.update(last_activity_at=Coalesce(Subquery(newest), F('created_at'))):
+        ranking.refresh(Post.objects.filter(pk=instance.post_id), Comment)
@@ -0,0 +1,86 @@
+# community/ranking.py
+"""
+"Hot" ranking for community posts (GET /api/community/posts/?sort=hot).
+
+A post's hotness is the sum of exponentially decaying weights of its events
+(the post itself and every comment on it):
+
+    hot(now) = sum(weight_i * exp(-(now - t_i) / DECAY_SECONDS))
+
+Every term decays by the same factor as time passes, so the *order* of posts never
+changes just because time passes. We therefore store the time-shifted logarithm
+
+    hot_score = log(sum(weight_i * exp((t_i - EPOCH) / DECAY_SECONDS)))
+
+which only changes when an event happens, in an indexed column. A new comment is a
+single ``UPDATE ... SET hot_score = logaddexp(hot_score, comment term)`` and the feed is
+an index scan on (-hot_score, -id) with keyset pagination; nothing is sorted per
+request and nothing has to be rewritten for old posts to sink.
+
+Deleted comments are not subtracted (that would need exact arithmetic on a log), except
+that deleting a post's newest comment recomputes its score (community/models.py);
+``manage.py refresh_hot_scores`` recomputes the scores of recently active posts from
+their comments and is meant to run periodically.
+"""
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.db.models import F, Value
+from django.db.models.functions import Exp, Ln
+
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+# A comment's weight halves every DECAY_SECONDS * ln 2 (~8.3 hours)
+DECAY_SECONDS = 12 * 3600
+POST_WEIGHT = 1.0
+COMMENT_WEIGHT = 1.0
+
+
+def event_score(moment, weight=1.0):
+    """log(weight * exp((moment - EPOCH) / DECAY_SECONDS)) for one event."""
+    return math.log(weight) + (moment - EPOCH).total_seconds() / DECAY_SECONDS
+
+
+def hot_score(created_at, comment_times=()):
+    """Score of a post from scratch (log-sum-exp, shifted by the largest term so it can't overflow)."""
+    terms = [event_score(created_at, POST_WEIGHT)]
+    terms.extend(event_score(moment, COMMENT_WEIGHT) for moment in comment_times)
+    top = max(terms)
+    return top + math.log(sum(math.exp(term - top) for term in terms))
+
+
+def add_comment_expression(moment):
+    """
+    SQL expression for hot_score after a comment at ``moment``: logaddexp(hot_score, term).
+    Written as term + ln(1 + exp(hot_score - term)); a new comment's term is the newest,
+    so hot_score - term stays small and exp() can't overflow.
+    """
+    term = event_score(moment, COMMENT_WEIGHT)
+    return Ln(Exp(F('hot_score') - Value(term)) + Value(1.0)) + Value(term)
+
+
+def refresh(posts, comment_model, batch_size=1000):
+    """
+    Recompute hot_score for a queryset of posts from their comments (the periodic job).
+    Returns the number of posts updated.
+    """
+    total = 0
+    batch = []
+    for post in posts.only('pk', 'created_at', 'hot_score').order_by('pk').iterator(chunk_size=batch_size):
+        batch.append(post)
+        if len(batch) >= batch_size:
+            total += _refresh_batch(batch, posts.model, comment_model)
+            batch = []
+    if batch:
+        total += _refresh_batch(batch, posts.model, comment_model)
+    return total
+
+
+def _refresh_batch(batch, post_model, comment_model):
+    times = {}
+    comments = comment_model.objects.filter(post_id__in=[post.pk for post in batch]).order_by()
+    for post_id, created_at in comments.values_list('post_id', 'created_at'):
+        times.setdefault(post_id, []).append(created_at)
+    for post in batch:
+        post.hot_score = hot_score(post.created_at, times.get(post.pk, ()))
+    post_model.objects.bulk_update(batch, ['hot_score'])
+    return len(batch)
@@ -1,10 +1,16 @@
+from urllib.parse import urlencode
+
 from rest_framework import serializers
+from rest_framework.reverse import reverse
 from .models import Post, Comment
+from . import threads
 from users.serializers import CustomUserSerializer 
 
 class CommentSerializer(serializers.ModelSerializer):
     author_detail = CustomUserSerializer(source='author', read_only=True)
     replies = serializers.SerializerMethodField() 
+    # Link to the replies that were not loaded (depth/size limits), or null
+    more_replies = serializers.SerializerMethodField()
 
     class Meta:
         model = Comment
@@ -17,19 +23,44 @@ class CommentSerializer(serializers.ModelSerializer):
             'created_at',
             'updated_at',
             'parent_comment', 
+            'depth',
+            'replies_count',
             'replies',
+            'more_replies',
         )
-        read_only_fields = ('created_at', 'updated_at', 'author_detail', 'replies')
+        read_only_fields = ('created_at', 'updated_at', 'author_detail', 'depth', 'replies_count', 'replies', 'more_replies')
+
+    def validate(self, data):
+        parent = data.get('parent_comment')
+        post = data.get('post') or getattr(self.instance, 'post', None)
+        if self.instance is not None and 'parent_comment' in data and parent != self.instance.parent_comment:
+            raise serializers.ValidationError({'parent_comment': "A comment can't be moved to another parent."})
+        if self.instance is not None and post != self.instance.post:
+            raise serializers.ValidationError({'post': "A comment can't be moved to another post."})
+        if parent is not None and self.instance is None:
+            if post is not None and parent.post_id != post.id:
+                raise serializers.ValidationError({'parent_comment': "The parent comment belongs to another post."})
+            if parent.depth >= threads.MAX_DEPTH:
+                raise serializers.ValidationError({'parent_comment': f"Replies can be nested at most {threads.MAX_DEPTH} levels deep."})
+        return data
 
     def get_replies(self, obj):
-        if obj.replies.exists():
-            return CommentSerializer(obj.replies.all(), many=True, context=self.context).data
-        return []
+        # The tree is loaded up front by threads.attach_replies(); never query per node here.
+        # Reuse this (already bound) serializer instead of building a new one for every node.
+        return [self.to_representation(reply) for reply in getattr(obj, 'loaded_replies', [])]
+
+    def get_more_replies(self, obj):
+        loaded = getattr(obj, 'loaded_replies', [])
+        if obj.replies_count <= len(loaded):
+            return None
+        url = reverse('community:comment-replies', args=[obj.pk], request=self.context.get('request'))
+        if loaded:
+            url += '?' + urlencode({'after': loaded[-1].pk})
+        return url
 
 class PostSerializer(serializers.ModelSerializer):
     author_detail = CustomUserSerializer(source='author', read_only=True)
     # comments = CommentSerializer(many=True, read_only=True) 
-    comments_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
@@ -43,8 +74,6 @@ class PostSerializer(serializers.ModelSerializer):
             'updated_at',
             # 'comments',
             'comments_count',
+            'last_activity_at',
         )
-        read_only_fields = ('created_at', 'updated_at', 'author_detail', 'comments_count')
-
-    def get_comments_count(self, obj):
-        return obj.comments.count()
\ No newline at end of file
+        read_only_fields = ('created_at', 'updated_at', 'author_detail', 'comments_count', 'last_activity_at')
\ No newline at end of file
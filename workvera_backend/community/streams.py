@@ -0,0 +1,22 @@
+# community/streams.py
+from django.views.decorators.http import require_GET
+
+from workvera_backend.streams import error_response, stream_response
+from .models import Post
+
+
+def post_topic(post_id):
+    return f'community.post.{post_id}'
+
+
+@require_GET
+async def post_comment_stream(request, pk):
+    """
+    Live comments for a post, replacing polling on the post detail page.
+    GET /api/community/posts/<id>/stream/  (text/event-stream)
+    Sends a "comment" event, shaped like CommentSerializer, for every comment or
+    reply created on the post. Public, like the comments list.
+    """
+    if not await Post.objects.filter(pk=pk).aexists():
+        return error_response('Not found.', 404)
+    return stream_response(post_topic(pk))
@@ -1,3 +1,252 @@
+import asyncio
+import json
+from io import StringIO
+from itertools import count
+
+from asgiref.sync import sync_to_async
+from django.core.management import call_command
 from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from users.models import CustomUser
+from workvera_backend.testing import QueryBudgetMixin
+from . import ranking
+from .models import Post, Comment
+
+
+class CommunityQueryBudgetTests(QueryBudgetMixin, APITestCase):
+
+    def setUp(self):
+        self.sequence = count()
+
+    def create_posts(self, n):
+        for _ in range(n):
+            i = next(self.sequence)
+            author = CustomUser.objects.create_user(email=f'author{i}@example.com', name=f'Author {i}')
+            post = Post.objects.create(author=author, title=f'Post {i}', content='Hello')
+            Comment.objects.create(post=post, author=author, content='First!')
+
+    def test_post_list(self):
+        self.assertConstantQueries('/api/community/posts/', self.create_posts, max_queries=1)
+
+
+class CommentTreeTests(QueryBudgetMixin, APITestCase):
+
+    def setUp(self):
+        self.author = CustomUser.objects.create_user(email='author@example.com', name='Author')
+        self.post = Post.objects.create(author=self.author, title='Gap years', content='How did you explain yours?')
+        self.url = f'/api/community/posts/{self.post.pk}/comments/'
+
+    def comment(self, parent=None, post=None):
+        return Comment.objects.create(post=post or self.post, author=self.author, content='Reply', parent_comment=parent)
+
+    def thread(self, levels, parent=None):
+        comments = []
+        for _ in range(levels):
+            parent = self.comment(parent)
+            comments.append(parent)
+        return comments
+
+    def test_paths_and_counts(self):
+        root, reply, nested = self.thread(3)
+        root.refresh_from_db()
+        nested.refresh_from_db()
+        self.assertEqual(nested.path, root.path + reply.path[-8:] + nested.path[-8:])
+        self.assertEqual((root.depth, nested.depth), (0, 2))
+        self.assertEqual(root.replies_count, 1)
+        reply.delete()
+        root.refresh_from_db()
+        self.assertEqual(root.replies_count, 0)
+
+    def test_comment_threads_load_in_constant_queries(self):
+        def grow(n):
+            for _ in range(n):
+                self.thread(4)
+        # post, top-level page, every reply below it
+        self.assertConstantQueries(self.url, grow, max_queries=3)
+
+    def test_depth_limit(self):
+        root = self.thread(5)[0]
+        response = self.client.get(self.url, {'depth': 2})
+        node = response.data['results'][0]
+        self.assertEqual(node['id'], root.pk)
+        node = node['replies'][0]['replies'][0]
+        self.assertEqual((node['depth'], node['replies'], node['replies_count']), (2, [], 1))
+        self.assertTrue(node['more_replies'].endswith(f"/api/community/comments/{node['id']}/replies/"))
+
+    def test_more_replies_continue_after_the_loaded_ones(self):
+        root = self.comment()
+        replies = [self.comment(root) for _ in range(3)]
+        response = self.client.get(self.url, {'max_replies': 2})
+        node = response.data['results'][0]
+        self.assertEqual([reply['id'] for reply in node['replies']], [reply.pk for reply in replies[:2]])
+        self.assertIn(f'after={replies[1].pk}', node['more_replies'])
+
+        response = self.client.get(node['more_replies'])
+        self.assertEqual([reply['id'] for reply in response.data['results']], [replies[2].pk])
+
+    def test_reply_must_belong_to_the_same_post(self):
+        other_post = Post.objects.create(author=self.author, title='Other', content='...')
+        parent = self.comment(post=other_post)
+        self.client.force_authenticate(self.author)
+        response = self.client.post(f'/api/community/posts/{self.post.pk}/comment/',
+                                    {'content': 'Hi', 'parent_comment': parent.pk}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class PostCounterTests(APITestCase):
+
+    def setUp(self):
+        self.author = CustomUser.objects.create_user(email='author@example.com', name='Author')
+        self.post = Post.objects.create(author=self.author, title='Gap years', content='...')
+
+    def comment(self, parent=None):
+        return Comment.objects.create(post=self.post, author=self.author, content='Reply', parent_comment=parent)
+
+    def test_counters_follow_creates_and_cascading_deletes(self):
+        root = self.comment()
+        reply = self.comment(root)
+        latest = self.comment(reply)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 3)
+        self.assertEqual(self.post.last_activity_at, latest.created_at)
+
+        root.delete() # takes both replies with it
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 0)
+
+    def test_deleting_the_newest_comment_rewinds_activity(self):
+        older = self.comment()
+        newest = self.comment()
+        newest.delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.last_activity_at, older.created_at)
+        self.assertAlmostEqual(self.post.hot_score, ranking.hot_score(self.post.created_at, [older.created_at]), places=6)
+
+        # Deleting an older comment doesn't touch the activity
+        newer = self.comment()
+        older.delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.last_activity_at, newer.created_at)
+
+        newer.delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.last_activity_at, self.post.created_at)
+        self.assertAlmostEqual(self.post.hot_score, ranking.hot_score(self.post.created_at), places=6)
+
+    def test_deleting_a_thread_whose_reply_is_newest(self):
+        kept = self.comment()
+        root = self.comment()
+        reply = self.comment(root)
+        self.comment(reply)
+        root.delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 1)
+        self.assertEqual(self.post.last_activity_at, kept.created_at)
+
+    def test_deleting_the_post_skips_the_counters(self):
+        root = self.comment()
+        self.comment(root)
+        self.comment()
+        with self.assertNumQueries(4): # collect the comments and their replies, delete them, delete the post
+            self.post.delete()
+
+    def test_repair_command(self):
+        comment = self.comment()
+        Post.objects.filter(pk=self.post.pk).update(comments_count=42, last_activity_at=self.post.created_at)
+        call_command('repair_post_counters', stdout=StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 1)
+        self.assertEqual(self.post.last_activity_at, comment.created_at)
+
+
+class HotFeedTests(QueryBudgetMixin, APITestCase):
+
+    def setUp(self):
+        self.sequence = count()
+        self.author = CustomUser.objects.create_user(email='author@example.com', name='Author')
+
+    def create_posts(self, n):
+        for _ in range(n):
+            Post.objects.create(author=self.author, title=f'Post {next(self.sequence)}', content='...')
+
+    def test_commented_post_rises_above_newer_posts(self):
+        older = Post.objects.create(author=self.author, title='Older', content='...')
+        self.create_posts(3)
+        for _ in range(3):
+            Comment.objects.create(post=older, author=self.author, content='+1')
+        response = self.client.get('/api/community/posts/', {'sort': 'hot'})
+        self.assertEqual(response.data['results'][0]['id'], older.pk)
+        response = self.client.get('/api/community/posts/')
+        self.assertNotEqual(response.data['results'][0]['id'], older.pk)
+
+    def test_hot_order_with_page_numbers(self):
+        older = Post.objects.create(author=self.author, title='Older', content='...')
+        self.create_posts(3)
+        Comment.objects.create(post=older, author=self.author, content='+1')
+        response = self.client.get('/api/community/posts/', {'sort': 'hot', 'page': 1})
+        self.assertIn('count', response.data)
+        self.assertEqual(response.data['results'][0]['id'], older.pk)
+
+    def test_incremental_score_matches_refresh(self):
+        post = Post.objects.create(author=self.author, title='Post', content='...')
+        for _ in range(5):
+            Comment.objects.create(post=post, author=self.author, content='+1')
+        post.refresh_from_db()
+        incremental = post.hot_score
+        call_command('refresh_hot_scores', stdout=StringIO())
+        post.refresh_from_db()
+        self.assertAlmostEqual(post.hot_score, incremental, places=6)
+
+    def test_hot_feed_is_keyset_paginated(self):
+        self.create_posts(5)
+        response = self.client.get('/api/community/posts/', {'sort': 'hot', 'page_size': 2})
+        self.assertIn('cursor=', response.data['next'])
+        self.assertConstantQueries('/api/community/posts/', self.create_posts, params={'sort': 'hot'}, max_queries=1)
+
+    def test_unknown_sort(self):
+        self.assertEqual(self.client.get('/api/community/posts/', {'sort': 'top'}).status_code, 400)
+
+
+class CommentStreamTests(TestCase):
+    """Runs the SSE view through Django's ASGI test client."""
+
+    def setUp(self):
+        self.author = CustomUser.objects.create_user(email='author@example.com', name='Author')
+        self.post = Post.objects.create(author=self.author, title='Gap years', content='...')
+
+    def create_comment(self, post, parent=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Comment.objects.create(post=post, author=self.author, content='Live!', parent_comment=parent)
+
+    async def test_new_comments_are_pushed(self):
+        response = await self.async_client.get(f'/api/community/posts/{self.post.pk}/stream/')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertTrue((await anext(stream)).startswith(b'retry:'))
+
+        other_post = await Post.objects.acreate(author=self.author, title='Other', content='...')
+        await sync_to_async(self.create_comment)(other_post)  # not for this stream
+        comment = await sync_to_async(self.create_comment)(self.post)
+
+        event = await asyncio.wait_for(anext(stream), timeout=5)
+        self.assertTrue(event.startswith(b'event: comment\n'))
+        data = json.loads(event.decode().split('data: ', 1)[1])
+        self.assertEqual((data['id'], data['post'], data['content']), (comment.pk, self.post.pk, 'Live!'))
+        await stream.aclose()
+
+    async def test_replies_are_pushed_with_their_depth(self):
+        response = await self.async_client.get(f'/api/community/posts/{self.post.pk}/stream/')
+        stream = aiter(response.streaming_content)
+        await anext(stream)
+        comment = await sync_to_async(self.create_comment)(self.post)
+        reply = await sync_to_async(self.create_comment)(self.post, comment)
+
+        events = [await asyncio.wait_for(anext(stream), timeout=5) for _ in range(2)]
+        data = json.loads(events[1].decode().split('data: ', 1)[1])
+        self.assertEqual((data['id'], data['parent_comment'], data['depth']), (reply.pk, comment.pk, 1))
+        await stream.aclose()
 
-# Create your tests here.
+    async def test_unknown_post(self):
+        response = await self.async_client.get('/api/community/posts/999999/stream/')
+        self.assertEqual(response.status_code, 404)
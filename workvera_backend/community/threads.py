@@ -0,0 +1,87 @@
+# community/threads.py
+"""
+Threaded comments stored as materialized paths.
+
+Every comment's ``path`` is the fixed-width base36 id of each ancestor followed by
+its own id, e.g. top-level comment 7 -> "00000007", its reply 12 -> "000000070000000c".
+Because the segments are fixed width, string order is tree order (a parent sorts
+before its replies, siblings by id) and a whole subtree is one index range:
+
+    path > root.path AND path < root.path + '~'
+
+``attach_replies`` uses that to load the replies of a page of comments with a
+single query, breadth first, and builds the tree in memory.
+"""
+from django.db.models import Q
+
+SEGMENT_WIDTH = 8  # base36 digits per id, enough for 36**8 (~2.8e12) comments
+MAX_DEPTH = 30  # deepest reply that can be stored; top-level comments have depth 0
+PATH_MAX_LENGTH = SEGMENT_WIDTH * (MAX_DEPTH + 1)
+PATH_END = '~'  # sorts after every base36 digit
+
+# Limits for ?depth= (levels of replies under each listed comment)
+# and ?max_replies= (replies loaded in total for one page)
+DEFAULT_LOAD_DEPTH = 3
+MAX_LOAD_DEPTH = 10
+DEFAULT_MAX_REPLIES = 200
+MAX_REPLIES = 1000
+
+_DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+def encode_segment(pk):
+    digits = ''
+    while pk:
+        pk, remainder = divmod(pk, 36)
+        digits = _DIGITS[remainder] + digits
+    return digits.rjust(SEGMENT_WIDTH, '0')
+
+
+def build_path(parent_path, pk):
+    return parent_path + encode_segment(pk)
+
+
+def subtree_q(comment, max_depth=None):
+    """Q matching the descendants of ``comment`` (not the comment itself)."""
+    condition = Q(path__gt=comment.path, path__lt=comment.path + PATH_END)
+    if max_depth is not None:
+        condition &= Q(depth__lte=max_depth)
+    return condition
+
+
+def attach_replies(comments, queryset, depth=DEFAULT_LOAD_DEPTH, max_replies=DEFAULT_MAX_REPLIES):
+    """
+    Load the replies of ``comments`` with one query on ``queryset`` and attach them as
+    ``loaded_replies`` lists on every node.
+
+    At most ``depth`` levels below each comment and ``max_replies`` replies in total are
+    loaded. Replies are fetched breadth first, so when the limit cuts in, every comment
+    still gets its first replies before anyone's deeper ones, and the replies loaded for
+    a node are always a prefix of its replies in path order. Nodes whose
+    ``replies_count`` is larger than what was loaded can be continued with
+    GET /api/community/comments/<id>/replies/?after=<last loaded reply id>.
+    """
+    comments = list(comments)
+    for comment in comments:
+        comment.loaded_replies = []
+    if not comments or depth <= 0 or max_replies <= 0:
+        return comments
+
+    condition = Q()
+    for comment in comments:
+        if comment.replies_count:
+            condition |= subtree_q(comment, comment.depth + depth)
+    if not condition:
+        return comments
+
+    nodes = {comment.pk: comment for comment in comments}
+    for reply in queryset.filter(condition).order_by('depth', 'path')[:max_replies]:
+        parent = nodes.get(reply.parent_comment_id)
+        if parent is None:
+            continue
+        # A reply that is also one of ``comments`` keeps its listed instance
+        node = nodes.setdefault(reply.pk, reply)
+        if node is reply:
+            reply.loaded_replies = []
+        parent.loaded_replies.append(node)
+    return comments
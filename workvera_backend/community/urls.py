@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import PostViewSet, CommentViewSet
+from .streams import post_comment_stream
 
 router = DefaultRouter()
 router.register(r'posts', PostViewSet, basename='post')
@@ -9,6 +10,8 @@ router.register(r'comments', CommentViewSet, basename='comment')
 app_name = 'community'
 
 urlpatterns = [
+    # Server-Sent Events (async view, needs ASGI); before the router so it isn't read as a detail route
+    path('posts/<int:pk>/stream/', post_comment_stream, name='post-stream'),
     path('', include(router.urls)),
     # Actions are part of ViewSets:
     # /api/community/posts/<id>/comments/ (GET)
@@ -1,42 +1,90 @@
-from rest_framework import viewsets, permissions, status
+from rest_framework import serializers, viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import Post, Comment
+from . import threads
 from .serializers import PostSerializer, CommentSerializer
 from .permissions import IsOwnerOrReadOnlyCommunity
 
+
+def tree_limits(request):
+    """(depth, max_replies) from ?depth= and ?max_replies=, clamped to the limits in threads.py."""
+    limits = []
+    for name, default, maximum in (('depth', threads.DEFAULT_LOAD_DEPTH, threads.MAX_LOAD_DEPTH),
+                                   ('max_replies', threads.DEFAULT_MAX_REPLIES, threads.MAX_REPLIES)):
+        try:
+            value = int(request.query_params.get(name, default))
+        except ValueError:
+            raise serializers.ValidationError({name: 'Must be an integer.'})
+        limits.append(max(0, min(value, maximum)))
+    return limits
+
+
+def with_replies(comments, request):
+    depth, max_replies = tree_limits(request)
+    return threads.attach_replies(comments, Comment.objects.select_related('author'), depth, max_replies)
+
+
 class PostViewSet(viewsets.ModelViewSet):
     """
     API endpoint for Community Posts.
-    - List posts (GET /api/community/posts/)
+    - List posts (GET /api/community/posts/) - Newest first
+    - Hot posts (GET /api/community/posts/?sort=hot) - Ranked by recent comment activity (community/ranking.py)
     - Create post (POST /api/community/posts/) - Authenticated users
     - Retrieve post (GET /api/community/posts/<id>/)
     - Update post (PUT /api/community/posts/<id>/) - Owner only
     - Delete post (DELETE /api/community/posts/<id>/) - Owner only
-    - List comments for a post (GET /api/community/posts/<id>/comments/)
+    - List comments for a post (GET /api/community/posts/<id>/comments/?depth=3&max_replies=200)
+      Top-level comments are cursor-paginated; their reply trees are loaded with one query.
     - Create comment on a post (POST /api/community/posts/<id>/comments/)
     """
-    queryset = Post.objects.all()
+    # comments_count is a stored counter (see the Comment signals), so listing needs no COUNT
+    queryset = Post.objects.select_related('author')
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnlyCommunity]
 
+    def get_cursor_ordering(self):
+        # Keyset for workvera_backend.pagination.KeysetPagination
+        if self.action == 'list_comments':
+            return ('created_at', 'id')
+        if self.action == 'list' and self.get_sort() == 'hot':
+            return ('-hot_score', '-id')  # precomputed and indexed, so the feed is an index scan
+        return ('-created_at', '-id')
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list' and self.get_sort() == 'hot':
+            # Also for page-number pagination, which keeps the queryset's own order
+            queryset = queryset.order_by('-hot_score', '-id')
+        return queryset
+
+    def get_sort(self):
+        sort = self.request.query_params.get('sort', 'new')
+        if sort not in ('new', 'hot'):
+            raise serializers.ValidationError({'sort': "Must be 'new' or 'hot'."})
+        return sort
+
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
     @action(detail=True, methods=['get'], url_path='comments', permission_classes=[permissions.IsAuthenticatedOrReadOnly])
     def list_comments(self, request, pk=None):
         """
-        List all top-level comments for a specific post.
+        List the top-level comments for a specific post, each with its replies nested.
         GET /api/community/posts/<id>/comments/
+        - ?depth= levels of replies under each comment (default 3, max 10)
+        - ?max_replies= replies loaded in total for the page (default 200, max 1000)
+        Comments with replies beyond those limits carry a "more_replies" link.
+        Three queries however large the threads are: the post, the page, the replies.
         """
         post = self.get_object()
-        comments = Comment.objects.filter(post=post, parent_comment__isnull=True).order_by('created_at')
+        comments = Comment.objects.select_related('author').filter(post=post, parent_comment__isnull=True).order_by('created_at')
         page = self.paginate_queryset(comments) 
         if page is not None:
-            serializer = CommentSerializer(page, many=True, context={'request': request})
+            serializer = CommentSerializer(with_replies(page, request), many=True, context={'request': request})
             return self.get_paginated_response(serializer.data)
 
-        serializer = CommentSerializer(comments, many=True, context={'request': request})
+        serializer = CommentSerializer(with_replies(comments, request), many=True, context={'request': request})
         return Response(serializer.data)
 
     @action(detail=True, methods=['post'], url_path='comment', permission_classes=[permissions.IsAuthenticated])
@@ -62,16 +110,53 @@ class CommentViewSet(viewsets.ModelViewSet):
     - List comments (GET /api/community/comments/) - Generally not primary way to access, use post's comments.
     - Create comment (POST /api/community/comments/) - Authenticated users (better via post endpoint)
     - Retrieve comment (GET /api/community/comments/<id>/)
+    - Load more replies (GET /api/community/comments/<id>/replies/?after=<reply id>&depth=3) - Direct
+      replies (cursor-paginated) with their own replies nested; the "more_replies" links point here.
     - Update comment (PUT /api/community/comments/<id>/) - Owner only
     - Delete comment (DELETE /api/community/comments/<id>/) - Owner only
     """
-    queryset = Comment.objects.all()
+    queryset = Comment.objects.select_related('author')
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnlyCommunity]
 
+    def get_cursor_ordering(self):
+        if self.action == 'replies':
+            return ('path',) # Direct replies in tree order, the order they're nested in everywhere else
+        return ('created_at', 'id')
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(with_replies(page, request), many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(with_replies(queryset, request), many=True)
+        return Response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        comment = with_replies([self.get_object()], request)[0]
+        return Response(self.get_serializer(comment).data)
+
+    @action(detail=True, methods=['get'], url_path='replies', permission_classes=[permissions.IsAuthenticatedOrReadOnly])
+    def replies(self, request, pk=None):
+        """
+        Direct replies of a comment, each with its own replies nested.
+        GET /api/community/comments/<id>/replies/?after=<reply id>
+        ?after= skips the replies up to and including that one (what the "more_replies"
+        links use); ?depth= and ?max_replies= work as on the post's comments list.
+        """
+        comment = self.get_object()
+        children = Comment.objects.select_related('author').filter(threads.subtree_q(comment, comment.depth + 1))
+        after = request.query_params.get('after')
+        if after:
+            if not after.isdigit():
+                raise serializers.ValidationError({'after': 'Must be a comment id.'})
+            children = children.filter(path__gt=threads.build_path(comment.path, int(after)))
+        page = self.paginate_queryset(children.order_by('path'))
+        serializer = self.get_serializer(with_replies(page, request), many=True)
+        return self.get_paginated_response(serializer.data)
+
     def perform_create(self, serializer):
         if 'post' not in serializer.validated_data:
-             raise serializers.ValidationError({"post": "Post ID is required to create a comment."})
+            raise serializers.ValidationError({"post": "Post ID is required to create a comment."})
         serializer.save(author=self.request.user)
-
-    
\ No newline at end of file
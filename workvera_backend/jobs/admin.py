@@ -1,19 +1,29 @@
 from django.contrib import admin
-from .models import JobPost, Application
+from .models import JobPost, Application, JobApplicationStats
+from admin_analytics import dashboard
+from . import list_cache, recommendations
 
 class JobPostAdmin(admin.ModelAdmin):
     list_display = ('title', 'employer', 'location', 'job_type', 'gap_friendly', 'posted_at', 'is_active')
     list_filter = ('gap_friendly', 'job_type', 'location', 'employer__role', 'is_active')
     search_fields = ('title', 'description', 'employer__email', 'skill_tags')
     raw_id_fields = ('employer',)
+    list_select_related = ('employer',)
     actions = ['mark_active', 'mark_inactive']
 
     def mark_active(self, request, queryset):
         queryset.update(is_active=True)
+        # update() skips the signals that keep the matrix and the listing cache current
+        recommendations.invalidate()
+        list_cache.invalidate()
+        dashboard.invalidate() # active_job_posts
     mark_active.short_description = "Mark selected job posts as active"
 
     def mark_inactive(self, request, queryset):
         queryset.update(is_active=False)
+        recommendations.invalidate()
+        list_cache.invalidate()
+        dashboard.invalidate()
     mark_inactive.short_description = "Mark selected job posts as inactive"
 
 
@@ -22,7 +32,22 @@ class ApplicationAdmin(admin.ModelAdmin):
     list_filter = ('status', 'job__title')
     search_fields = ('user__email', 'job__title')
     raw_id_fields = ('user', 'job')
+    list_select_related = ('user', 'job__employer') # Application/JobPost __str__ read both
+
+
+class JobApplicationStatsAdmin(admin.ModelAdmin):
+    # Read-only: the counters are maintained by signals (see jobs/funnel.py)
+    list_display = ('job', 'submitted', 'reviewed', 'shortlisted', 'interviewing', 'offered', 'rejected', 'withdrawn')
+    search_fields = ('job__title',)
+    list_select_related = ('job',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
 
 admin.site.register(JobPost, JobPostAdmin)
 admin.site.register(Application, ApplicationAdmin)
+admin.site.register(JobApplicationStats, JobApplicationStatsAdmin)
 
@@ -0,0 +1,34 @@
+from django_filters import rest_framework as filters
+
+from .models import JobPost
+from .skill_tags import filter_by_skills
+
+
+class JobPostFilter(filters.FilterSet):
+    """
+    Filters for GET /api/jobs/posts/.
+    ?skills=python,django&match=all|any matches against the normalized skill links
+    (match defaults to 'any').
+    """
+    skills = filters.CharFilter(method='filter_skills')
+    match = filters.ChoiceFilter(choices=(('any', 'Any'), ('all', 'All')), method='filter_match')
+
+    class Meta:
+        model = JobPost
+        fields = {
+            'title': ['icontains'],
+            'description': ['icontains'],
+            'skill_tags': ['icontains'],
+            'location': ['icontains'],
+            'job_type': ['exact', 'icontains'],
+            'gap_friendly': ['exact'],
+            'employer__name': ['icontains'], # Allows filtering by employer's name
+        }
+
+    def filter_skills(self, queryset, name, value):
+        names = [skill for skill in value.split(',') if skill.strip()]
+        return filter_by_skills(queryset, names, match=self.form.cleaned_data.get('match') or 'any')
+
+    def filter_match(self, queryset, name, value):
+        # Only modifies how ?skills= is applied (see filter_skills)
+        return queryset
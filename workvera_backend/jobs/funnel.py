@@ -0,0 +1,92 @@
+# jobs/funnel.py
+"""
+Per-job application funnel counters (JobApplicationStats).
+
+Instead of COUNT(*) ... GROUP BY status over jobs_application on every dashboard
+load, each job has one row of per-status counts that is adjusted with
+``UPDATE ... SET <status> = <status> + n`` whenever applications are created,
+deleted or change status.
+"""
+from django.db import transaction
+from django.db.models import Count, F
+
+
+def statuses():
+    from .models import Application
+    return [choice[0] for choice in Application.STATUS_CHOICES]
+
+
+def apply_deltas(job_id, deltas, create=True):
+    """
+    Add ``deltas`` ({status: +n/-n}) to the counters of one job.
+    With ``create=True`` a missing row is built from the real counts instead.
+    """
+    from .models import JobApplicationStats
+
+    changes = {status: F(status) + delta for status, delta in deltas.items() if delta}
+    if not changes:
+        return
+    updated = JobApplicationStats.objects.filter(job_id=job_id).update(**changes)
+    if not updated and create:
+        # No row yet (first application for this job): start it from the real counts,
+        # which already include the change being recorded.
+        rebuild(job_ids=[job_id])
+
+
+def apply_status_change(old_statuses, new_status):
+    """
+    Update counters after a bulk status change.
+    ``old_statuses`` is an iterable of (job_id, previous_status) for every changed application.
+    """
+    per_job = {}
+    for job_id, old_status in old_statuses:
+        deltas = per_job.setdefault(job_id, {})
+        deltas[old_status] = deltas.get(old_status, 0) - 1
+        deltas[new_status] = deltas.get(new_status, 0) + 1
+    for job_id, deltas in per_job.items():
+        apply_deltas(job_id, deltas)
+
+
+def counts_for(job_post):
+    """{status: count, ..., 'total': n} for a job, read from its stats row (zeros if none yet)."""
+    from .models import JobApplicationStats
+
+    try:
+        stats = job_post.application_stats
+    except JobApplicationStats.DoesNotExist:
+        stats = None
+    counts = {status: getattr(stats, status, 0) for status in statuses()}
+    counts['total'] = sum(counts.values())
+    return counts
+
+
+def rebuild(job_ids=None, batch_size=1000):
+    """
+    Recompute the counters from jobs_application with one GROUP BY query.
+    ``job_ids=None`` rebuilds every job. Returns the number of stats rows written.
+    """
+    from .models import Application, JobApplicationStats, JobPost
+
+    jobs = JobPost.objects.all()
+    applications = Application.objects.all()
+    if job_ids is not None:
+        jobs = jobs.filter(pk__in=job_ids)
+        applications = applications.filter(job_id__in=job_ids)
+
+    status_names = statuses()
+    rows = {job_id: JobApplicationStats(job_id=job_id) for job_id in jobs.values_list('pk', flat=True)}
+    grouped = applications.order_by().values('job_id', 'status').annotate(n=Count('id'))
+    for row in grouped:
+        stats = rows.get(row['job_id'])
+        if stats is not None and row['status'] in status_names:
+            setattr(stats, row['status'], row['n'])
+
+    with transaction.atomic():
+        JobApplicationStats.objects.bulk_create(
+            rows.values(),
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['job'],
+            update_fields=status_names,
+        )
+    return len(rows)
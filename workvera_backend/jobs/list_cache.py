@@ -0,0 +1,120 @@
+# jobs/list_cache.py
+"""
+Response cache for the public job listing (GET /api/jobs/posts/).
+
+Anonymous list responses are stored in Django's cache under a key built from
+the normalized query string and a global "jobs version" counter:
+
+    jobs:list:v<version>:<sha1 of host + sorted query params>
+
+Any JobPost write bumps the version (signals in jobs/models.py, the bulk
+actions in jobs/admin.py), and so does a change to a user, whose details are
+shown as the posts' employer_detail. Every previously cached listing becomes
+unreachable at once and simply expires; nothing has to be deleted.
+
+A lookup only reads the cache (the version, then the listing); writes happen on
+misses and invalidation. Hits and misses are therefore counted in process memory,
+per worker like the token cache counters; see GET /api/admin_analytics/admin/cache-stats/.
+
+Works with any Django cache backend. Local-memory is per process, so with
+several worker processes use a shared one (file-based, memcached, redis).
+"""
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = 'jobs:version'
+
+_counts = {'hits': 0, 'misses': 0}
+_counts_lock = threading.Lock()
+
+
+def _timeout():
+    return getattr(settings, 'JOBS_LIST_CACHE_TIMEOUT', 600)
+
+
+def get_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def bump_version():
+    """Invalidate every cached job listing."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, 0, None)  # missing: first use or evicted
+        cache.incr(VERSION_KEY)
+
+
+def invalidate():
+    """
+    Called on every JobPost write. Bumps now (so this process never serves a stale
+    listing) and again after the transaction commits, so a listing cached by another
+    request while the write was still uncommitted doesn't survive it.
+    """
+    bump_version()
+    transaction.on_commit(bump_version)
+
+
+def normalized_params(query_params):
+    """Sorted (name, values) pairs with empty values dropped and whitespace in ?q= collapsed."""
+    params = []
+    for name, values in query_params.lists():
+        if name == 'q':
+            values = [' '.join(value.split()) for value in values]
+        values = sorted(value for value in values if value.strip())
+        if values:
+            params.append((name, values))
+    return sorted(params)
+
+
+def cache_key(request):
+    """
+    Key for a cacheable listing request, or None if the response must not be cached.
+    Only anonymous JSON requests are cached: authenticated users can see per-user
+    fields (e.g. application_counts for their own posts).
+    """
+    if request.method != 'GET' or request.user.is_authenticated:
+        return None
+    renderer = getattr(request, 'accepted_renderer', None)
+    if renderer is not None and renderer.format != 'json':
+        return None
+    # The host is part of the key because pagination links are absolute URLs
+    raw = repr((request.get_host(), normalized_params(request.query_params)))
+    digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+    return f'jobs:list:v{get_version()}:{digest}'
+
+
+def lookup(key):
+    data = cache.get(key)
+    with _counts_lock:
+        _counts['hits' if data is not None else 'misses'] += 1
+    return data
+
+
+def store(key, data):
+    cache.set(key, data, _timeout())
+
+
+def stats():
+    with _counts_lock:
+        hits, misses = _counts['hits'], _counts['misses']
+    lookups = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / lookups, 4) if lookups else None,
+        'version': get_version(),
+    }
+
+
+def reset_stats():
+    with _counts_lock:
+        _counts['hits'] = _counts['misses'] = 0
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from jobs import funnel
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-job application funnel counters (JobApplicationStats) from the applications table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job', type=int, action='append', dest='job_ids',
+                            help="Only rebuild this job id (can be repeated).")
+
+    def handle(self, *args, **options):
+        total = funnel.rebuild(job_ids=options['job_ids'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt application counters for {total} job posts."))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from jobs import search
+from jobs.models import JobPost
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for job posts (e.g. after bulk loads that skip signals)."
+
+    def handle(self, *args, **options):
+        if not search.fts_enabled():
+            self.stdout.write("Full-text index is only used on SQLite; nothing to do.")
+            return
+        total = search.rebuild_index(JobPost.objects.order_by('pk').iterator())
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} job posts."))
@@ -0,0 +1,30 @@
+# Creates the SQLite FTS5 index used by jobs/search.py and fills it from existing posts.
+
+from django.db import migrations
+
+from jobs import search
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(search.CREATE_FTS_TABLE_SQL)
+    JobPost = apps.get_model('jobs', 'JobPost')
+    search.rebuild_index(JobPost.objects.order_by('pk').iterator())
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(search.DROP_FTS_TABLE_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.1 on 2026-10-17 01:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_jobpost_search_index'),
+        ('skills', '0003_skill_normalized_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobPostSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='jobs.jobpost')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_links', to='skills.skill')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='jobpost',
+            name='skills',
+            field=models.ManyToManyField(blank=True, related_name='job_posts', through='jobs.JobPostSkill', to='skills.skill'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpostskill',
+            index=models.Index(fields=['skill', 'job'], name='jobs_jobskill_skill_job_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='jobpostskill',
+            unique_together={('job', 'skill')},
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Parses the existing comma-separated JobPost.skill_tags strings into JobPostSkill rows.
+
+from django.db import migrations
+
+
+def normalize_skill_name(name):
+    # Frozen copy of skills.models.normalize_skill_name, so later edits can't change this migration
+    return ' '.join((name or '').split()).casefold()[:100]
+
+
+def parse_skill_tags(value):
+    # Frozen copy of jobs.skill_tags.parse_skill_tags
+    tags = {}
+    for raw in (value or '').split(','):
+        name = ' '.join(raw.split())[:100]
+        key = normalize_skill_name(name)
+        if key and key not in tags:
+            tags[key] = name
+    return tags
+
+
+def parse_existing_skill_tags(apps, schema_editor):
+    JobPost = apps.get_model('jobs', 'JobPost')
+    JobPostSkill = apps.get_model('jobs', 'JobPostSkill')
+    Skill = apps.get_model('skills', 'Skill')
+
+    # normalized_name isn't unique yet at this point (skills 0007), so keep the first skill per name
+    skill_ids = {}
+    for pk, key in Skill.objects.order_by('pk').values_list('pk', 'normalized_name'):
+        skill_ids.setdefault(key, pk)
+
+    for job_post in JobPost.objects.exclude(skill_tags='').only('pk', 'skill_tags').iterator():
+        tags = parse_skill_tags(job_post.skill_tags)
+        for key, name in tags.items():
+            if key not in skill_ids:
+                skill_ids[key] = Skill.objects.create(name=name, normalized_name=key).pk
+        current = set(JobPostSkill.objects.filter(job_id=job_post.pk).values_list('skill_id', flat=True))
+        JobPostSkill.objects.bulk_create(
+            [JobPostSkill(job_id=job_post.pk, skill_id=skill_ids[key]) for key in tags if skill_ids[key] not in current],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_jobpostskill'),
+        ('skills', '0003_skill_normalized_name'),
+    ]
+
+    operations = [
+        migrations.RunPython(parse_existing_skill_tags, migrations.RunPython.noop),
+    ]
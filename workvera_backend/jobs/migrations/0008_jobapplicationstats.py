@@ -0,0 +1,45 @@
+# Generated by Django 5.2.1 on 2026-10-17 01:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_application_stats(apps, schema_editor):
+    Application = apps.get_model('jobs', 'Application')
+    JobApplicationStats = apps.get_model('jobs', 'JobApplicationStats')
+    JobPost = apps.get_model('jobs', 'JobPost')
+    # Every job gets a row, so applying to a job never has to create one
+    rows = {job_id: JobApplicationStats(job_id=job_id) for job_id in JobPost.objects.values_list('pk', flat=True)}
+    grouped = Application.objects.order_by().values('job_id', 'status').annotate(n=Count('id'))
+    for row in grouped:
+        if row['job_id'] in rows:
+            setattr(rows[row['job_id']], row['status'], row['n'])
+    JobApplicationStats.objects.bulk_create(rows.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_application_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobApplicationStats',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='application_stats', serialize=False, to='jobs.jobpost')),
+                ('submitted', models.IntegerField(default=0)),
+                ('reviewed', models.IntegerField(default=0)),
+                ('shortlisted', models.IntegerField(default=0)),
+                ('interviewing', models.IntegerField(default=0)),
+                ('offered', models.IntegerField(default=0)),
+                ('rejected', models.IntegerField(default=0)),
+                ('withdrawn', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'job application stats',
+            },
+        ),
+        migrations.RunPython(fill_application_stats, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings 
+from skills.models import Skill
 
 class JobPost(models.Model):
     title = models.CharField(max_length=255)
@@ -10,8 +11,9 @@ class JobPost(models.Model):
         related_name='job_posts',
         limit_choices_to={'role': 'employer'} 
     )
-    # skill_tags = models.ManyToManyField(Skill, blank=True) 
     skill_tags = models.CharField(max_length=500, blank=True, help_text="Comma-separated list of skills (e.g., Python,Django,React)")
+    # Normalized form of skill_tags, kept in sync on save (see jobs/skill_tags.py)
+    skills = models.ManyToManyField(Skill, through='JobPostSkill', blank=True, related_name='job_posts')
     gap_friendly = models.BooleanField(default=False, help_text="Is this job welcoming to candidates with career gaps?")
     location = models.CharField(max_length=150, blank=True, null=True)
     job_type = models.CharField(max_length=50, blank=True, null=True, help_text="e.g., Full-time, Part-time, Contract")
@@ -24,6 +26,29 @@ class JobPost(models.Model):
 
     class Meta:
         ordering = ['-posted_at']
+        indexes = [
+            # Keyset pagination (-posted_at, -id)
+            models.Index(fields=['-posted_at', '-id'], name='jobs_post_posted_id_idx'),
+            # Public listing: filter(is_active=True).order_by('-posted_at', '-id')
+            models.Index(fields=['is_active', '-posted_at', '-id'], name='jobs_post_active_posted_idx'),
+            # My posts: filter(employer=u).order_by('-posted_at', '-id')
+            models.Index(fields=['employer', '-posted_at', '-id'], name='jobs_post_employer_posted_idx'),
+        ]
+
+
+class JobPostSkill(models.Model):
+    job = models.ForeignKey(JobPost, on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='job_links')
+
+    class Meta:
+        unique_together = ('job', 'skill')
+        indexes = [
+            # skill -> jobs lookups for the ?skills= filter
+            models.Index(fields=['skill', 'job'], name='jobs_jobskill_skill_job_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id} - {self.skill_id}"
 
 
 class Application(models.Model):
@@ -48,10 +73,131 @@ class Application(models.Model):
     applied_at = models.DateTimeField(auto_now_add=True)
     cover_letter = models.TextField(blank=True, null=True)
     # resume_snapshot_url = models.URLField(blank=True, null=True) 
+    # Idempotency-Key header sent with the apply request, used to recognise client retries
+    idempotency_key = models.CharField(max_length=64, blank=True, null=True, editable=False)
 
     class Meta:
         unique_together = ('user', 'job') 
         ordering = ['-applied_at']
+        indexes = [
+            # Keyset pagination (-applied_at, -id)
+            models.Index(fields=['-applied_at', '-id'], name='jobs_app_applied_id_idx'),
+            # Employer views: filter(job__employer=u) / filter(job=j) .order_by('-applied_at', '-id')
+            models.Index(fields=['job', '-applied_at', '-id'], name='jobs_app_job_applied_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'idempotency_key'],
+                condition=models.Q(idempotency_key__isnull=False),
+                name='jobs_app_user_idempotency_uniq',
+            ),
+        ]
 
     def __str__(self):
         return f"Application by {self.user.email} for {self.job.title}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so the funnel counters can see status changes on save()
+        if 'status' in field_names:
+            instance._loaded_status = instance.status
+        return instance
+
+
+class JobApplicationStats(models.Model):
+    """
+    Denormalized per-status application counts for a job (the employer's funnel).
+    Maintained by the Application signals below and by the bulk status endpoint;
+    `manage.py rebuild_application_funnels` recomputes them if they ever drift.
+    Field names match Application.STATUS_CHOICES.
+    """
+    job = models.OneToOneField(JobPost, on_delete=models.CASCADE, primary_key=True, related_name='application_stats')
+    submitted = models.IntegerField(default=0)
+    reviewed = models.IntegerField(default=0)
+    shortlisted = models.IntegerField(default=0)
+    interviewing = models.IntegerField(default=0)
+    offered = models.IntegerField(default=0)
+    rejected = models.IntegerField(default=0)
+    withdrawn = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = 'job application stats'
+
+    def __str__(self):
+        return f"Application stats for job {self.job_id}"
+
+
+# Signals to keep the search index, skill links and recommendation matrix in sync with JobPost rows
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from workvera_backend import pubsub
+from . import funnel, list_cache, recommendations, search
+from .streams import applications_topic, status_event
+from .skill_tags import sync_job_skills
+
+@receiver(post_save, sender=JobPost)
+@receiver(post_delete, sender=JobPost)
+def invalidate_job_list_cache(sender, **kwargs):
+    list_cache.invalidate()
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_job_list_cache_for_user(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    # Listings show the employer's details; new users have no posts and logins only save last_login
+    if created or raw or instance.role != 'employer':
+        return
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    list_cache.invalidate()
+
+@receiver(post_save, sender=JobPost)
+def index_job_post_for_search(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    search.index_job_post(instance)
+
+@receiver(post_save, sender=JobPost)
+def sync_job_post_skills(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    skill_ids = sync_job_skills(instance)
+    # Refresh this job's row in the in-process recommendation matrix
+    recommendations.job_changed(instance, skill_ids)
+
+@receiver(post_delete, sender=JobPost)
+def remove_job_post_from_search(sender, instance, **kwargs):
+    search.remove_job_post(instance.pk)
+    recommendations.job_deleted(instance.pk)
+
+
+@receiver(post_save, sender=JobPost)
+def create_application_stats(sender, instance, created, raw=False, **kwargs):
+    # Start every new job with an empty funnel so applying never has to build one
+    if created and not raw:
+        JobApplicationStats.objects.create(job=instance)
+
+
+# Signals to keep JobApplicationStats in step with Application rows.
+# They run inside the caller's transaction (apply, update_status, admin and
+# cascade deletes are all atomic), so the counters commit or roll back with the row.
+@receiver(post_save, sender=Application)
+def count_application_status(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_loaded_status', None)
+    if created:
+        funnel.apply_deltas(instance.job_id, {instance.status: 1})
+    elif previous is not None and previous != instance.status:
+        funnel.apply_deltas(instance.job_id, {previous: -1, instance.status: 1})
+        # Push to the seeker's open My Applications page (jobs/streams.py)
+        pubsub.publish_on_commit(applications_topic(instance.user_id),
+                                 status_event(instance.pk, instance.job_id, previous, instance.status))
+    instance._loaded_status = instance.status
+
+@receiver(post_delete, sender=Application)
+def uncount_application_status(sender, instance, **kwargs):
+    status = getattr(instance, '_loaded_status', None) or instance.status
+    # No row to decrement means the job itself is being deleted (its stats row
+    # cascades first) or the counters were never built; don't create one here.
+    funnel.apply_deltas(instance.job_id, {status: -1}, create=False)
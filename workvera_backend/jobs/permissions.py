@@ -1,4 +1,5 @@
 from rest_framework import permissions
+from .models import JobPost, Application
 
 class IsEmployerOrReadOnly(permissions.BasePermission):
     """
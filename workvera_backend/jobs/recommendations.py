@@ -0,0 +1,299 @@
+# jobs/recommendations.py
+"""
+Seeker -> job recommendations.
+
+Every active job is a row ("slot") in a set of NumPy arrays held in process memory:
+- ``skill_slots``: (jobs x width) int32 matrix of skill columns, padded with -1
+- ``tag_counts``:  number of skill tags per job
+- ``gap_friendly`` / ``posted_at`` / ``active`` per job
+
+Scoring one seeker is a handful of vectorized operations over those arrays instead
+of a Python loop over jobs. The padding value -1 indexes the last element of the
+seeker's weight vector, which is always 0, so padded cells contribute nothing.
+
+The arrays are loaded once (two queries) and then kept current by the JobPost
+signals in jobs/models.py, which overwrite or free a single slot per change.
+Because each worker process holds its own copy, the matrix is also reloaded when
+it is older than ``RECOMMENDATION_MATRIX_MAX_AGE`` seconds so that changes made
+in other processes (or through queryset.update()) show up eventually.
+"""
+import threading
+import time
+import uuid
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+# Score = SKILL_FIT_WEIGHT * mean seeker proficiency over the job's skills
+#       + OVERLAP_WEIGHT   * share of the job's skills the seeker has been tested on
+#       + GAP_WEIGHT       * gap_friendly boost scaled by the seeker's career gap
+#       + RECENCY_WEIGHT   * posting recency (tie breaker)
+SKILL_FIT_WEIGHT = 0.5
+OVERLAP_WEIGHT = 0.3
+GAP_WEIGHT = 0.2
+RECENCY_WEIGHT = 0.001
+# Career gaps of this many years or more get the full gap_friendly boost
+FULL_GAP_YEARS = 5
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+# Number of ranked ids kept per seeker in the cache
+CACHED_RESULTS = MAX_LIMIT
+
+
+class JobFeatureMatrix:
+    """Slot-based job feature arrays that can be updated one job at a time."""
+
+    def __init__(self, width=8, capacity=1024):
+        self.lock = threading.RLock()
+        self.token = uuid.uuid4().hex[:12]  # identifies this copy of the matrix in cache keys
+        self.version = 0
+        self.loaded_at = time.monotonic()
+        self.size = 0  # number of slots in use (including freed ones)
+        self.slot_of = {}  # job_id -> slot
+        self.free_slots = []
+        self.skill_index = {}  # skill_id -> column
+        self._allocate(capacity, width)
+
+    def _allocate(self, capacity, width):
+        self.job_ids = np.zeros(capacity, dtype=np.int64)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.gap_friendly = np.zeros(capacity, dtype=bool)
+        self.posted_at = np.zeros(capacity, dtype=np.float64)
+        self.tag_counts = np.zeros(capacity, dtype=np.int32)
+        self.skill_slots = np.full((capacity, width), -1, dtype=np.int32)
+
+    def _grow(self, capacity=None, width=None):
+        capacity = max(capacity or 0, self.job_ids.shape[0])
+        width = max(width or 0, self.skill_slots.shape[1])
+        old = (self.job_ids, self.active, self.gap_friendly, self.posted_at, self.tag_counts, self.skill_slots)
+        self._allocate(capacity, width)
+        n = self.size
+        self.job_ids[:n], self.active[:n], self.gap_friendly[:n] = old[0][:n], old[1][:n], old[2][:n]
+        self.posted_at[:n], self.tag_counts[:n] = old[3][:n], old[4][:n]
+        self.skill_slots[:n, :old[5].shape[1]] = old[5][:n]
+
+    def _skill_column(self, skill_id):
+        column = self.skill_index.get(skill_id)
+        if column is None:
+            column = self.skill_index[skill_id] = len(self.skill_index)
+        return column
+
+    def load(self, job_ids, gap_friendly, posted_at, link_job_ids, link_skill_ids):
+        """
+        Replace the whole matrix.
+        ``job_ids``/``gap_friendly``/``posted_at`` describe the active jobs, ``link_*`` their
+        (job_id, skill_id) pairs. Built with array operations only, no per-job loop.
+        """
+        job_ids = np.asarray(job_ids, dtype=np.int64)
+        link_job_ids = np.asarray(link_job_ids, dtype=np.int64)
+        link_skill_ids = np.asarray(link_skill_ids, dtype=np.int64)
+        n = len(job_ids)
+
+        order = np.argsort(job_ids, kind='stable')
+        job_ids = job_ids[order]
+        # Links of jobs that are not in the list (e.g. inactive) are dropped
+        link_slots = np.searchsorted(job_ids, link_job_ids)
+        if n:
+            known = job_ids[np.minimum(link_slots, n - 1)] == link_job_ids
+        else:
+            known = np.zeros(len(link_job_ids), dtype=bool)
+        link_slots, link_skill_ids = link_slots[known], link_skill_ids[known]
+
+        skill_ids, columns = np.unique(link_skill_ids, return_inverse=True)
+        by_slot = np.argsort(link_slots, kind='stable')
+        link_slots, columns = link_slots[by_slot], columns[by_slot]
+        counts = np.bincount(link_slots, minlength=n).astype(np.int32) if n else np.zeros(0, dtype=np.int32)
+        starts = np.cumsum(counts) - counts
+        positions = np.arange(len(link_slots)) - np.repeat(starts, counts)
+
+        with self.lock:
+            width = max(int(counts.max()) if n else 0, 1)
+            self._allocate(max(n, 1), width)
+            self.job_ids[:n] = job_ids
+            self.active[:n] = True
+            self.gap_friendly[:n] = np.asarray(gap_friendly, dtype=bool)[order]
+            self.posted_at[:n] = np.asarray(posted_at, dtype=np.float64)[order]
+            self.tag_counts[:n] = counts
+            self.skill_slots[link_slots, positions] = columns
+            self.size = n
+            self.slot_of = dict(zip(job_ids.tolist(), range(n)))
+            self.free_slots = []
+            self.skill_index = dict(zip(skill_ids.tolist(), range(len(skill_ids))))
+            self.version += 1
+            self.loaded_at = time.monotonic()
+
+    def upsert(self, job_id, gap_friendly, posted_at, skill_ids):
+        """Add or overwrite the features of a single active job."""
+        skill_ids = list(skill_ids)
+        with self.lock:
+            slot = self.slot_of.get(job_id)
+            if slot is None:
+                if self.free_slots:
+                    slot = self.free_slots.pop()
+                else:
+                    if self.size == self.job_ids.shape[0]:
+                        self._grow(capacity=self.size * 2)
+                    slot = self.size
+                    self.size += 1
+                self.slot_of[job_id] = slot
+            if len(skill_ids) > self.skill_slots.shape[1]:
+                self._grow(width=len(skill_ids))
+            self.job_ids[slot] = job_id
+            self.active[slot] = True
+            self.gap_friendly[slot] = bool(gap_friendly)
+            self.posted_at[slot] = posted_at
+            self.tag_counts[slot] = len(skill_ids)
+            self.skill_slots[slot] = -1
+            self.skill_slots[slot, :len(skill_ids)] = [self._skill_column(skill_id) for skill_id in skill_ids]
+            self.version += 1
+
+    def remove(self, job_id):
+        """Free the slot of a job that was deleted or deactivated."""
+        with self.lock:
+            slot = self.slot_of.pop(job_id, None)
+            if slot is None:
+                return
+            self.active[slot] = False
+            self.skill_slots[slot] = -1
+            self.tag_counts[slot] = 0
+            self.free_slots.append(slot)
+            self.version += 1
+
+    def score(self, skill_scores, career_gap_years=0, limit=DEFAULT_LIMIT):
+        """
+        Rank jobs for one seeker.
+        ``skill_scores`` maps skill_id -> proficiency in [0, 1].
+        Returns (job_ids, scores) for the best ``limit`` jobs, best first.
+        """
+        with self.lock:
+            n = self.size
+            if n == 0 or limit <= 0 or not self.active[:n].any():
+                return [], []
+            weights = np.zeros(len(self.skill_index) + 1, dtype=np.float32)
+            for skill_id, value in skill_scores.items():
+                column = self.skill_index.get(skill_id)
+                if column is not None:
+                    weights[column] = value
+
+            values = weights[self.skill_slots[:n]]  # -1 padding reads weights[-1] == 0
+            tag_counts = np.maximum(self.tag_counts[:n], 1)
+            skill_fit = values.sum(axis=1) / tag_counts
+            overlap = np.count_nonzero(values, axis=1) / tag_counts
+            gap_boost = self.gap_friendly[:n] * min(career_gap_years / FULL_GAP_YEARS, 1.0)
+            posted_at = self.posted_at[:n]
+            span = posted_at.max() - posted_at.min()
+            recency = (posted_at - posted_at.min()) / span if span > 0 else np.zeros(n)
+
+            scores = (SKILL_FIT_WEIGHT * skill_fit + OVERLAP_WEIGHT * overlap
+                      + GAP_WEIGHT * gap_boost + RECENCY_WEIGHT * recency)
+            scores[~self.active[:n]] = -np.inf
+
+            limit = min(limit, int(self.active[:n].sum()))
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            top = top[np.argsort(-scores[top], kind='stable')]
+            return self.job_ids[top].tolist(), scores[top].tolist()
+
+
+_matrix = None
+_matrix_lock = threading.Lock()
+
+
+def _max_age():
+    return getattr(settings, 'RECOMMENDATION_MATRIX_MAX_AGE', 300)
+
+
+def load_matrix():
+    """Build a fresh matrix from the database (two queries)."""
+    from .models import JobPost, JobPostSkill
+
+    jobs = list(JobPost.objects.filter(is_active=True).values_list('id', 'gap_friendly', 'posted_at'))
+    links = list(JobPostSkill.objects.filter(job__is_active=True).values_list('job_id', 'skill_id'))
+    matrix = JobFeatureMatrix()
+    matrix.load(
+        [job[0] for job in jobs],
+        [job[1] for job in jobs],
+        [job[2].timestamp() for job in jobs],
+        [link[0] for link in links],
+        [link[1] for link in links],
+    )
+    return matrix
+
+
+def get_matrix():
+    global _matrix
+    with _matrix_lock:
+        if _matrix is None or time.monotonic() - _matrix.loaded_at > _max_age():
+            _matrix = load_matrix()
+        return _matrix
+
+
+def invalidate():
+    """Drop the in-process matrix, e.g. after queryset.update() calls that skip signals."""
+    global _matrix
+    with _matrix_lock:
+        _matrix = None
+
+
+def job_changed(job_post, skill_ids):
+    """
+    Called from the JobPost post_save signal with the job's current skill ids.
+    The matrix is shared by every request in the process, so the row is only updated
+    once the transaction commits; a rolled-back save never shows up in rankings.
+    """
+    job_id, active = job_post.pk, job_post.is_active
+    gap_friendly, posted_at = job_post.gap_friendly, job_post.posted_at.timestamp()
+
+    def update_matrix():
+        matrix = _matrix
+        if matrix is None:
+            return  # Nothing loaded yet; the first request will load current data
+        if active:
+            matrix.upsert(job_id, gap_friendly, posted_at, skill_ids)
+        else:
+            matrix.remove(job_id)
+
+    transaction.on_commit(update_matrix)
+
+
+def job_deleted(job_post_id):
+    def update_matrix():
+        matrix = _matrix
+        if matrix is not None:
+            matrix.remove(job_post_id)
+
+    transaction.on_commit(update_matrix)
+
+
+def seeker_features(user):
+    """(skill_id -> proficiency in [0, 1], career_gap_years) for a seeker."""
+    from skills.models import SkillResult
+    from users.models import Profile
+
+    skill_scores = {}
+    results = SkillResult.objects.filter(user=user, test__skill__isnull=False).values_list('test__skill_id', 'score')
+    for skill_id, score in results:
+        value = min(max(score / 100.0, 0.0), 1.0)
+        skill_scores[skill_id] = max(skill_scores.get(skill_id, 0.0), value)
+    career_gap_years = Profile.objects.filter(user=user).values_list('career_gap_years', flat=True).first() or 0
+    return skill_scores, career_gap_years
+
+
+def recommend_for_user(user, limit=DEFAULT_LIMIT):
+    """
+    Ranked (job_id, score) pairs for a seeker.
+    Results are cached per seeker; the key includes the matrix version and the seeker's
+    features, so any job change or new skill result produces a fresh ranking.
+    """
+    skill_scores, career_gap_years = seeker_features(user)
+    matrix = get_matrix()
+    fingerprint = hash((tuple(sorted(skill_scores.items())), career_gap_years))
+    cache_key = f'jobs:recommended:{user.pk}:{matrix.token}:{matrix.version}:{fingerprint}'
+    ranked = cache.get(cache_key)
+    if ranked is None:
+        job_ids, scores = matrix.score(skill_scores, career_gap_years, limit=CACHED_RESULTS)
+        ranked = list(zip(job_ids, scores))
+        cache.set(cache_key, ranked, getattr(settings, 'RECOMMENDATION_CACHE_TIMEOUT', 300))
+    return ranked[:limit]
@@ -0,0 +1,149 @@
+# jobs/search.py
+"""
+Full-text search for job posts.
+
+On SQLite the posts are indexed in an FTS5 virtual table (``jobs_jobpost_fts``)
+whose rowid is the JobPost id. The index is kept up to date by the JobPost
+post_save / post_delete signals (see jobs/models.py), so a search is a single
+indexed MATCH joined back to ``jobs_jobpost`` and ordered by bm25 relevance.
+
+Query syntax accepted on ``?q=``:
+- plain words are ANDed together:        python django
+- double quotes make a phrase:            "data engineer"
+- a trailing * makes a prefix query:      engin*
+
+Other database vendors fall back to ``icontains`` matching on the same fields.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+FTS_TABLE = 'jobs_jobpost_fts'
+
+# Columns of the FTS table, in order, with their bm25 weights.
+# A hit in the title is worth more than a hit in the description.
+INDEXED_FIELDS = (
+    ('title', 10.0),
+    ('description', 1.0),
+    ('skill_tags', 5.0),
+    ('location', 2.0),
+)
+
+CREATE_FTS_TABLE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    + ', '.join(name for name, _ in INDEXED_FIELDS)
+    + ", tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+DROP_FTS_TABLE_SQL = f"DROP TABLE IF EXISTS {FTS_TABLE}"
+
+_QUERY_TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def fts_enabled():
+    """The FTS5 index is only maintained on SQLite."""
+    return connection.vendor == 'sqlite'
+
+
+def build_match_expression(raw_query):
+    """
+    Turn user input into a safe FTS5 MATCH expression.
+    Every term is quoted so FTS5 operators typed by users (AND, NEAR, column
+    filters, ...) are treated as plain text. Returns '' if nothing searchable is left.
+    """
+    parts = []
+    for phrase, word in _QUERY_TOKEN_RE.findall(raw_query or ''):
+        if phrase:
+            words = _WORD_RE.findall(phrase)
+            if words:
+                parts.append('"{}"'.format(' '.join(words)))
+            continue
+        tokens = [f'"{token}"' for token in _WORD_RE.findall(word)]
+        if tokens and word.endswith('*'):
+            tokens[-1] += '*'
+        parts.extend(tokens)
+    return ' '.join(parts)
+
+
+def _row_values(job_post):
+    return [getattr(job_post, name) or '' for name, _ in INDEXED_FIELDS]
+
+
+def index_job_post(job_post):
+    """Insert or replace a single job post in the search index."""
+    if not fts_enabled():
+        return
+    columns = ', '.join(name for name, _ in INDEXED_FIELDS)
+    placeholders = ', '.join(['%s'] * len(INDEXED_FIELDS))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [job_post.pk])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {columns}) VALUES (%s, {placeholders})",
+            [job_post.pk, *_row_values(job_post)],
+        )
+
+
+def remove_job_post(job_post_id):
+    """Drop a job post from the search index."""
+    if not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [job_post_id])
+
+
+def rebuild_index(job_posts, batch_size=2000):
+    """
+    Rebuild the whole index from an iterable/queryset of job posts.
+    Used by the migration that creates the table and by bulk loaders that skip signals.
+    """
+    if not fts_enabled():
+        return 0
+    columns = ', '.join(name for name, _ in INDEXED_FIELDS)
+    placeholders = ', '.join(['%s'] * (len(INDEXED_FIELDS) + 1))
+    insert_sql = f"INSERT INTO {FTS_TABLE} (rowid, {columns}) VALUES ({placeholders})"
+    total = 0
+    batch = []
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        for job_post in job_posts:
+            batch.append([job_post.pk, *_row_values(job_post)])
+            if len(batch) >= batch_size:
+                cursor.executemany(insert_sql, batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(insert_sql, batch)
+            total += len(batch)
+    return total
+
+
+def search_job_posts(queryset, raw_query):
+    """
+    Restrict ``queryset`` to posts matching ``raw_query`` and order them by relevance.
+    The result stays a regular queryset, so further .filter() calls (gap_friendly,
+    job_type, ...) are applied on top of the match in the same SQL statement.
+    Each row gets a ``search_rank`` attribute (lower is more relevant, as in bm25).
+    """
+    expression = build_match_expression(raw_query)
+    if not expression:
+        return queryset.none()
+
+    if not fts_enabled():
+        condition = Q()
+        for term in _WORD_RE.findall(raw_query):
+            term_q = Q()
+            for name, _ in INDEXED_FIELDS:
+                term_q |= Q(**{f'{name}__icontains': term})
+            condition &= term_q
+        return queryset.filter(condition)
+
+    weights = ', '.join(str(weight) for _, weight in INDEXED_FIELDS)
+    job_table = queryset.model._meta.db_table
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[f'{FTS_TABLE}.rowid = {job_table}.id', f'{FTS_TABLE} MATCH %s'],
+        params=[expression],
+        select={'search_rank': f'bm25({FTS_TABLE}, {weights})'},
+        order_by=['search_rank', '-posted_at'],
+    )
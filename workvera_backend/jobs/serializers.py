@@ -1,9 +1,12 @@
 from rest_framework import serializers
 from .models import JobPost, Application
+from . import funnel
 from users.serializers import CustomUserSerializer
 
 class JobPostSerializer(serializers.ModelSerializer):
     employer_detail = CustomUserSerializer(source='employer', read_only=True)
+    # Per-status application counts; only the posting employer (or staff) sees them, null otherwise
+    application_counts = serializers.SerializerMethodField()
 
     class Meta:
         model = JobPost
@@ -20,9 +23,19 @@ class JobPostSerializer(serializers.ModelSerializer):
             'posted_at',
             'updated_at',
             'is_active',
+            'application_counts',
         )
         read_only_fields = ('posted_at', 'updated_at', 'employer_detail', 'is_active')
 
+    def get_application_counts(self, obj):
+        request = self.context.get('request')
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            return None
+        if not (user.is_staff or obj.employer_id == user.pk):
+            return None
+        return funnel.counts_for(obj)
+
     def validate_employer(self, value):
         """
         Ensure the user creating the job is an employer.
@@ -50,6 +63,17 @@ class ApplicationSerializer(serializers.ModelSerializer):
             'cover_letter',
         )
         read_only_fields = ('applied_at', 'user_detail', 'job_detail', 'status')
+        # Duplicate applications are rejected by the (user, job) unique constraint at insert
+        # time (see JobPostViewSet.apply_to_job); a pre-check query here would still race.
+        validators = []
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.instance is not None:
+            # An application can't be moved to another job or seeker (the job's funnel counts follow it)
+            fields['job'].read_only = True
+            fields['user'].read_only = True
+        return fields
 
     def validate_user(self, value):
         """
@@ -60,13 +84,25 @@ class ApplicationSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Only users with the 'seeker' role can apply for jobs.")
         return value
 
-    def validate(self, data):
-        """
-        Check that the user hasn't already applied for this job.
-        """
-        user = self.context['request'].user
-        job = data.get('job')
 
-        if Application.objects.filter(user=user, job=job).exists():
-            raise serializers.ValidationError("You have already applied for this job.")
+class BulkApplicationFilterSerializer(serializers.Serializer):
+    job = serializers.IntegerField(min_value=1, required=False)
+    status = serializers.ChoiceField(choices=Application.STATUS_CHOICES, required=False)
+
+
+class BulkApplicationStatusSerializer(serializers.Serializer):
+    """
+    Input for PATCH /api/jobs/applications/bulk-status/.
+    Either a list of application ids or a filter selecting the employer's applications.
+    """
+    MAX_APPLICATIONS = 10000
+
+    status = serializers.ChoiceField(choices=Application.STATUS_CHOICES)
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False,
+                                allow_empty=False, max_length=MAX_APPLICATIONS)
+    filter = BulkApplicationFilterSerializer(required=False)
+
+    def validate(self, data):
+        if ('ids' in data) == ('filter' in data):
+            raise serializers.ValidationError("Provide either 'ids' or 'filter', not both.")
         return data
@@ -0,0 +1,79 @@
+# jobs/skill_tags.py
+"""
+Normalized storage for JobPost.skill_tags.
+
+``JobPost.skill_tags`` stays the comma-separated string the API and the React
+pages use; every save parses it into ``JobPostSkill`` rows that link the post to
+``skills.Skill``. Skill filtering then runs against the indexed link table instead
+of ``skill_tags__icontains`` (which also made "Java" match "JavaScript").
+"""
+from django.db.models import Count
+
+from skills.models import NAME_MAX_LENGTH, Skill, normalize_skill_name
+
+
+def parse_skill_tags(value):
+    """
+    "Python, django ,python,,React" -> {'python': 'Python', 'django': 'django', 'react': 'React'}
+    Keys are normalized names, values keep the first spelling seen (used when creating a Skill).
+    """
+    tags = {}
+    for raw in (value or '').split(','):
+        # Keyed by the truncated name, so a Skill created from it gets the same normalized_name
+        name = ' '.join(raw.split())[:NAME_MAX_LENGTH]
+        key = normalize_skill_name(name)
+        if key and key not in tags:
+            tags[key] = name
+    return tags
+
+
+def get_or_create_skills(tags, skill_model=Skill):
+    """Map normalized names to Skill ids, creating the skills that don't exist yet."""
+    skill_ids = dict(skill_model.objects.filter(normalized_name__in=list(tags)).values_list('normalized_name', 'pk'))
+
+    missing = [key for key in tags if key not in skill_ids]
+    if missing:
+        skill_model.objects.bulk_create(
+            [skill_model(name=tags[key], normalized_name=key) for key in missing],
+            ignore_conflicts=True,  # created meanwhile by another request
+        )
+        skill_ids.update(skill_model.objects.filter(normalized_name__in=missing).values_list('normalized_name', 'pk'))
+    return skill_ids
+
+
+def sync_job_skills(job_post, link_model=None, skill_model=Skill):
+    """Make the JobPostSkill rows of ``job_post`` match its skill_tags string; returns the skill ids."""
+    if link_model is None:
+        from .models import JobPostSkill as link_model
+
+    tags = parse_skill_tags(job_post.skill_tags)
+    wanted = set(get_or_create_skills(tags, skill_model).values()) if tags else set()
+    current = set(link_model.objects.filter(job_id=job_post.pk).values_list('skill_id', flat=True))
+
+    if current - wanted:
+        link_model.objects.filter(job_id=job_post.pk, skill_id__in=current - wanted).delete()
+    if wanted - current:
+        link_model.objects.bulk_create(
+            [link_model(job_id=job_post.pk, skill_id=skill_id) for skill_id in wanted - current],
+            ignore_conflicts=True,
+        )
+    return wanted
+
+
+def filter_by_skills(queryset, names, match='any'):
+    """
+    Restrict a JobPost queryset to posts tagged with the given skills.
+    match='any' keeps posts with at least one of the skills, match='all' only posts with every one.
+    The link lookup is a subquery, so the whole filter is still a single SQL statement.
+    """
+    from .models import JobPostSkill
+
+    keys = {normalize_skill_name(name) for name in names} - {''}
+    if not keys:
+        return queryset
+    links = JobPostSkill.objects.filter(skill__normalized_name__in=keys)
+    if match == 'all':
+        links = (links.values('job_id')
+                 .annotate(matched=Count('skill_id', distinct=True))
+                 .filter(matched=len(keys)))
+    return queryset.filter(pk__in=links.values('job_id'))
@@ -0,0 +1,31 @@
+# jobs/streams.py
+from django.views.decorators.http import require_GET
+
+from workvera_backend.streams import authenticate, error_response, stream_response
+
+
+def applications_topic(user_id):
+    return f'jobs.applications.user.{user_id}'
+
+
+def status_event(application_id, job_id, previous_status, new_status):
+    return {
+        'event': 'status',
+        'data': {'id': application_id, 'job': job_id, 'previous_status': previous_status, 'status': new_status},
+    }
+
+
+@require_GET
+async def application_status_stream(request):
+    """
+    Live status changes of the current seeker's applications, replacing polling on My Applications.
+    GET /api/jobs/applications/stream/?ticket=<stream ticket>  (text/event-stream)
+    Sends a "status" event {"id", "job", "previous_status", "status"} whenever an employer
+    changes one of the seeker's applications (single or bulk update).
+    """
+    user = await authenticate(request)
+    if user is None:
+        return error_response('Authentication credentials were not provided.', 401)
+    if user.role != 'seeker':
+        return error_response('Only job seekers have application updates.', 403)
+    return stream_response(applications_topic(user.pk))
@@ -1,3 +1,540 @@
-from django.test import TestCase
+import asyncio
+import importlib
+import json
+import tempfile
+from io import StringIO
+from itertools import count
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.contrib.admin.sites import site
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from skills.models import Skill
+from users.models import CustomUser
+from workvera_backend.testing import QueryBudgetMixin
+from .models import JobPost, JobPostSkill, Application, JobApplicationStats
+from . import funnel, list_cache, recommendations, search
+
+
+class JobsQueryBudgetTests(QueryBudgetMixin, APITestCase):
+    """List endpoints in jobs/views.py must not run one query per row."""
+
+    def setUp(self):
+        self.sequence = count()
+        self.employer = CustomUser.objects.create_user(email='employer@example.com', role='employer', name='Employer')
+        self.seeker = CustomUser.objects.create_user(email='seeker@example.com', role='seeker', name='Seeker')
+        self.admin = CustomUser.objects.create_superuser(email='admin@example.com', name='Admin')
+
+    def create_jobs(self, n, employer=None):
+        jobs = []
+        for _ in range(n):
+            i = next(self.sequence)
+            jobs.append(JobPost.objects.create(
+                title=f'Python developer {i}', description='Backend work', skill_tags='Python,Django',
+                employer=employer or CustomUser.objects.create_user(
+                    email=f'employer{i}@example.com', role='employer', name=f'Employer {i}'),
+            ))
+        return jobs
+
+    def create_applications(self, n, job=None):
+        for _ in range(n):
+            i = next(self.sequence)
+            seeker = CustomUser.objects.create_user(email=f'seeker{i}@example.com', role='seeker', name=f'Seeker {i}')
+            application_job = job or self.create_jobs(1, employer=self.employer)[0]
+            Application.objects.create(user=seeker, job=application_job)
+
+    def test_job_list(self):
+        self.assertConstantQueries('/api/jobs/posts/', self.create_jobs, max_queries=1)
+
+    def test_job_list_legacy_pages(self):
+        self.assertConstantQueries('/api/jobs/posts/', self.create_jobs, params={'page': 1}, max_queries=2)
+
+    def test_keyset_unless_pages_requested(self):
+        self.create_jobs(3)
+        response = self.client.get('/api/jobs/posts/', {'page_size': 2})
+        self.assertNotIn('count', response.data)
+        self.assertIn('cursor=', response.data['next'])
+        self.assertEqual(len(self.client.get(response.data['next']).data['results']), 1)
+        response = self.client.get('/api/jobs/posts/', {'page_size': 2, 'page': 1})
+        self.assertEqual(response.data['count'], 3)
+
+    def test_job_search(self):
+        self.assertConstantQueries('/api/jobs/posts/', self.create_jobs, params={'q': 'python'}, max_queries=2)
+
+    def test_skill_filter(self):
+        self.assertConstantQueries('/api/jobs/posts/', self.create_jobs, params={'skills': 'python,django', 'match': 'all'}, max_queries=1)
+
+    def test_my_posts(self):
+        self.client.force_authenticate(self.employer)
+        self.assertConstantQueries('/api/jobs/posts/my-posts/', lambda n: self.create_jobs(n, employer=self.employer), max_queries=1)
+
+    def test_applications_as_employer(self):
+        self.client.force_authenticate(self.employer)
+        self.assertConstantQueries('/api/jobs/applications/', self.create_applications, max_queries=1)
+
+    def test_applications_as_staff(self):
+        self.client.force_authenticate(self.admin)
+        self.assertConstantQueries('/api/jobs/applications/', self.create_applications, max_queries=1)
+
+    def test_applications_as_seeker(self):
+        self.client.force_authenticate(self.seeker)
+
+        def apply(n):
+            for job in self.create_jobs(n, employer=self.employer):
+                Application.objects.create(user=self.seeker, job=job)
+
+        self.assertConstantQueries('/api/jobs/applications/', apply, max_queries=1)
+
+
+class ApplyToJobTests(QueryBudgetMixin, APITestCase):
+
+    def setUp(self):
+        self.employer = CustomUser.objects.create_user(email='employer@example.com', role='employer', name='Employer')
+        self.seeker = CustomUser.objects.create_user(email='seeker@example.com', role='seeker', name='Seeker')
+        self.job = JobPost.objects.create(title='Backend developer', description='Django', employer=self.employer)
+        self.url = f'/api/jobs/posts/{self.job.pk}/apply/'
+        self.client.force_authenticate(self.seeker)
+
+    def test_apply_creates_application(self):
+        response = self.client.post(self.url, {'cover_letter': 'Hello'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['job_detail']['employer_detail']['email'], 'employer@example.com')
+        self.assertEqual(Application.objects.get().cover_letter, 'Hello')
+
+    def test_duplicate_apply_is_a_clean_400(self):
+        self.client.post(self.url, {}, format='json')
+        response = self.client.post(self.url, {}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('already applied', response.data['detail'])
+        self.assertEqual(Application.objects.count(), 1)
+
+    def test_retry_with_same_idempotency_key_replays_application(self):
+        first = self.client.post(self.url, {}, format='json', HTTP_IDEMPOTENCY_KEY='abc-123')
+        retry = self.client.post(self.url, {}, format='json', HTTP_IDEMPOTENCY_KEY='abc-123')
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.data['id'], first.data['id'])
+
+    def test_idempotency_key_reused_for_other_job(self):
+        other_job = JobPost.objects.create(title='Frontend developer', description='React', employer=self.employer)
+        self.client.post(self.url, {}, format='json', HTTP_IDEMPOTENCY_KEY='abc-123')
+        response = self.client.post(f'/api/jobs/posts/{other_job.pk}/apply/', {}, format='json', HTTP_IDEMPOTENCY_KEY='abc-123')
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Application.objects.count(), 1)
+
+    def test_apply_reads_nothing_before_the_insert(self):
+        response, queries = self.count_queries(self.url, method='post', data={})
+        self.assertEqual(response.status_code, 201)
+        selects = [query['sql'] for query in queries if query['sql'].startswith('SELECT')]
+        # Only the job lookup (with its employer) precedes the INSERT
+        self.assertEqual(len(selects), 1, selects)
+
+
+class BulkStatusTests(QueryBudgetMixin, APITestCase):
+    url = '/api/jobs/applications/bulk-status/'
+
+    def setUp(self):
+        self.employer = CustomUser.objects.create_user(email='employer@example.com', role='employer', name='Employer')
+        other_employer = CustomUser.objects.create_user(email='other@example.com', role='employer', name='Other')
+        self.job = JobPost.objects.create(title='Backend developer', description='Django', employer=self.employer)
+        other_job = JobPost.objects.create(title='Designer', description='Figma', employer=other_employer)
+        self.applications = []
+        for i in range(5):
+            seeker = CustomUser.objects.create_user(email=f'seeker{i}@example.com', role='seeker', name=f'Seeker {i}')
+            self.applications.append(Application.objects.create(user=seeker, job=self.job))
+        self.foreign = Application.objects.create(user=seeker, job=other_job)
+        self.client.force_authenticate(self.employer)
+
+    def test_updates_owned_ids_in_one_update(self):
+        self.applications[0].status = 'reviewed'
+        self.applications[0].save()
+        ids = [app.pk for app in self.applications] + [self.foreign.pk, 999999]
+        response, queries = self.count_queries(self.url, method='patch', data={'status': 'reviewed', 'ids': ids})
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['updated'], [app.pk for app in self.applications[1:]])
+        self.assertEqual(response.data['unchanged'], [self.applications[0].pk])
+        self.assertEqual(response.data['not_found'], [self.foreign.pk, 999999])
+        self.assertEqual(Application.objects.filter(status='reviewed').count(), 5)
+        self.assertEqual(Application.objects.get(pk=self.foreign.pk).status, 'submitted')
+        self.assertEqual(len([q for q in queries if q['sql'].startswith('UPDATE "jobs_application"')]), 1)
+        self.assertEqual(funnel.counts_for(JobPost.objects.get(pk=self.job.pk))['reviewed'], 5)
+
+    def test_filter_mode(self):
+        response = self.client.patch(self.url, {'status': 'rejected', 'filter': {'job': self.job.pk, 'status': 'submitted'}}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(len(response.data['updated']), 5)
+        self.assertEqual(Application.objects.get(pk=self.foreign.pk).status, 'submitted')
+
+    def test_status_change_after_a_stale_read_keeps_the_funnel_right(self):
+        stale = Application.objects.get(pk=self.applications[0].pk)  # still 'submitted'
+        self.client.patch(self.url, {'status': 'shortlisted', 'ids': [stale.pk]}, format='json')
+        with mock.patch('jobs.views.ApplicationViewSet.get_object', return_value=stale):
+            response = self.client.patch(f'/api/jobs/applications/{stale.pk}/update-status/', {'status': 'rejected'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        counts = funnel.counts_for(JobPost.objects.get(pk=self.job.pk))
+        funnel.rebuild([self.job.pk])
+        self.assertEqual(counts, funnel.counts_for(JobPost.objects.get(pk=self.job.pk)))
+        self.assertEqual((counts['shortlisted'], counts['rejected'], counts['submitted']), (0, 1, 4))
+
+    def test_requires_ids_or_filter(self):
+        response = self.client.patch(self.url, {'status': 'rejected'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_seekers_cannot_bulk_update(self):
+        self.client.force_authenticate(self.applications[0].user)
+        response = self.client.patch(self.url, {'status': 'offered', 'ids': [self.applications[0].pk]}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+
+class ApplicationFunnelTests(APITestCase):
+    def setUp(self):
+        self.employer = CustomUser.objects.create_user(email='employer@example.com', role='employer', name='Employer')
+        self.job = JobPost.objects.create(title='Backend developer', description='Django', employer=self.employer)
+        self.seekers = [
+            CustomUser.objects.create_user(email=f'seeker{i}@example.com', role='seeker', name=f'Seeker {i}')
+            for i in range(3)
+        ]
+
+    def counts(self):
+        return funnel.counts_for(JobPost.objects.get(pk=self.job.pk))
+
+    def test_apply_status_change_and_delete(self):
+        for seeker in self.seekers:
+            self.client.force_authenticate(seeker)
+            self.client.post(f'/api/jobs/posts/{self.job.pk}/apply/', {}, format='json')
+        self.assertEqual(self.counts()['submitted'], 3)
+
+        application = Application.objects.filter(job=self.job).first()
+        self.client.force_authenticate(self.employer)
+        response = self.client.patch(f'/api/jobs/applications/{application.pk}/update-status/', {'status': 'shortlisted'}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self.counts()['submitted'], 2)
+        self.assertEqual(self.counts()['shortlisted'], 1)
+
+        response = self.client.delete(f'/api/jobs/applications/{application.pk}/')
+        self.assertEqual(response.status_code, 204)
+        counts = self.counts()
+        self.assertEqual((counts['submitted'], counts['shortlisted'], counts['total']), (2, 0, 2))
+
+    def test_counts_only_shown_to_owner(self):
+        Application.objects.create(user=self.seekers[0], job=self.job)
+        self.client.force_authenticate(self.employer)
+        response = self.client.get('/api/jobs/posts/my-posts/')
+        self.assertEqual(response.data['results'][0]['application_counts']['submitted'], 1)
+        self.client.force_authenticate(self.seekers[1])
+        response = self.client.get(f'/api/jobs/posts/{self.job.pk}/')
+        self.assertIsNone(response.data['application_counts'])
+
+    def test_rebuild_fixes_drift(self):
+        Application.objects.create(user=self.seekers[0], job=self.job)
+        Application.objects.create(user=self.seekers[1], job=self.job, status='offered')
+        JobApplicationStats.objects.filter(job=self.job).update(submitted=40, offered=0)
+        call_command('rebuild_application_funnels', stdout=StringIO())
+        counts = self.counts()
+        self.assertEqual((counts['submitted'], counts['offered']), (1, 1))
+
+    def test_filter_by_job(self):
+        other_job = JobPost.objects.create(title='Data engineer', description='SQL', employer=self.employer)
+        Application.objects.create(user=self.seekers[0], job=self.job)
+        Application.objects.create(user=self.seekers[0], job=other_job)
+        self.client.force_authenticate(self.seekers[0])
+        response = self.client.get('/api/jobs/applications/', {'job': other_job.pk})
+        self.assertEqual([row['job'] for row in response.data['results']], [other_job.pk])
+        self.assertEqual(self.client.get('/api/jobs/applications/', {'job': 'x'}).status_code, 400)
+
+    def test_applicants_can_only_withdraw(self):
+        application = Application.objects.create(user=self.seekers[0], job=self.job)
+        self.client.force_authenticate(self.seekers[0])
+        url = f'/api/jobs/applications/{application.pk}/update-status/'
+        response = self.client.patch(url, {'status': 'offered'}, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.counts()['offered'], 0)
+        response = self.client.patch(url, {'status': 'withdrawn'}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual((self.counts()['submitted'], self.counts()['withdrawn']), (0, 1))
+
+    def test_applications_cannot_be_moved_to_another_job(self):
+        application = Application.objects.create(user=self.seekers[0], job=self.job, status='reviewed')
+        other_job = JobPost.objects.create(title='Data engineer', description='SQL', employer=self.employer)
+        self.client.force_authenticate(self.seekers[0])
+        response = self.client.patch(f'/api/jobs/applications/{application.pk}/',
+                                     {'job': other_job.pk, 'user': self.seekers[1].pk, 'cover_letter': 'Hi'}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        application.refresh_from_db()
+        self.assertEqual((application.job_id, application.user_id, application.cover_letter),
+                         (self.job.pk, self.seekers[0].pk, 'Hi'))
+        self.assertEqual(self.counts()['reviewed'], 1)
+        self.assertEqual(funnel.counts_for(other_job)['total'], 0)
+
+    def test_deleting_job_with_applications(self):
+        Application.objects.create(user=self.seekers[0], job=self.job)
+        self.job.delete()
+        self.assertFalse(JobApplicationStats.objects.exists())
+
+
+class SkillFilterTests(APITestCase):
+    url = '/api/jobs/posts/'
+
+    def setUp(self):
+        cache.clear()
+        employer = CustomUser.objects.create_user(email='employer@example.com', role='employer', name='Employer')
+        self.java = JobPost.objects.create(title='Backend', description='JVM', employer=employer, skill_tags='Java, Spring')
+        self.javascript = JobPost.objects.create(title='Frontend', description='Web', employer=employer, skill_tags='JavaScript,React')
+        self.fullstack = JobPost.objects.create(title='Full stack', description='Both', employer=employer, skill_tags='java,react')
+
+    def titles(self, **params):
+        return {job['title'] for job in self.client.get(self.url, params).data['results']}
+
+    def test_whole_skills_only(self):
+        self.assertEqual(self.titles(skills='java'), {'Backend', 'Full stack'})
+        self.assertEqual(self.titles(skills='  JAVASCRIPT '), {'Frontend'})
+        self.assertEqual(self.titles(skills='jav'), set())
+
+    def test_match_any_and_all(self):
+        self.assertEqual(self.titles(skills='java,react'), {'Backend', 'Frontend', 'Full stack'})
+        self.assertEqual(self.titles(skills='java,react', match='any'), {'Backend', 'Frontend', 'Full stack'})
+        self.assertEqual(self.titles(skills='java,react', match='all'), {'Full stack'})
+        self.assertEqual(self.titles(skills='java,react,spring', match='all'), set())
+
+    def test_editing_tags_updates_links(self):
+        self.javascript.skill_tags = 'JavaScript, Java'
+        self.javascript.save()
+        self.assertEqual(self.titles(skills='java', match='all'), {'Backend', 'Frontend', 'Full stack'})
+        self.assertEqual(Skill.objects.filter(normalized_name='java').count(), 1)
+
+    def test_backfill_migration_links_existing_tags(self):
+        migration = importlib.import_module('jobs.migrations.0005_parse_skill_tags')
+        JobPostSkill.objects.all().delete()
+        Skill.objects.filter(normalized_name='spring').delete()
+
+        migration.parse_existing_skill_tags(apps, None)
+        migration.parse_existing_skill_tags(apps, None)  # a second run adds nothing
+        links = set(JobPostSkill.objects.values_list('job__title', 'skill__name'))
+        self.assertEqual(links, {
+            ('Backend', 'Java'), ('Backend', 'Spring'),
+            ('Frontend', 'JavaScript'), ('Frontend', 'React'),
+            ('Full stack', 'Java'), ('Full stack', 'React'),
+        })
+        self.assertEqual(JobPostSkill.objects.count(), 6)
+
+
+class JobSearchTests(APITestCase):
+    url = '/api/jobs/posts/'
+
+    def setUp(self):
+        cache.clear()
+        employer = CustomUser.objects.create_user(email='employer@example.com', role='employer', name='Employer')
+        for title, description, skill_tags in [
+            ('Python developer', 'Backend services', 'Python, Django'),
+            ('Data engineer', 'Pipelines for the data team', 'SQL'),
+            ('Engineering lead', 'Data from many teams, an engineer at heart', ''),
+            # Newest post, so it would come first if results weren't ranked
+            ('Office manager', 'Works with a Python team now and then', ''),
+        ]:
+            JobPost.objects.create(title=title, description=description, skill_tags=skill_tags, employer=employer)
+
+    def titles(self, query):
+        response = self.client.get(self.url, {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return [job['title'] for job in response.data['results']]
+
+    def test_ranked_by_relevance(self):
+        # A title hit outweighs a description hit, whatever the posting order
+        self.assertEqual(self.titles('python'), ['Python developer', 'Office manager'])
+
+    def test_words_are_anded(self):
+        self.assertEqual(self.titles('python backend'), ['Python developer'])
+
+    def test_phrase(self):
+        self.assertEqual(self.titles('"data engineer"'), ['Data engineer'])
+        self.assertCountEqual(self.titles('data engineer'), ['Data engineer', 'Engineering lead'])
+
+    def test_prefix(self):
+        self.assertCountEqual(self.titles('engin*'), ['Data engineer', 'Engineering lead'])
+        self.assertEqual(self.titles('engin'), [])
+
+    def test_fts_operators_are_plain_text(self):
+        self.assertEqual(
+            search.build_match_expression('title:python OR NEAR(data) -sql "x AND y" c++'),
+            '"title" "python" "OR" "NEAR" "data" "sql" "x AND y" "c"',
+        )
+        for query in ['python OR sql', 'title:python', 'NEAR(python backend)', 'python AND', '"unbalanced', '*', '-python']:
+            self.client.get(self.url, {'q': query})  # no FTS syntax errors
+        self.assertEqual(self.titles('python OR sql'), [])
+        self.assertEqual(self.titles('title:python'), [])
+        self.assertEqual(self.titles('*'), [])
+
+    def test_icontains_fallback(self):
+        with mock.patch.object(search, 'fts_enabled', return_value=False):
+            self.assertCountEqual(self.titles('PYTH'), ['Python developer', 'Office manager'])
+            self.assertEqual(self.titles('python backend'), ['Python developer'])
+            self.assertEqual(self.titles('django sql'), [])
+
+
+class JobListCacheTests(APITestCase):
+    url = '/api/jobs/posts/'
+
+    def setUp(self):
+        cache.clear()
+        list_cache.reset_stats()
+        self.employer = CustomUser.objects.create_user(email='employer@example.com', role='employer', name='Employer')
+        self.job = JobPost.objects.create(title='Backend developer', description='Django', employer=self.employer)
+
+    def test_anonymous_list_is_cached_until_a_job_changes(self):
+        first = self.client.get(self.url, {'job_type': '', 'q': 'backend  developer'})
+        self.assertEqual(first['X-Cache'], 'MISS')
+        # Same query with another parameter order / spacing / empty filter is the same cache entry
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url, {'q': ' backend developer'})
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.data, first.data)
+
+        self.job.title = 'Frontend developer'
+        self.job.save()
+        third = self.client.get(self.url, {'q': 'backend developer'})
+        self.assertEqual(third['X-Cache'], 'MISS')
+        self.assertEqual(third.data['count'], 0)
+        self.assertEqual(list_cache.stats()['hits'], 1)
+        self.assertEqual(list_cache.stats()['misses'], 2)
+
+    def test_lookups_do_not_write_to_the_cache(self):
+        self.client.get(self.url)
+        with mock.patch.object(list_cache.cache, 'set') as cache_set, \
+                mock.patch.object(list_cache.cache, 'incr') as cache_incr:
+            self.assertEqual(self.client.get(self.url)['X-Cache'], 'HIT')
+        cache_set.assert_not_called()
+        cache_incr.assert_not_called()
+
+    def test_employer_changes_invalidate(self):
+        self.client.get(self.url)
+        self.employer.name = 'Renamed employer'
+        self.employer.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['employer_detail']['name'], 'Renamed employer')
+
+        self.employer.save(update_fields=['last_login'])
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'HIT')
+
+    def test_admin_bulk_actions_invalidate(self):
+        self.client.get(self.url)
+        admin_model = site._registry[JobPost]
+        admin_model.mark_inactive(RequestFactory().get('/'), JobPost.objects.all())
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'], [])
+
+    def test_authenticated_requests_bypass_the_cache(self):
+        self.client.force_authenticate(self.employer)
+        response = self.client.get(self.url)
+        self.assertNotIn('X-Cache', response)
+
+    def test_file_based_backend(self):
+        with tempfile.TemporaryDirectory() as location:
+            backend = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location}}
+            with override_settings(CACHES=backend):
+                self.assertEqual(self.client.get(self.url)['X-Cache'], 'MISS')
+                self.assertEqual(self.client.get(self.url)['X-Cache'], 'HIT')
+                JobPost.objects.create(title='Data engineer', description='SQL', employer=self.employer)
+                response = self.client.get(self.url)
+                self.assertEqual(response['X-Cache'], 'MISS')
+                self.assertEqual(len(response.data['results']), 2)
+
+
+class RecommendationMatrixTests(TestCase):
+
+    def setUp(self):
+        self.employer = CustomUser.objects.create_user(email='employer@example.com', role='employer', name='Employer')
+        JobPost.objects.create(title='Backend developer', description='Django', employer=self.employer, skill_tags='Python')
+        recommendations.invalidate()
+        self.matrix = recommendations.get_matrix()
+        self.addCleanup(recommendations.invalidate)
+
+    def test_matrix_changes_wait_for_the_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            job = JobPost.objects.create(title='Data engineer', description='SQL', employer=self.employer, skill_tags='SQL')
+        self.assertNotIn(job.pk, self.matrix.slot_of)
+        for callback in callbacks:
+            callback()
+        self.assertIn(job.pk, self.matrix.slot_of)
+
+        job_id = job.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            job.delete()
+        self.assertNotIn(job_id, self.matrix.slot_of)
+
+
+class ApplicationStatusStreamTests(TestCase):
+    """Runs the SSE view through Django's ASGI test client."""
+    url = '/api/jobs/applications/stream/'
+
+    def setUp(self):
+        self.employer = CustomUser.objects.create_user(email='employer@example.com', role='employer', name='Employer')
+        self.seeker = CustomUser.objects.create_user(email='seeker@example.com', role='seeker', name='Seeker')
+        self.token = Token.objects.create(user=self.seeker)
+        job = JobPost.objects.create(title='Backend developer', description='Django', employer=self.employer)
+        self.application = Application.objects.create(user=self.seeker, job=job)
+
+    def bulk_update(self, new_status):
+        client = APIClient()
+        client.force_authenticate(self.employer)
+        with self.captureOnCommitCallbacks(execute=True):
+            client.patch('/api/jobs/applications/bulk-status/', {'status': new_status, 'ids': [self.application.pk]}, format='json')
+
+    def save_status(self, new_status):
+        application = Application.objects.get(pk=self.application.pk)
+        application.status = new_status
+        with self.captureOnCommitCallbacks(execute=True):
+            application.save()
+
+    def stream_ticket(self):
+        response = self.client.post('/api/users/stream-ticket/', headers={'Authorization': f'Token {self.token.key}'})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    async def next_event(self, stream):
+        event = await asyncio.wait_for(anext(stream), timeout=5)
+        self.assertTrue(event.startswith(b'event: status\n'), event)
+        return json.loads(event.decode().split('data: ', 1)[1])
+
+    async def test_status_changes_are_pushed(self):
+        ticket = (await sync_to_async(self.stream_ticket)())['ticket']
+        response = await self.async_client.get(self.url, {'ticket': ticket})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        await anext(stream)  # retry: preamble, sent once subscribed
+
+        await sync_to_async(self.save_status)('reviewed')
+        data = await self.next_event(stream)
+        self.assertEqual((data['id'], data['previous_status'], data['status']), (self.application.pk, 'submitted', 'reviewed'))
+
+        await sync_to_async(self.bulk_update)('shortlisted')
+        data = await self.next_event(stream)
+        self.assertEqual((data['previous_status'], data['status']), ('reviewed', 'shortlisted'))
+        await stream.aclose()
+
+    async def test_requires_a_seeker_token(self):
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+        employer_token = await Token.objects.acreate(user=self.employer)
+        response = await self.async_client.get(self.url, headers={'Authorization': f'Token {employer_token.key}'})
+        self.assertEqual(response.status_code, 403)
+        response = await self.async_client.get(self.url, headers={'Authorization': 'Token not-a-token'})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_tickets_expire_and_tokens_are_not_accepted_in_the_url(self):
+        response = await self.async_client.get(self.url, {'token': self.token.key})
+        self.assertEqual(response.status_code, 401)
+        response = await self.async_client.get(self.url, {'ticket': 'forged:ticket'})
+        self.assertEqual(response.status_code, 401)
+        ticket = (await sync_to_async(self.stream_ticket)())['ticket']
+        with override_settings(LIVE_STREAM_TICKET_MAX_AGE=-1):
+            response = await self.async_client.get(self.url, {'ticket': ticket})
+        self.assertEqual(response.status_code, 401)
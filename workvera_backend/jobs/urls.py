@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import JobPostViewSet, ApplicationViewSet
+from .streams import application_status_stream
 
 router = DefaultRouter()
 router.register(r'posts', JobPostViewSet, basename='jobpost') 
@@ -9,6 +10,8 @@ router.register(r'applications', ApplicationViewSet, basename='application')
 app_name = 'jobs'
 
 urlpatterns = [
+    # Server-Sent Events (async view, needs ASGI); before the router so "stream" isn't taken as an application id
+    path('applications/stream/', application_status_stream, name='application-stream'),
     path('', include(router.urls)),
     # path('', JobPostListCreateView.as_view(), name='jobpost-list-create'),
     # path('<int:pk>/', JobPostDetailView.as_view(), name='jobpost-detail'),
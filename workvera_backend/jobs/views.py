@@ -3,17 +3,28 @@ from rest_framework import generics, permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend 
-from rest_framework.exceptions import PermissionDenied # Make sure this is imported
+from rest_framework.exceptions import PermissionDenied, ValidationError # Make sure this is imported
+from django.db import IntegrityError, transaction
 
 from .models import JobPost, Application
-from .serializers import JobPostSerializer, ApplicationSerializer
+from .serializers import JobPostSerializer, ApplicationSerializer, BulkApplicationStatusSerializer
 from .permissions import IsEmployerOrReadOnly, IsSeekerOrReadOnly, IsOwnerOrEmployerOrReadOnly
+from .search import search_job_posts
+from .filters import JobPostFilter
+from workvera_backend import pubsub
+from . import funnel, list_cache, recommendations
+from .streams import applications_topic, status_event
 
 class JobPostViewSet(viewsets.ModelViewSet):
     """
     API endpoint for Job Posts.
-    - List jobs (GET /api/jobs/posts/) - General public list of active jobs.
+    - List jobs (GET /api/jobs/posts/) - General public list of active jobs. Anonymous responses
+      are served from a versioned cache (see jobs/list_cache.py); the X-Cache header says HIT or MISS.
+    - Search jobs (GET /api/jobs/posts/?q=python "data engineer" devel*) - Relevance-ranked
+      full-text search; the other filters (gap_friendly, job_type, ...) still apply.
+    - Filter by skills (GET /api/jobs/posts/?skills=python,django&match=all) - match is 'any' or 'all'.
     - My Posts (GET /api/jobs/posts/my-posts/) - Employer's own posts (active or inactive).
+    - Recommended (GET /api/jobs/posts/recommended/?limit=20) - Active jobs ranked for the current seeker.
     - Create job (POST /api/jobs/posts/) - Employer only.
     - Retrieve job details (GET /api/jobs/posts/<id>/).
     - Update job (PUT /api/jobs/posts/<id>/) - Employer owner only.
@@ -25,18 +36,17 @@ class JobPostViewSet(viewsets.ModelViewSet):
     # Default permission_classes, will be overridden by get_permissions for specific actions
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsEmployerOrReadOnly] 
     filter_backends = [DjangoFilterBackend] 
-    # Ensure your JobPost model has these fields for filtering
-    filterset_fields = { 
-        'title': ['icontains'],
-        'description': ['icontains'],
-        'skill_tags': ['icontains'],
-        'location': ['icontains'],
-        'job_type': ['exact', 'icontains'],
-        'gap_friendly': ['exact'],
-        'employer__name': ['icontains'], # Allows filtering by employer's name
-    }
+    # Field filters plus ?skills=python,django&match=all|any (see jobs/filters.py)
+    filterset_class = JobPostFilter
     search_fields = ['title', 'description', 'skill_tags', 'employer__name', 'location'] # For DRF's SearchFilter if you choose to add it
 
+    def get_cursor_ordering(self):
+        # Keyset for workvera_backend.pagination.KeysetPagination, backed by the (posted_at, id) index.
+        # Relevance-ranked search results can't be keyset-paginated, so they use page numbers.
+        if self.action == 'list' and self.request.query_params.get('q', '').strip():
+            return None
+        return ('-posted_at', '-id')
+
     def get_queryset(self):
         """
         Dynamically filters the queryset based on the user and action.
@@ -46,7 +56,12 @@ class JobPostViewSet(viewsets.ModelViewSet):
         if self.action == 'list':
             # For the general public job listing (GET /api/jobs/posts/), always show active jobs.
             # This is called by JobsListPage.js in React.
-            return JobPost.objects.filter(is_active=True).order_by('-posted_at')
+            queryset = JobPost.objects.select_related('employer', 'application_stats').filter(is_active=True).order_by('-posted_at')
+            query = self.request.query_params.get('q', '').strip()
+            if query:
+                # Ranked full-text search instead of icontains scans (see jobs/search.py)
+                queryset = search_job_posts(queryset, query)
+            return queryset
         
         # For 'my_posts' action, filtering is done within the action itself.
         # For 'retrieve', 'update', 'partial_update', 'destroy' actions,
@@ -56,24 +71,39 @@ class JobPostViewSet(viewsets.ModelViewSet):
         if self.action in ['retrieve', 'update', 'partial_update', 'destroy']:
             if user.is_authenticated and hasattr(user, 'role') and user.role == 'employer':
                 # An employer can see any of their own posts for detail/edit/delete
-                return JobPost.objects.filter(employer=user).order_by('-posted_at') 
+                return JobPost.objects.select_related('employer', 'application_stats').filter(employer=user).order_by('-posted_at')
             else:
                 # Others can only retrieve active posts
-                return JobPost.objects.filter(is_active=True).order_by('-posted_at')
+                return JobPost.objects.select_related('employer', 'application_stats').filter(is_active=True).order_by('-posted_at')
 
         # Default queryset for other unhandled actions, or as a base for `get_object`.
-        return JobPost.objects.all().order_by('-posted_at')
+        return JobPost.objects.select_related('employer', 'application_stats').order_by('-posted_at')
+
+    def list(self, request, *args, **kwargs):
+        key = list_cache.cache_key(request)
+        if key is None:
+            return super().list(request, *args, **kwargs)
+        data = list_cache.lookup(key)
+        if data is not None:
+            return Response(data, headers={'X-Cache': 'HIT'})
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            list_cache.store(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
 
     @action(detail=False, methods=['get'], url_path='my-posts', permission_classes=[permissions.IsAuthenticated, IsEmployerOrReadOnly])
     def my_posts(self, request):
         """
         Custom action for an employer to retrieve only their own job posts (active or inactive).
         Accessed via GET /api/jobs/posts/my-posts/
+        Each post carries its "application_counts" funnel, read from JobApplicationStats
+        in the same query instead of counting applications per job.
         """
         user = request.user
         # Permission IsEmployerOrReadOnly already ensures only authenticated employers can access.
         
-        queryset = JobPost.objects.filter(employer=user).order_by('-posted_at')
+        queryset = JobPost.objects.select_related('employer', 'application_stats').filter(employer=user).order_by('-posted_at')
         
         page = self.paginate_queryset(queryset)
         if page is not None:
@@ -83,6 +113,33 @@ class JobPostViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'], url_path='recommended', permission_classes=[permissions.IsAuthenticated])
+    def recommended(self, request):
+        """
+        Active jobs ranked for the current seeker by skill test scores, skill-tag overlap
+        and career gap vs gap_friendly (scoring lives in jobs/recommendations.py).
+        GET /api/jobs/posts/recommended/?limit=20
+        """
+        user = request.user
+        if not hasattr(user, 'role') or user.role != 'seeker':
+            return Response({'detail': 'Only job seekers get recommendations.'}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            limit = int(request.query_params.get('limit', recommendations.DEFAULT_LIMIT))
+        except ValueError:
+            return Response({'detail': 'limit must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, recommendations.MAX_LIMIT))
+
+        ranked = recommendations.recommend_for_user(user, limit=limit)
+        jobs = JobPost.objects.select_related('employer').filter(is_active=True).in_bulk([job_id for job_id, _ in ranked])
+        ranked = [(jobs[job_id], score) for job_id, score in ranked if job_id in jobs]
+
+        serializer = self.get_serializer([job for job, _ in ranked], many=True)
+        data = serializer.data
+        for item, (_, score) in zip(data, ranked):
+            item['match_score'] = round(score, 4)
+        return Response(data)
+
     def perform_create(self, serializer):
         # Permission IsEmployerOrReadOnly should handle if the user is an employer.
         # The frontend sends 'employer: user.id'.
@@ -115,52 +172,86 @@ class JobPostViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['post'], url_path='apply', permission_classes=[permissions.IsAuthenticated, IsSeekerOrReadOnly])
     def apply_to_job(self, request, pk=None):
+        """
+        Apply to a job with a single INSERT.
+        Duplicates are caught by the (user, job) unique constraint instead of a prior
+        exists() check, so concurrent requests can't slip through and end up as a 500.
+        An optional Idempotency-Key header lets clients retry safely: a retry with the
+        same key returns the original application (200) instead of an error.
+        """
         job_post = self.get_object() # Will use get_queryset, so job must be active unless current user is owner
         user = request.user
 
         if not hasattr(user, 'role') or user.role != 'seeker': # Ensure user has role attribute
             return Response({'detail': 'Only job seekers can apply.'}, status=status.HTTP_403_FORBIDDEN)
 
-        if Application.objects.filter(user=user, job=job_post).exists():
-            return Response({'detail': 'You have already applied for this job.'}, status=status.HTTP_400_BAD_REQUEST)
+        idempotency_key = request.headers.get('Idempotency-Key', '').strip() or None
+        if idempotency_key and len(idempotency_key) > 64:
+            return Response({'detail': 'Idempotency-Key must be at most 64 characters.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        application_data = {'user': user.id, 'job': job_post.id}
-        if 'cover_letter' in request.data:
-            application_data['cover_letter'] = request.data['cover_letter']
+        cover_letter = request.data.get('cover_letter')
+        application = Application(
+            user=user,
+            job=job_post,
+            cover_letter=str(cover_letter) if cover_letter is not None else None,
+            idempotency_key=idempotency_key,
+        )
+        try:
+            with transaction.atomic():
+                application.save(force_insert=True)
+        except IntegrityError:
+            return self._apply_conflict_response(request, job_post, idempotency_key)
 
-        # Pass context to serializer if it needs request
-        serializer = ApplicationSerializer(data=application_data, context={'request': request})
-        if serializer.is_valid():
-            # If 'user' and 'job' are part of serializer fields and writable, they are in validated_data
-            # Otherwise, if they are read-only in serializer, pass them in save()
-            # Assuming they are part of the serializer fields or set correctly.
-            serializer.save() 
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        serializer = ApplicationSerializer(application, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def _apply_conflict_response(self, request, job_post, idempotency_key):
+        # Only reached when the insert hit a unique constraint, so the happy path never reads.
+        if idempotency_key:
+            previous = (Application.objects.select_related('user', 'job__employer')
+                        .filter(user=request.user, idempotency_key=idempotency_key).first())
+            if previous is not None:
+                if previous.job_id != job_post.id:
+                    return Response({'detail': 'This Idempotency-Key was already used for a different job.'},
+                                    status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+                serializer = ApplicationSerializer(previous, context={'request': request})
+                return Response(serializer.data, status=status.HTTP_200_OK, headers={'Idempotent-Replayed': 'true'})
+        return Response({'detail': 'You have already applied for this job.'}, status=status.HTTP_400_BAD_REQUEST)
 
 
 class ApplicationViewSet(viewsets.ModelViewSet):
     """
     API endpoint for Applications.
-    - List applications (GET /api/jobs/applications/) - Admin/Employer (for their jobs)/Seeker (their own)
+    - List applications (GET /api/jobs/applications/?job=<id>) - Admin/Employer (for their jobs)/Seeker (their own)
     - Retrieve application (GET /api/jobs/applications/<id>/)
     - Update application status (PATCH /api/jobs/applications/<id>/update-status/) - Employer of the job
+    - Bulk update status (PATCH /api/jobs/applications/bulk-status/) - Employer, for applications to their jobs
     - Delete application (DELETE /api/jobs/applications/<id>/) - Seeker (withdraw) or Employer
     """
     serializer_class = ApplicationSerializer
     permission_classes = [permissions.IsAuthenticated] 
+    cursor_ordering = ('-applied_at', '-id')
 
     def get_queryset(self):
         user = self.request.user
         if not user.is_authenticated: # Should be caught by permission_classes, but good practice
             return Application.objects.none()
-            
+
+        # ApplicationSerializer nests user_detail and job_detail -> employer_detail/application_counts,
+        # so load all of those relations in the same query.
+        applications = Application.objects.select_related('user', 'job__employer', 'job__application_stats')
+        # ?job=<id>: one job's applications (or, for a seeker, whether they applied to it)
+        job_id = self.request.query_params.get('job')
+        if self.action == 'list' and job_id:
+            if not job_id.isdigit():
+                raise ValidationError({'job': 'Must be a job id.'})
+            applications = applications.filter(job_id=job_id)
         if hasattr(user, 'is_staff') and user.is_staff: 
-            return Application.objects.all().order_by('-applied_at')
+            return applications.order_by('-applied_at')
         if hasattr(user, 'role') and user.role == 'employer': 
-            return Application.objects.filter(job__employer=user).order_by('-applied_at')
+            return applications.filter(job__employer=user).order_by('-applied_at')
         if hasattr(user, 'role') and user.role == 'seeker': 
-            return Application.objects.filter(user=user).order_by('-applied_at')
+            return applications.filter(user=user).order_by('-applied_at')
         return Application.objects.none() 
 
     def get_permissions(self):
@@ -176,6 +267,14 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             self.permission_classes = [permissions.IsAuthenticated] # get_queryset handles filtering
         return super().get_permissions()
 
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            serializer.save()
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+
     def perform_create(self, serializer):
         # This is typically for seekers applying via the apply_to_job action.
         # If direct creation via this ViewSet is allowed, ensure user is a seeker.
@@ -183,15 +282,15 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("Only seekers can create applications directly (use apply endpoint on JobPost).")
         # If 'user' is a read_only field in serializer, pass it here.
         # Otherwise, it should be in serializer.validated_data if sent from frontend.
-        serializer.save(user=self.request.user)
+        try:
+            with transaction.atomic():
+                serializer.save(user=self.request.user)
+        except IntegrityError:
+            raise ValidationError({'detail': 'You have already applied for this job.'})
 
     @action(detail=True, methods=['patch'], url_path='update-status', permission_classes=[permissions.IsAuthenticated, IsOwnerOrEmployerOrReadOnly])
     def update_status(self, request, pk=None):
         application = self.get_object() # Ensures owner/employer can access
-        
-        # Redundant check if IsOwnerOrEmployerOrReadOnly correctly verifies job employer
-        # if request.user != application.job.employer:
-        #     return Response({'detail': 'You do not have permission to update this application status.'}, status=status.HTTP_403_FORBIDDEN)
 
         new_status = request.data.get('status')
         if not new_status:
@@ -201,8 +300,77 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         if new_status not in valid_statuses:
             return Response({'detail': f'Invalid status value. Must be one of: {", ".join(valid_statuses)}'}, status=status.HTTP_400_BAD_REQUEST)
 
-        application.status = new_status
-        application.save()
+        # The permission also lets the applicant through; they may only withdraw
+        if application.job.employer_id != request.user.pk and new_status != 'withdrawn':
+            return Response({'detail': 'Only the employer of the job can change this status; you can only withdraw.'},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        with transaction.atomic(): # the funnel counters are updated by a signal in the same transaction
+            # Re-read under a row lock, so the signal's previous status is the stored one even
+            # when another request changed it since get_object()
+            application = Application.objects.select_for_update().get(pk=application.pk)
+            application.status = new_status
+            application.save()
         serializer = self.get_serializer(application)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['patch'], url_path='bulk-status', permission_classes=[permissions.IsAuthenticated])
+    def bulk_update_status(self, request):
+        """
+        Change the status of many applications at once.
+        PATCH /api/jobs/applications/bulk-status/
+        Body: {"status": "reviewed", "ids": [1, 2, 3]}
+           or {"status": "rejected", "filter": {"job": 7, "status": "submitted"}}
+
+        Ownership is checked with one locking query over the employer's applications and the
+        change is applied with a single UPDATE (plus one counter UPDATE per affected job). Every requested id is reported as
+        "updated", "unchanged" (already had that status) or "not_found" (doesn't exist
+        or belongs to another employer's job).
+        """
+        user = request.user
+        if not hasattr(user, 'role') or user.role != 'employer':
+            return Response({'detail': 'Only employers can update application statuses.'}, status=status.HTTP_403_FORBIDDEN)
+
+        serializer = BulkApplicationStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        new_status = serializer.validated_data['status']
+        ids = serializer.validated_data.get('ids')
+        limit = BulkApplicationStatusSerializer.MAX_APPLICATIONS
+
+        owned = Application.objects.filter(job__employer=user)
+        if ids is not None:
+            owned = owned.filter(id__in=set(ids))
+        else:
+            filters = serializer.validated_data['filter']
+            if 'job' in filters:
+                owned = owned.filter(job_id=filters['job'])
+            if 'status' in filters:
+                owned = owned.filter(status=filters['status'])
+
+        with transaction.atomic():
+            # Read and update under row locks, so the funnel deltas are computed from the statuses
+            # actually replaced even when another status change runs at the same time
+            rows = list(owned.select_for_update(of=('self',)).order_by('id')
+                        .values_list('id', 'job_id', 'status', 'user_id')[:limit + 1])
+            if len(rows) > limit:
+                return Response({'detail': f'The filter matches more than {limit} applications; narrow it down.'},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+            current = {app_id: app_status for app_id, _, app_status, _ in rows}
+            changed = [row for row in rows if row[2] != new_status]
+            to_update = [app_id for app_id, _, _, _ in changed]
+            if to_update:
+                Application.objects.filter(id__in=to_update).update(status=new_status)
+                # update() skips the post_save signal, so adjust the funnel counters
+                # and notify the seekers' live streams here
+                funnel.apply_status_change([(job_id, app_status) for _, job_id, app_status, _ in changed], new_status)
+                for app_id, job_id, app_status, user_id in changed:
+                    pubsub.publish_on_commit(applications_topic(user_id), status_event(app_id, job_id, app_status, new_status))
+
+        requested = list(dict.fromkeys(ids)) if ids is not None else sorted(current)
+        return Response({
+            'status': new_status,
+            'updated': to_update,
+            'unchanged': [app_id for app_id in requested if current.get(app_id) == new_status],
+            'not_found': [app_id for app_id in requested if app_id not in current],
+        })
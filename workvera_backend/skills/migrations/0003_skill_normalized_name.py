@@ -0,0 +1,42 @@
+# Generated by Django 5.2.1 on 2026-10-17 01:31
+
+from django.db import migrations, models
+
+
+def normalize_skill_name(name):
+    # Frozen copy of skills.models.normalize_skill_name, so later edits can't change this migration
+    return ' '.join((name or '').split()).casefold()[:100]
+
+
+def fill_normalized_names(apps, schema_editor):
+    Skill = apps.get_model('skills', 'Skill')
+    SkillTest = apps.get_model('skills', 'SkillTest')
+    kept, skills, duplicates = {}, [], []
+    for skill in Skill.objects.order_by('pk'):
+        key = normalize_skill_name(skill.name)
+        if key in kept:
+            # Another spelling of an older skill ("Python" / "python"): move its tests there
+            SkillTest.objects.filter(skill_id=skill.pk).update(skill_id=kept[key])
+            duplicates.append(skill.pk)
+        else:
+            kept[key] = skill.pk
+            skill.normalized_name = key
+            skills.append(skill)
+    Skill.objects.filter(pk__in=duplicates).delete()
+    Skill.objects.bulk_update(skills, ['normalized_name'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skill',
+            name='normalized_name',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=100),
+        ),
+        migrations.RunPython(fill_normalized_names, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-17 01:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0003_skill_normalized_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='skillresult',
+            index=models.Index(fields=['-submitted_at', '-id'], name='skills_result_sub_id_idx'),
+        ),
+    ]
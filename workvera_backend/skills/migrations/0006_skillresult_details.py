@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-17 01:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0005_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skillresult',
+            name='details',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
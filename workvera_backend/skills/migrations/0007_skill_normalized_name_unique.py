@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-17 09:12
+# Separate from the data migration in 0003, so PostgreSQL doesn't alter the table in the
+# transaction that deleted the duplicate skills
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0006_skillresult_details'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='skill',
+            name='normalized_name',
+            field=models.CharField(default='', editable=False, max_length=100, unique=True),
+        ),
+    ]
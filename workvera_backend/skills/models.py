@@ -1,11 +1,30 @@
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.conf import settings 
 
+NAME_MAX_LENGTH = 100
+
+def normalize_skill_name(name):
+    # "  Machine   Learning " -> "machine learning"; used to match skills case-insensitively.
+    # Cut to the column size, since casefold() can lengthen a name ("ß" -> "ss")
+    return ' '.join((name or '').split()).casefold()[:NAME_MAX_LENGTH]
+
 # A simple Skill model that can be referenced by SkillTest and potentially by User Profile or JobPost
 class Skill(models.Model):
-    name = models.CharField(max_length=100, unique=True)
+    name = models.CharField(max_length=NAME_MAX_LENGTH, unique=True)
+    # One skill per spelling: "Python" and "python " are the same skill
+    normalized_name = models.CharField(max_length=NAME_MAX_LENGTH, unique=True, editable=False, default='')
     description = models.TextField(blank=True, null=True)
 
+    def clean(self):
+        duplicate = Skill.objects.filter(normalized_name=normalize_skill_name(self.name)).exclude(pk=self.pk).first()
+        if duplicate is not None:
+            raise ValidationError({'name': f'This is the same skill as "{duplicate.name}".'})
+
+    def save(self, *args, **kwargs):
+        self.normalized_name = normalize_skill_name(self.name)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.name
 
@@ -32,6 +51,12 @@ class SkillResult(models.Model):
     class Meta:
         unique_together = ('user', 'test') 
         ordering = ['-submitted_at']
+        indexes = [
+            # Keyset pagination (-submitted_at, -id)
+            models.Index(fields=['-submitted_at', '-id'], name='skills_result_sub_id_idx'),
+            # My results: filter(user=u).order_by('-submitted_at', '-id')
+            models.Index(fields=['user', '-submitted_at', '-id'], name='skills_result_user_sub_idx'),
+        ]
 
     def __str__(self):
         return f"Result for {self.user.email} on {self.test.title} - Score: {self.score}"
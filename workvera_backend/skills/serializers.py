@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Skill, SkillTest, SkillResult
+from .models import Skill, SkillTest, SkillResult, normalize_skill_name
 from users.serializers import CustomUserSerializer
 
 class SkillSerializer(serializers.ModelSerializer):
@@ -7,6 +7,14 @@ class SkillSerializer(serializers.ModelSerializer):
         model = Skill
         fields = ('id', 'name', 'description')
 
+    def validate_name(self, value):
+        duplicate = Skill.objects.filter(normalized_name=normalize_skill_name(value))
+        if self.instance is not None:
+            duplicate = duplicate.exclude(pk=self.instance.pk)
+        if duplicate.exists():
+            raise serializers.ValidationError('A skill with this name already exists.')
+        return value
+
 class SkillTestSerializer(serializers.ModelSerializer):
     skill_name = serializers.CharField(source='skill.name', read_only=True, allow_null=True)
 
@@ -31,7 +39,8 @@ class SkillResultSerializer(serializers.ModelSerializer):
             'score',
             'submitted_at',
         )
-        read_only_fields = ('submitted_at', 'user_detail', 'test_title', 'skill_tested')
+        # user and test come from the request and the URL (SkillTestViewSet.submit_result)
+        read_only_fields = ('user', 'test', 'submitted_at', 'user_detail', 'test_title', 'skill_tested')
 
     def validate(self, data):
         """
@@ -1,3 +1,74 @@
-from django.test import TestCase
+from itertools import count
 
-# Create your tests here.
+from rest_framework.test import APITestCase
+
+from jobs.skill_tags import get_or_create_skills, parse_skill_tags
+from users.models import CustomUser
+from workvera_backend.testing import QueryBudgetMixin
+from .models import Skill, SkillTest, SkillResult
+
+
+class SkillsQueryBudgetTests(QueryBudgetMixin, APITestCase):
+
+    def setUp(self):
+        self.sequence = count()
+        self.seeker = CustomUser.objects.create_user(email='seeker@example.com', role='seeker', name='Seeker')
+
+    def create_tests(self, n):
+        tests = []
+        for _ in range(n):
+            i = next(self.sequence)
+            skill = Skill.objects.create(name=f'Skill {i}')
+            tests.append(SkillTest.objects.create(title=f'Test {i}', description='Quiz', skill=skill))
+        return tests
+
+    def create_results(self, n, user=None):
+        for test in self.create_tests(n):
+            SkillResult.objects.create(user=user or self.seeker, test=test, score=75)
+
+    def test_skill_test_list(self):
+        self.assertConstantQueries('/api/skills/tests/', self.create_tests, max_queries=1)
+
+    def test_my_results(self):
+        self.client.force_authenticate(self.seeker)
+        self.assertConstantQueries('/api/skills/results/me/', self.create_results, max_queries=1)
+
+    def test_results_list(self):
+        self.client.force_authenticate(self.seeker)
+        self.assertConstantQueries('/api/skills/results/', self.create_results, max_queries=1)
+
+    def test_submit_with_score_only(self):
+        # The skill test page posts just {score}; the user and test come from the request
+        test = self.create_tests(1)[0]
+        self.client.force_authenticate(self.seeker)
+        response = self.client.post(f'/api/skills/tests/{test.pk}/submit/', {'score': 80}, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual((response.data['user'], response.data['test']), (self.seeker.pk, test.pk))
+        response = self.client.post(f'/api/skills/tests/{test.pk}/submit/', {'score': 90}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_my_result_for_one_test(self):
+        self.create_results(2)
+        test = SkillTest.objects.order_by('pk').first()
+        self.client.force_authenticate(self.seeker)
+        response = self.client.get('/api/skills/results/me/', {'test': test.pk})
+        self.assertEqual([row['test'] for row in response.data['results']], [test.pk])
+
+
+class SkillNameTests(APITestCase):
+
+    def test_other_spellings_are_the_same_skill(self):
+        Skill.objects.create(name='Machine Learning')
+        self.client.force_authenticate(CustomUser.objects.create_superuser(email='admin@example.com', name='Admin'))
+        response = self.client.post('/api/skills/definitions/', {'name': ' machine   learning'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('name', response.data)
+
+    def test_long_tags_match_the_skill_they_create(self):
+        name = 'ß' + 'x' * 120  # casefolds to "ss...", longer than the name itself
+        tags = parse_skill_tags(name)
+        skill_ids = get_or_create_skills(tags)
+        self.assertEqual(get_or_create_skills(parse_skill_tags(name)), skill_ids)
+        skill = Skill.objects.get(pk=skill_ids.popitem()[1])
+        self.assertEqual(len(skill.name), 100)
+        self.assertEqual(list(tags), [skill.normalized_name])
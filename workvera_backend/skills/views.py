@@ -1,5 +1,6 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from .models import Skill, SkillTest, SkillResult
 from .serializers import SkillSerializer, SkillTestSerializer, SkillResultSerializer
@@ -9,12 +10,14 @@ class SkillViewSet(viewsets.ModelViewSet):
     queryset = Skill.objects.all()
     serializer_class = SkillSerializer
     permission_classes = [permissions.IsAdminUser] 
+    cursor_ordering = ('name',)
 
 
 class SkillTestViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = SkillTest.objects.all()
+    queryset = SkillTest.objects.select_related('skill')
     serializer_class = SkillTestSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    cursor_ordering = ('id',)
 
     def get_permissions(self):
         if self.action == 'submit_result':
@@ -44,17 +47,29 @@ class SkillTestViewSet(viewsets.ReadOnlyModelViewSet):
 class SkillResultViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = SkillResultSerializer
     permission_classes = [permissions.IsAuthenticated]
+    cursor_ordering = ('-submitted_at', '-id')
 
     def get_queryset(self):
         user = self.request.user
+        # SkillResultSerializer reads user_detail, test.title and test.skill.name
+        results = SkillResult.objects.select_related('user', 'test__skill')
         if user.is_staff:
-            return SkillResult.objects.all()
-        return SkillResult.objects.filter(user=user)
+            return results
+        return results.filter(user=user)
 
     @action(detail=False, methods=['get'], url_path='me', permission_classes=[permissions.IsAuthenticated])
     def my_results(self, request):
         user = request.user
-        results = SkillResult.objects.filter(user=user).order_by('-submitted_at')
+        results = SkillResult.objects.select_related('user', 'test__skill').filter(user=user).order_by('-submitted_at')
+        test_id = request.query_params.get('test')  # ?test=<id>: the attempt at one test, if any
+        if test_id:
+            if not test_id.isdigit():
+                raise ValidationError({'test': 'Must be a skill test id.'})
+            results = results.filter(test_id=test_id)
+        page = self.paginate_queryset(results)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
         serializer = self.get_serializer(results, many=True)
         return Response(serializer.data)
 
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import CustomUser, Profile
+from .models import CustomUser, Profile, ResumeDocument
 
 class CustomUserAdmin(BaseUserAdmin):
     model = CustomUser
@@ -37,5 +37,14 @@ class ProfileAdmin(admin.ModelAdmin):
         return bool(obj.video_pitch)
     video_pitch_exists.boolean = True
 
+
+class ResumeDocumentAdmin(admin.ModelAdmin):
+    list_display = ('profile', 'status', 'resume_name', 'extracted_at')
+    list_filter = ('status',)
+    search_fields = ('profile__user__email', 'resume_name')
+    readonly_fields = ('profile', 'resume_name', 'status', 'text', 'error', 'extracted_at', 'updated_at')
+    exclude = ('skills',)
+
 admin.site.register(CustomUser, CustomUserAdmin)
 admin.site.register(Profile, ProfileAdmin)
+admin.site.register(ResumeDocument, ResumeDocumentAdmin)
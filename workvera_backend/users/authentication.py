@@ -0,0 +1,179 @@
+# users/authentication.py
+"""
+Token authentication with a cache in front of the Token + CustomUser lookup.
+
+DRF's TokenAuthentication joins authtoken_token to users_customuser on every API call.
+CachedTokenAuthentication keeps the (user, token) pair of recently seen keys in an
+in-process LRU for ``AUTH_TOKEN_CACHE_TTL`` seconds, so a request with a warm token
+runs no authentication query at all. With ``AUTH_TOKEN_CACHE_SHARED`` the pair is also
+stored in the Django cache (keyed by a hash of the token, never the token itself), so
+other workers can skip the query too.
+
+Entries are dropped (see the signals in users/models.py):
+- when a token is deleted, which is what djoser's /api/auth/token/logout/ does,
+- when a user is saved or deleted (deactivation, role changes, profile edits).
+Other processes' in-memory entries can't be reached and expire after the TTL, which
+is why the default is short.
+"""
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+KEY_PREFIX = 'users:auth_token:'
+
+
+def _ttl():
+    return getattr(settings, 'AUTH_TOKEN_CACHE_TTL', 60)
+
+
+def _shared():
+    return getattr(settings, 'AUTH_TOKEN_CACHE_SHARED', False)
+
+
+def _shared_key(key):
+    return KEY_PREFIX + hashlib.sha256(key.encode()).hexdigest()
+
+
+class TokenCache:
+    """LRU of token key -> (expires_at, user, token), with hit/miss counters."""
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.hits = self.shared_hits = self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1], entry[2]
+                del self.entries[key]
+        return None
+
+    def set(self, key, user, token, ttl):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + ttl, user, token)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, keys):
+        with self.lock:
+            for key in keys:
+                self.entries.pop(key, None)
+
+    def delete_user(self, user_id):
+        """Drop every entry of a user; returns the keys that were cached."""
+        with self.lock:
+            keys = [key for key, entry in self.entries.items() if entry[1].pk == user_id]
+            for key in keys:
+                del self.entries[key]
+        return keys
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def count(self, counter):
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.shared_hits) / lookups, 4) if lookups else None,
+                'size': len(self.entries),
+            }
+
+    def reset_stats(self):
+        with self.lock:
+            self.hits = self.shared_hits = self.misses = 0
+
+
+_token_cache = None
+_token_cache_lock = threading.Lock()
+
+
+def get_token_cache():
+    global _token_cache
+    with _token_cache_lock:
+        if _token_cache is None:
+            _token_cache = TokenCache(getattr(settings, 'AUTH_TOKEN_CACHE_SIZE', 10000))
+        return _token_cache
+
+
+def _copies(user, token):
+    user = copy.copy(user)
+    token = copy.copy(token)
+    token.user = user
+    return user, token
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Drop-in replacement for TokenAuthentication (``Authorization: Token <key>``)."""
+
+    def authenticate_credentials(self, key):
+        token_cache = get_token_cache()
+        cached = token_cache.get(key)
+        if cached is None and _shared():
+            cached = cache.get(_shared_key(key))
+            if cached is not None:
+                token_cache.count('shared_hits')
+                token_cache.set(key, *cached, _ttl())
+        if cached is not None:
+            # Each request gets its own copies: views may change request.user in place
+            return _copies(*cached)
+
+        token_cache.count('misses')
+        user, token = super().authenticate_credentials(key)  # raises for unknown keys and inactive users
+        token_cache.set(key, *_copies(user, token), _ttl())
+        if _shared():
+            cache.set(_shared_key(key), (user, token), _ttl())
+        return user, token
+
+
+def _forget(keys):
+    get_token_cache().delete(keys)
+    if _shared() and keys:
+        cache.delete_many([_shared_key(key) for key in keys])
+
+
+def invalidate_tokens(keys):
+    """Forget these token keys, now and again when the current transaction commits."""
+    keys = list(keys)
+    _forget(keys)
+    # A request that read the old row before our commit may have cached it again
+    transaction.on_commit(lambda: _forget(keys))
+
+
+def invalidate_user(user_id):
+    """Forget every cached token of a user."""
+    keys = set(get_token_cache().delete_user(user_id))
+    if _shared():
+        keys.update(Token.objects.filter(user_id=user_id).values_list('key', flat=True))
+    invalidate_tokens(keys)
+    transaction.on_commit(lambda: get_token_cache().delete_user(user_id))
+
+
+def stats():
+    return get_token_cache().stats()
+
+
+def reset_stats():
+    get_token_cache().reset_stats()
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+
+from users import resumes
+from users.models import Profile, ResumeDocument
+
+
+class Command(BaseCommand):
+    help = ("Extract resume text for candidate search: resumes never extracted or left pending "
+            "(e.g. by a restart), or all of them with --all.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Re-extract every resume.")
+        parser.add_argument('--failed', action='store_true', help="Also retry resumes whose extraction failed.")
+        parser.add_argument('--rebuild-index', action='store_true',
+                            help="Only rebuild the full-text index from the text already extracted.")
+
+    def handle(self, *args, **options):
+        if options['rebuild_index']:
+            documents = ResumeDocument.objects.filter(status='done').prefetch_related('skills').order_by('pk')
+            total = resumes.rebuild_index(documents.iterator(chunk_size=500))
+            self.stdout.write(self.style.SUCCESS(f"Indexed {total} resumes."))
+            return
+
+        profiles = Profile.objects.exclude(resume='').exclude(resume__isnull=True)
+        if not options['all']:
+            statuses = ['pending', 'failed'] if options['failed'] else ['pending']
+            profiles = profiles.filter(Q(resume_document__isnull=True) | Q(resume_document__status__in=statuses))
+        profile_ids = list(profiles.order_by('pk').values_list('pk', flat=True))
+        for profile_id in profile_ids:
+            resumes.schedule(profile_id)
+        self.stdout.write(f"Queued {len(profile_ids)} resumes, waiting for the extraction workers...")
+        resumes.wait()
+        resumes.shutdown()
+
+        counts = (ResumeDocument.objects.filter(profile_id__in=profile_ids)
+                  .values('status').annotate(n=Count('pk')).order_by('status'))
+        summary = ', '.join(f"{row['n']} {row['status']}" for row in counts) or 'nothing to do'
+        self.stdout.write(self.style.SUCCESS(f"Extracted {len(profile_ids)} resumes: {summary}."))
@@ -0,0 +1,90 @@
+import os
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from users.models import MediaBlob, MediaFile
+from users.storage import BLOB_DIR, profile_media_storage
+
+
+class Command(BaseCommand):
+    help = ("Delete content-addressed profile media blobs (users/storage.py) that no stored name "
+            "has referenced for --grace-hours, and stray files in the blob directory.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-hours', type=float, default=24,
+                            help="Keep unreferenced blobs this long (default 24), so in-flight saves can reuse them.")
+        parser.add_argument('--recount', action='store_true',
+                            help="First recompute every refcount from the stored names.")
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would be deleted.")
+
+    def handle(self, *args, **options):
+        storage = profile_media_storage()
+        dry_run = options['dry_run']
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+
+        if options['recount'] and not dry_run:
+            references = (MediaFile.objects.filter(blob=OuterRef('pk')).order_by()
+                          .values('blob').annotate(n=Count('pk')).values('n'))
+            fixed = (MediaBlob.objects.annotate(actual=Coalesce(Subquery(references), 0))
+                     .exclude(refcount=Coalesce(Subquery(references), 0)))
+            for blob in fixed.iterator():
+                MediaBlob.objects.filter(pk=blob.pk).update(
+                    refcount=blob.actual, last_released_at=blob.last_released_at or timezone.now())
+                self.stdout.write(f"refcount of {blob.sha256} was {blob.refcount}, is {blob.actual}")
+
+        # Unreferenced blobs. A blob that never had a reference has no last_released_at,
+        # so fall back to created_at (a save that was rolled back).
+        freed = removed = 0
+        candidates = MediaBlob.objects.filter(refcount__lte=0).exclude(last_released_at__gte=cutoff)
+        for blob in candidates.filter(created_at__lt=cutoff).iterator():
+            if dry_run:
+                removed += 1
+                freed += blob.size
+                continue
+            # Under the row lock that saves take (users/storage.py): a save that just reused
+            # the blob has bumped its refcount, and none can reuse it until the file is gone
+            with transaction.atomic():
+                locked = MediaBlob.objects.select_for_update().filter(pk=blob.pk, refcount__lte=0).first()
+                if locked is None:
+                    continue
+                locked.delete()
+                try:
+                    os.remove(storage.blob_path(blob.sha256))
+                except FileNotFoundError:
+                    pass
+            removed += 1
+            freed += blob.size
+
+        # Files without a row: staging leftovers and blobs whose save was rolled back
+        strays = 0
+        root = storage.path(BLOB_DIR)
+        known = None
+        oldest = time.time() - options['grace_hours'] * 3600
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                if stat.st_mtime >= oldest:
+                    continue
+                if os.path.basename(directory) != 'tmp':
+                    if known is None:
+                        known = set(MediaBlob.objects.values_list('sha256', flat=True))
+                    if filename in known or MediaBlob.objects.filter(sha256=filename).exists():
+                        continue
+                strays += 1
+                freed += stat.st_size
+                if not dry_run:
+                    os.remove(path)
+
+        verb = "Would free" if dry_run else "Freed"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {freed} bytes: {removed} unreferenced blobs, {strays} stray files."))
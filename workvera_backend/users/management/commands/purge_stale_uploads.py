@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from users import uploads
+from users.models import ChunkedUpload
+
+
+class Command(BaseCommand):
+    help = "Delete resumable profile uploads (and their partial files) that haven't received a chunk for a while."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24,
+                            help="Remove uploads idle for more than this many hours (default 24).")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        stale = ChunkedUpload.objects.filter(updated_at__lt=cutoff)
+        total = 0
+        for upload in stale.iterator():
+            uploads.abort(upload)
+            total += 1
+        self.stdout.write(self.style.SUCCESS(f"Removed {total} stale uploads."))
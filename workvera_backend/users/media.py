@@ -0,0 +1,200 @@
+# users/media.py
+"""
+Serving Profile.resume and Profile.video_pitch.
+
+    GET /api/users/media/<profile id>/<resume|video_pitch>/?exp=<unix time>&sig=<signature>
+
+ProfileSerializer renders these fields as signed URLs (``signed_url``), so they work in
+plain <a href> / <video src> tags, which can't send the Authorization header. A URL is
+valid until ``exp``; the expiry is rounded up to a whole PROFILE_MEDIA_URL_MAX_AGE
+window, so the same file gets the same URL for a while and browsers can cache it.
+Without a signature the owner and staff can still fetch the file with their token.
+
+Responses support what a video player needs to seek:
+- ``Range: bytes=...`` (one range) -> 206 Partial Content, 416 when out of bounds,
+  ``If-Range`` to fall back to the whole file when it changed,
+- ``ETag`` / ``Last-Modified`` with ``If-None-Match`` / ``If-Modified-Since`` -> 304.
+
+The body is a FileResponse over the open file, positioned at the start of the range,
+so WSGI servers with ``wsgi.file_wrapper`` (gunicorn, uWSGI) send it with sendfile()
+without copying it through Python. With PROFILE_MEDIA_ACCEL_REDIRECT set, the view only
+checks access and answers with ``X-Accel-Redirect`` so nginx sends the file (ranges and
+ETags included), e.g.
+
+    location /protected-media/ {
+        internal;
+        alias /path/to/workvera_backend/media/;
+    }
+"""
+import mimetypes
+import os
+import re
+import time
+from urllib.parse import quote, urlencode
+
+from django.conf import settings
+from django.core import signing
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseRedirect
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.crypto import constant_time_compare
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe, quote_etag
+
+FIELDS = ('resume', 'video_pitch')
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+_signer = signing.Signer(salt='users.media')
+
+
+def _max_age():
+    return getattr(settings, 'PROFILE_MEDIA_URL_MAX_AGE', 3600)
+
+
+def _signature(profile_id, field, name, expires):
+    # The file name is part of the signature, so replacing the file invalidates old URLs
+    return _signer.signature(f'{profile_id}:{field}:{name}:{expires}')
+
+
+def signed_url(request, field_file):
+    """URL of a Profile file that works without an Authorization header until it expires."""
+    profile, field = field_file.instance, field_file.field.name
+    max_age = _max_age()
+    expires = (int(time.time()) // max_age + 2) * max_age
+    url = reverse('users:profile-media', kwargs={'pk': profile.pk, 'field': field})
+    url += '?' + urlencode({'exp': expires, 'sig': _signature(profile.pk, field, field_file.name, expires)})
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def check_signature(profile, field, name, params):
+    """Expiry time of a valid signature in ``params``, else None."""
+    try:
+        expires = int(params.get('exp', ''))
+    except ValueError:
+        return None
+    if expires < time.time():
+        return None
+    if not constant_time_compare(params.get('sig', ''), _signature(profile.pk, field, name, expires)):
+        return None
+    return expires
+
+
+def parse_range(header, size):
+    """
+    (start, end) of a single ``bytes=`` range, inclusive; None to send the whole file
+    (no header, unparsable or several ranges); raises ValueError when unsatisfiable.
+    """
+    match = _RANGE_RE.match((header or '').strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:  # suffix: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start > end:
+        if last and int(last) < start:
+            return None  # invalid syntax, ignored like a missing header
+        raise ValueError
+    return start, end
+
+
+def _if_range_matches(request, etag, mtime):
+    value = request.headers.get('If-Range')
+    if value is None:
+        return True
+    if value.startswith(('"', 'W/')):
+        return value == etag  # needs a strong match
+    return parse_http_date_safe(value) == mtime
+
+
+class FileRange:
+    """
+    Read-only view of ``length`` bytes of an open file from its current position.
+    Keeps ``fileno()`` so WSGI file wrappers can sendfile() the range; the response's
+    Content-Length tells them where to stop.
+    """
+
+    def __init__(self, handle, length):
+        self.handle = handle
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.handle.read(size) if size else b''
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.handle.fileno()
+
+    def close(self):
+        self.handle.close()
+
+
+def _accel_redirect_response(field_file, prefix):
+    # Where the bytes are under MEDIA_ROOT: the blob for content-addressed names (users/storage.py)
+    stored = os.path.relpath(field_file.path, field_file.storage.location).replace(os.sep, '/')
+    content_type, _ = mimetypes.guess_type(field_file.name)
+    response = HttpResponse(content_type=content_type or 'application/octet-stream')
+    response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(stored)
+    response['Content-Disposition'] = content_disposition_header(False, os.path.basename(field_file.name))
+    return response
+
+
+def file_response(request, field_file, max_age=0):
+    """Response for a Profile file honouring Range and conditional request headers."""
+    prefix = getattr(settings, 'PROFILE_MEDIA_ACCEL_REDIRECT', None)
+    if prefix:
+        return _accel_redirect_response(field_file, prefix)
+    try:
+        path = field_file.path
+    except NotImplementedError:
+        # Remote storages (S3 & co.) serve ranges themselves
+        return HttpResponseRedirect(field_file.url)
+
+    try:
+        handle = open(path, 'rb')
+    except FileNotFoundError:
+        raise Http404("The file is missing.")
+    try:
+        stat = os.fstat(handle.fileno())
+        size, mtime = stat.st_size, int(stat.st_mtime)
+        etag = quote_etag(f'{stat.st_mtime_ns:x}-{size:x}')
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=mtime)
+        if not_modified is not None:
+            handle.close()
+            response = not_modified
+        else:
+            try:
+                byte_range = parse_range(request.headers.get('Range'), size)
+            except ValueError:
+                handle.close()
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{size}'
+                return response
+            if byte_range is not None and not _if_range_matches(request, etag, mtime):
+                byte_range = None
+
+            start, end = byte_range or (0, size - 1)
+            handle.seek(start)
+            content_type, _ = mimetypes.guess_type(field_file.name)
+            response = FileResponse(FileRange(handle, end - start + 1),
+                                    content_type=content_type or 'application/octet-stream',
+                                    status=206 if byte_range else 200)
+            response['Content-Length'] = end - start + 1
+            if byte_range:
+                response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            response['Content-Disposition'] = content_disposition_header(False, os.path.basename(field_file.name))
+    except BaseException:
+        handle.close()
+        raise
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(mtime)
+    response['Cache-Control'] = f'private, max-age={max_age}'
+    return response
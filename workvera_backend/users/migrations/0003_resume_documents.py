@@ -0,0 +1,62 @@
+# Generated by Django 5.2.1 on 2026-10-17 02:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from users import resumes
+
+
+def create_search_index(apps, schema_editor):
+    # FTS5 index of extracted resume text used by users/resumes.py (SQLite only)
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(resumes.CREATE_FTS_TABLE_SQL)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(resumes.DROP_FTS_TABLE_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0005_hot_query_indexes'),
+        ('users', '0002_chunked_uploads'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeDocument',
+            fields=[
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='resume_document', serialize=False, to='users.profile')),
+                ('resume_name', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('unsupported', 'Unsupported file type'), ('failed', 'Failed')], db_index=True, default='pending', max_length=20)),
+                ('text', models.TextField(blank=True, default='')),
+                ('error', models.CharField(blank=True, default='', max_length=500)),
+                ('extracted_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ResumeSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='users.resumedocument')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resume_links', to='skills.skill')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='resumedocument',
+            name='skills',
+            field=models.ManyToManyField(blank=True, related_name='resumes', through='users.ResumeSkill', to='skills.skill'),
+        ),
+        migrations.AddIndex(
+            model_name='resumeskill',
+            index=models.Index(fields=['skill', 'document'], name='users_resumeskill_skill_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='resumeskill',
+            constraint=models.UniqueConstraint(fields=('document', 'skill'), name='users_resumeskill_unique'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.1 on 2026-10-17 02:18
+
+import django.db.models.deletion
+import users.models
+import users.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_resume_documents'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='profile',
+            name='resume',
+            field=models.FileField(blank=True, null=True, storage=users.storage.profile_media_storage, upload_to=users.models.user_resume_path),
+        ),
+        migrations.AlterField(
+            model_name='profile',
+            name='video_pitch',
+            field=models.FileField(blank=True, null=True, storage=users.storage.profile_media_storage, upload_to=users.models.user_video_pitch_path),
+        ),
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('size', models.PositiveBigIntegerField()),
+                ('refcount', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_released_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['refcount', 'last_released_at'], name='users_mediablob_gc_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='MediaFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('blob', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='files', to='users.mediablob')),
+            ],
+        ),
+    ]
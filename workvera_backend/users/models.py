@@ -1,5 +1,9 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+import uuid
+
 from django.db import models
+
+from .storage import profile_media_storage
 from django.utils.translation import gettext_lazy as _
 
 class CustomUserManager(BaseUserManager):
@@ -59,8 +63,9 @@ def user_video_pitch_path(instance, filename):
 
 class Profile(models.Model):
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name='profile')
-    resume = models.FileField(upload_to=user_resume_path, blank=True, null=True)
-    video_pitch = models.FileField(upload_to=user_video_pitch_path, blank=True, null=True)
+    # Deduplicated by content (users/storage.py); the stored names stay user_<id>/resumes/... as before
+    resume = models.FileField(upload_to=user_resume_path, storage=profile_media_storage, blank=True, null=True)
+    video_pitch = models.FileField(upload_to=user_video_pitch_path, storage=profile_media_storage, blank=True, null=True)
     career_gap_years = models.PositiveIntegerField(default=0, help_text="Number of years of career gap, if any.")
     bio = models.TextField(blank=True, null=True)
     linkedin_url = models.URLField(blank=True, null=True)
@@ -70,6 +75,121 @@ class Profile(models.Model):
     def __str__(self):
         return f"{self.user.email}'s Profile"
 
+    FILE_FIELDS = ('resume', 'video_pitch')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored files so a save() that replaces one can queue text extraction
+        # and release the old file (see the signals below)
+        instance._loaded_files = {name: getattr(instance, name).name or ''
+                                  for name in cls.FILE_FIELDS if name in field_names}
+        return instance
+
+class ChunkedUpload(models.Model):
+    """
+    A resumable upload of a Profile file (see users/uploads.py). Chunks are appended to a
+    ``<id>.part`` file next to where the finished file will live; completing the upload
+    renames it into place and points the Profile field at it.
+    """
+    FIELD_CHOICES = (
+        ('resume', 'Resume'),
+        ('video_pitch', 'Video pitch'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='chunked_uploads')
+    field = models.CharField(max_length=20, choices=FIELD_CHOICES)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField(help_text="Total size in bytes, declared when the upload starts.")
+    sha256 = models.CharField(max_length=64, blank=True, help_text="Optional hex SHA-256 of the whole file, checked on completion.")
+    offset = models.PositiveBigIntegerField(default=0, editable=False) # bytes received so far
+    part_name = models.CharField(max_length=255, editable=False) # storage name of the partial file
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.field} upload {self.id} by {self.user.email} ({self.offset}/{self.size} bytes)"
+
+
+class MediaBlob(models.Model):
+    """
+    One stored file content, shared by every MediaFile with the same SHA-256 (users/storage.py).
+    ``refcount`` is the number of MediaFile rows using it; blobs that drop to 0 are
+    removed by ``manage.py gc_media_blobs``.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    size = models.PositiveBigIntegerField()
+    refcount = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_released_at = models.DateTimeField(null=True, blank=True) # when refcount last dropped
+
+    class Meta:
+        indexes = [
+            # gc_media_blobs: filter(refcount__lte=0, last_released_at__lt=cutoff)
+            models.Index(fields=['refcount', 'last_released_at'], name='users_mediablob_gc_idx'),
+        ]
+
+    def __str__(self):
+        return f"Blob {self.sha256[:12]} ({self.size} bytes, {self.refcount} refs)"
+
+
+class MediaFile(models.Model):
+    """A stored file name (what the FileField holds) pointing at the blob with its content."""
+    name = models.CharField(max_length=255, unique=True)
+    blob = models.ForeignKey(MediaBlob, on_delete=models.PROTECT, related_name='files')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} -> {self.blob.sha256[:12]}"
+
+
+class ResumeDocument(models.Model):
+    """
+    Text extracted from a Profile's resume in the background (see users/resumes.py),
+    with the skills.Skill names found in it. Candidate search runs on this text.
+    """
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('unsupported', 'Unsupported file type'),
+        ('failed', 'Failed'),
+    )
+
+    profile = models.OneToOneField(Profile, on_delete=models.CASCADE, primary_key=True, related_name='resume_document')
+    resume_name = models.CharField(max_length=255) # storage name of the file the text comes from
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', db_index=True)
+    text = models.TextField(blank=True, default='') # normalized plain text
+    error = models.CharField(max_length=500, blank=True, default='')
+    skills = models.ManyToManyField('skills.Skill', through='ResumeSkill', related_name='resumes', blank=True)
+    extracted_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Resume text of profile {self.profile_id} ({self.status})"
+
+
+class ResumeSkill(models.Model):
+    """Link from an extracted resume to a skills.Skill mentioned in it."""
+    document = models.ForeignKey(ResumeDocument, on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey('skills.Skill', on_delete=models.CASCADE, related_name='resume_links')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['document', 'skill'], name='users_resumeskill_unique'),
+        ]
+        # Candidate skill filters look up documents by skill
+        indexes = [
+            models.Index(fields=['skill', 'document'], name='users_resumeskill_skill_idx'),
+        ]
+
+    def __str__(self):
+        return f"Resume {self.document_id} mentions skill {self.skill_id}"
+
+
 # Signal to create/update Profile when CustomUser is created/updated
 from django.db.models.signals import post_save
 from django.dispatch import receiver
@@ -81,3 +201,66 @@ def create_or_update_user_profile(sender, instance, created, **kwargs):
     # For now, we just create on user creation.
     # instance.profile.save() 
     # This might be needed if you have logic to update profile on user save
+
+
+# Signals to drop cached token authentications (users/authentication.py)
+from django.db.models.signals import post_delete
+from rest_framework.authtoken.models import Token
+from . import authentication
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_cached_user_tokens(sender, instance, update_fields=None, **kwargs):
+    # is_active, role or any other field the views read from request.user may have changed;
+    # a login only touches last_login, which nothing reads from request.user
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    authentication.invalidate_user(instance.pk)
+
+@receiver(post_delete, sender=Token)
+def invalidate_cached_token(sender, instance, **kwargs):
+    # djoser's token/logout/ deletes the user's token
+    authentication.invalidate_tokens([instance.key])
+
+
+# Signals to queue resume text extraction for candidate search (users/resumes.py)
+from . import resumes
+
+@receiver(post_save, sender=Profile)
+def queue_resume_extraction(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    name = instance.resume.name or ''
+    # Other profile edits keep the resume (and its extracted text) as it is
+    if name == getattr(instance, '_loaded_files', {}).get('resume') or (created and not name):
+        return
+    resumes.schedule_on_commit(instance.pk)
+
+@receiver(post_delete, sender=Profile)
+def remove_resume_from_search(sender, instance, **kwargs):
+    resumes.remove_document(instance.pk)
+
+
+# Signals to release replaced or deleted profile files (a blob is freed when its last name goes)
+from django.db import transaction
+
+def _release_files_on_commit(names):
+    storage = profile_media_storage()
+    transaction.on_commit(lambda: [storage.delete(name) for name in names])
+
+@receiver(post_save, sender=Profile)
+def release_replaced_profile_files(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    loaded = getattr(instance, '_loaded_files', {})
+    current = {name: getattr(instance, name).name or '' for name in Profile.FILE_FIELDS}
+    replaced = [old for field, old in loaded.items() if old and old != current[field]]
+    if replaced:
+        _release_files_on_commit(replaced)
+    instance._loaded_files = current
+
+@receiver(post_delete, sender=Profile)
+def release_deleted_profile_files(sender, instance, **kwargs):
+    names = [getattr(instance, name).name for name in Profile.FILE_FIELDS if getattr(instance, name)]
+    if names:
+        _release_files_on_commit(names)
@@ -0,0 +1,10 @@
+from rest_framework import permissions
+
+class IsEmployerOrStaff(permissions.BasePermission):
+    """
+    Custom permission for employer-facing candidate endpoints.
+    Only employers and staff users are allowed.
+    """
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated and (user.role == 'employer' or user.is_staff))
@@ -0,0 +1,194 @@
+# users/resume_text.py
+"""
+Plain-text extraction from resume files (PDF, DOCX, TXT).
+
+Runs inside the resume extraction worker processes (see users/resumes.py), so this
+module only uses the standard library and never touches Django or the database:
+``extract(path)`` takes a local file path and returns a picklable dict.
+
+Compressed parts (the DOCX body, PDF content streams) are inflated up to ``max_bytes``
+in total, so a small zip bomb can't exhaust the worker's memory.
+
+PDFs are read with pypdf when it is installed (``pip install pypdf``). Without it a
+small built-in reader pulls the text operators out of the page content streams, which
+works for most generated resumes (Word, Google Docs, LaTeX) but not for fonts with
+custom encodings or scanned pages.
+"""
+import os
+import re
+import unicodedata
+import zipfile
+import zlib
+from xml.etree import ElementTree
+
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
+
+DEFAULT_MAX_CHARS = 200_000
+# Most uncompressed data read from one resume, as a multiple of the largest accepted file;
+# users/resumes.py passes INFLATE_RATIO * CHUNKED_UPLOAD_MAX_SIZES['resume']
+INFLATE_RATIO = 5
+DEFAULT_MAX_BYTES = INFLATE_RATIO * 10 * 1024 * 1024
+
+_WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0b-\x1f\x7f-\x9f\u200b-\u200f\ufeff]')
+_SPACES_RE = re.compile(r'[^\S\n]+')
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+
+def normalize_text(text, max_chars=DEFAULT_MAX_CHARS):
+    """NFKC, no control characters, single spaces, at most one blank line in a row."""
+    text = unicodedata.normalize('NFKC', text).replace('\r\n', '\n').replace('\r', '\n')
+    text = _CONTROL_CHARS_RE.sub(' ', text.replace('\t', ' '))
+    lines = (_SPACES_RE.sub(' ', line).strip() for line in text.split('\n'))
+    text = _BLANK_LINES_RE.sub('\n\n', '\n'.join(lines)).strip()
+    return text[:max_chars]
+
+
+def txt_text(path, max_bytes=DEFAULT_MAX_BYTES):
+    with open(path, 'rb') as handle:
+        data = handle.read(max_bytes)
+    try:
+        return data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return data.decode('cp1252', errors='replace')
+
+
+def docx_text(path, max_bytes=DEFAULT_MAX_BYTES):
+    with zipfile.ZipFile(path) as archive:
+        info = archive.getinfo('word/document.xml')
+        if info.file_size > max_bytes:
+            raise ValueError("word/document.xml is too large")
+        with archive.open(info) as document:
+            parts = []
+            for event, element in ElementTree.iterparse(document, events=('end',)):
+                tag = element.tag
+                if tag == f'{_WORD_NS}t' and element.text:
+                    parts.append(element.text)
+                elif tag == f'{_WORD_NS}tab':
+                    parts.append(' ')
+                elif tag in (f'{_WORD_NS}br', f'{_WORD_NS}cr', f'{_WORD_NS}p'):
+                    parts.append('\n')
+                if tag == f'{_WORD_NS}p':
+                    element.clear()  # keep memory flat on long documents
+    return ''.join(parts)
+
+
+# Built-in PDF reader: strings shown by Tj / TJ / ' / " inside BT ... ET blocks
+_PDF_STREAM_RE = re.compile(rb'stream\r?\n(.*?)\r?\n?endstream', re.S)
+_PDF_TOKEN_RE = re.compile(rb'\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>|\[|\]|BT|ET|T\*|Td|TD|Tj|TJ|\'|"|-?\d*\.?\d+')
+# A TJ offset this negative (thousandths of an em) is a word gap rather than kerning
+_PDF_WORD_GAP = -200
+_PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f'}
+_PDF_ESCAPE_RE = re.compile(rb'\\([0-7]{1,3}|\r\n|.)', re.S)
+
+
+def _pdf_string(token):
+    if token.startswith(b'<'):
+        digits = re.sub(rb'\s', b'', token[1:-1])
+        return bytes.fromhex((digits + b'0' * (len(digits) % 2)).decode())
+
+    def unescape(match):
+        value = match.group(1)
+        if value[:1].isdigit():
+            return bytes([int(value, 8) & 0xFF])
+        if value in (b'\n', b'\r\n'):
+            return b''  # line continuation
+        return _PDF_ESCAPES.get(value, value)
+    return _PDF_ESCAPE_RE.sub(unescape, token[1:-1])
+
+
+def _decode_pdf_bytes(data):
+    if data.startswith(b'\xfe\xff'):
+        return data[2:].decode('utf-16-be', errors='replace')
+    return data.decode('latin-1')
+
+
+def _content_stream_text(content):
+    lines, line = [], []
+    in_text = in_array = False
+    pending = []
+    for token in _PDF_TOKEN_RE.findall(content):
+        if token == b'BT':
+            in_text = True
+        elif token == b'ET':
+            in_text = False
+            lines.append(''.join(line))
+            line = []
+        elif not in_text:
+            continue
+        elif token == b'[':
+            in_array = True
+            pending = []
+        elif token == b']':
+            in_array = False
+        elif token[:1] in (b'(', b'<'):
+            pending.append(_decode_pdf_bytes(_pdf_string(token)))
+        elif token in (b'Tj', b'TJ', b"'", b'"'):
+            if token in (b"'", b'"'):
+                lines.append(''.join(line))
+                line = []
+            line.append(''.join(pending))
+            pending = []
+        elif token[:1] in b'-.0123456789':
+            if in_array and float(token) < _PDF_WORD_GAP:
+                pending.append(' ')
+        elif token in (b'Td', b'TD', b'T*') and not in_array:
+            if line:
+                line.append(' ')
+    return '\n'.join(lines)
+
+
+def _builtin_pdf_text(path, max_bytes=DEFAULT_MAX_BYTES):
+    with open(path, 'rb') as handle:
+        data = handle.read()
+    texts = []
+    budget = max_bytes  # shared by all the streams of the file
+    for match in _PDF_STREAM_RE.finditer(data):
+        stream = match.group(1)
+        inflater = zlib.decompressobj()
+        try:
+            inflated = inflater.decompress(stream, budget)
+        except zlib.error:
+            inflated = stream  # uncompressed (or a filter we can't read; it then yields no text operators)
+        else:
+            budget -= len(inflated)
+            if inflater.unconsumed_tail or budget <= 0:
+                break  # inflates past the budget (zip bomb): give up on this stream and the ones after it
+        stream = inflated
+        if b'BT' in stream:
+            texts.append(_content_stream_text(stream))
+    return '\n'.join(texts)
+
+
+def pdf_text(path, max_bytes=DEFAULT_MAX_BYTES):
+    if pypdf is None:
+        return _builtin_pdf_text(path, max_bytes)
+    reader = pypdf.PdfReader(path)
+    return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+
+EXTRACTORS = {
+    '.pdf': pdf_text,
+    '.docx': docx_text,
+    '.txt': txt_text,
+}
+
+
+def extract(path, max_chars=DEFAULT_MAX_CHARS, filename=None, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    {'status': 'done' | 'unsupported' | 'failed', 'text': normalized text, 'error': message}
+    The type comes from the extension of ``filename`` (default: the path), since
+    content-addressed files have none on disk. Never raises for bad files: the error is
+    part of the result.
+    """
+    extractor = EXTRACTORS.get(os.path.splitext(filename or path)[1].lower())
+    if extractor is None:
+        return {'status': 'unsupported', 'text': '', 'error': "Only PDF, DOCX and TXT resumes are indexed."}
+    try:
+        text = normalize_text(extractor(path, max_bytes), max_chars)
+    except Exception as exc:
+        return {'status': 'failed', 'text': '', 'error': f"{type(exc).__name__}: {exc}"[:500]}
+    return {'status': 'done', 'text': text, 'error': ''}
@@ -0,0 +1,300 @@
+# users/resumes.py
+"""
+Background resume text extraction and the candidate search index.
+
+When a Profile is saved with a new resume (see the signals in users/models.py) or a
+chunked resume upload completes (users/uploads.py), ``schedule_on_commit`` queues the
+profile once the transaction commits. ``schedule`` marks its ResumeDocument as pending
+and submits the file to a local ProcessPoolExecutor (RESUME_EXTRACTION_WORKERS
+processes), where users/resume_text.py parses the PDF / DOCX / TXT. Parsing never runs
+on the request thread and a slow or broken file can't stall a web worker.
+
+The result comes back to a callback thread of this process, which stores the text,
+links the skills.Skill names found in it (ResumeSkill) and updates the FTS5 index
+``users_resume_fts`` (rowid = profile id). A result for a resume that has been
+replaced in the meantime is thrown away.
+
+Extractions in flight are lost when the process exits; their documents stay
+``pending`` and ``manage.py extract_resumes`` picks them up again.
+
+Search (``search_candidates``) uses the same ``?q=`` syntax as job search
+(jobs/search.py), ranked by bm25 with skill hits weighted above body text.
+"""
+import multiprocessing
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait as wait_futures
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from jobs.search import build_match_expression
+from skills.models import Skill, normalize_skill_name
+from . import resume_text
+
+FTS_TABLE = 'users_resume_fts'
+
+# Columns of the FTS table, in order, with their bm25 weights
+INDEXED_FIELDS = (
+    ('text', 1.0),
+    ('skills', 5.0),
+)
+
+CREATE_FTS_TABLE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    + ', '.join(name for name, _ in INDEXED_FIELDS)
+    + ", tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+DROP_FTS_TABLE_SQL = f"DROP TABLE IF EXISTS {FTS_TABLE}"
+
+# Skill names are matched as runs of up to this many words ("machine learning")
+MAX_SKILL_WORDS = 4
+_SKILL_TOKEN_RE = re.compile(r'\w[\w+#.\-]*')
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+_executor = None
+_executor_lock = threading.Lock()
+_futures = set()
+
+
+def fts_enabled():
+    return connection.vendor == 'sqlite'
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: worker processes start clean instead of forking a threaded web server
+            _executor = ProcessPoolExecutor(
+                max_workers=getattr(settings, 'RESUME_EXTRACTION_WORKERS', 2),
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _executor
+
+
+def _reset_executor(broken):
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            _executor = None
+
+
+def shutdown(wait=True):
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+def wait(timeout=None):
+    """Block until the extractions queued so far are stored (for commands and tests)."""
+    while True:
+        with _executor_lock:
+            pending = set(_futures)
+        if not pending:
+            return True
+        done, not_done = wait_futures(pending, timeout=timeout)
+        if not_done:
+            return False
+
+
+def index_document(profile_id, text, skill_names):
+    if not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [profile_id])
+        cursor.execute(f"INSERT INTO {FTS_TABLE} (rowid, text, skills) VALUES (%s, %s, %s)",
+                       [profile_id, text, ' '.join(skill_names)])
+
+
+def remove_document(profile_id):
+    if not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [profile_id])
+
+
+def rebuild_index(documents, batch_size=500):
+    """Rebuild the whole index from extracted ResumeDocuments (with their skills prefetched)."""
+    if not fts_enabled():
+        return 0
+    insert_sql = f"INSERT INTO {FTS_TABLE} (rowid, text, skills) VALUES (%s, %s, %s)"
+    total = 0
+    batch = []
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        for document in documents:
+            batch.append([document.profile_id, document.text,
+                          ' '.join(skill.name for skill in document.skills.all())])
+            if len(batch) >= batch_size:
+                cursor.executemany(insert_sql, batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(insert_sql, batch)
+            total += len(batch)
+    return total
+
+
+def match_skills(text):
+    """Ids of the skills.Skill rows whose name appears in ``text`` (case-insensitive, whole words)."""
+    skill_ids = dict(Skill.objects.values_list('normalized_name', 'pk'))
+    if not skill_ids:
+        return set()
+    longest = min(MAX_SKILL_WORDS, max(len(key.split()) for key in skill_ids))
+    tokens = [token.rstrip('.-') for token in _SKILL_TOKEN_RE.findall(text.casefold())]
+    found = set()
+    for i in range(len(tokens)):
+        for n in range(1, min(longest, len(tokens) - i) + 1):
+            skill_id = skill_ids.get(' '.join(tokens[i:i + n]))
+            if skill_id is not None:
+                found.add(skill_id)
+    return found
+
+
+def _sync_skills(document, skill_ids):
+    from .models import ResumeSkill
+
+    current = set(ResumeSkill.objects.filter(document=document).values_list('skill_id', flat=True))
+    if current - skill_ids:
+        ResumeSkill.objects.filter(document=document, skill_id__in=current - skill_ids).delete()
+    if skill_ids - current:
+        ResumeSkill.objects.bulk_create(
+            [ResumeSkill(document=document, skill_id=skill_id) for skill_id in skill_ids - current],
+            ignore_conflicts=True,
+        )
+
+
+def store_result(profile_id, resume_name, result):
+    """Save an extraction result; False if the profile's resume has changed since it was queued."""
+    from .models import ResumeDocument
+
+    with transaction.atomic():
+        document = (ResumeDocument.objects.select_for_update()
+                    .filter(profile_id=profile_id, resume_name=resume_name).first())
+        if document is None:
+            return False
+        document.status = result['status']
+        document.text = result['text']
+        document.error = result['error']
+        document.extracted_at = timezone.now()
+        document.save(update_fields=['status', 'text', 'error', 'extracted_at', 'updated_at'])
+
+        skill_ids = match_skills(document.text) if document.text else set()
+        _sync_skills(document, skill_ids)
+        if document.status == 'done':
+            names = Skill.objects.filter(pk__in=skill_ids).order_by('name').values_list('name', flat=True)
+            index_document(profile_id, document.text, names)
+        else:
+            remove_document(profile_id)
+    return True
+
+
+def _extraction_finished(executor, profile_id, resume_name, future):
+    # Runs on the executor's result thread, which gets its own database connection
+    try:
+        try:
+            result = future.result()
+        except BrokenProcessPool as exc:
+            _reset_executor(executor)
+            result = {'status': 'failed', 'text': '', 'error': f"Extraction worker died: {exc}"[:500]}
+        except Exception as exc:
+            result = {'status': 'failed', 'text': '', 'error': f"{type(exc).__name__}: {exc}"[:500]}
+        store_result(profile_id, resume_name, result)
+    finally:
+        close_old_connections()
+        with _executor_lock:
+            _futures.discard(future)
+
+
+def schedule(profile_id):
+    """Queue text extraction for the profile's current resume (or drop its text if it has none)."""
+    from .models import Profile, ResumeDocument
+
+    profile = Profile.objects.filter(pk=profile_id).only('pk', 'user_id', 'resume').first()
+    if profile is None:
+        return None
+    if not profile.resume:
+        ResumeDocument.objects.filter(profile_id=profile_id).delete()
+        remove_document(profile_id)
+        return None
+
+    document, _ = ResumeDocument.objects.update_or_create(
+        profile_id=profile_id,
+        defaults={'resume_name': profile.resume.name, 'status': 'pending', 'error': '', 'extracted_at': None},
+    )
+    try:
+        path = profile.resume.path
+    except NotImplementedError:
+        store_result(profile_id, profile.resume.name,
+                     {'status': 'failed', 'text': '', 'error': "Resume storage has no local files."})
+        return None
+
+    executor = get_executor()
+    max_chars = getattr(settings, 'RESUME_TEXT_MAX_CHARS', resume_text.DEFAULT_MAX_CHARS)
+    from .uploads import max_size  # uploads imports this module
+    max_bytes = resume_text.INFLATE_RATIO * max_size('resume')
+    try:
+        future = executor.submit(resume_text.extract, path, max_chars, profile.resume.name, max_bytes)
+    except BrokenProcessPool:
+        _reset_executor(executor)
+        executor = get_executor()
+        future = executor.submit(resume_text.extract, path, max_chars, profile.resume.name, max_bytes)
+    with _executor_lock:
+        _futures.add(future)
+    future.add_done_callback(partial(_extraction_finished, executor, profile_id, document.resume_name))
+    return future
+
+
+def schedule_on_commit(profile_id):
+    transaction.on_commit(lambda: schedule(profile_id))
+
+
+def filter_by_skills(queryset, names, match='any'):
+    """Restrict a Profile queryset to resumes mentioning the given skills (any or all of them)."""
+    from .models import ResumeSkill
+
+    keys = {normalize_skill_name(name) for name in names} - {''}
+    if not keys:
+        return queryset
+    links = ResumeSkill.objects.filter(skill__normalized_name__in=keys)
+    if match == 'all':
+        links = (links.values('document_id')
+                 .annotate(matched=Count('skill_id', distinct=True))
+                 .filter(matched=len(keys)))
+    return queryset.filter(pk__in=links.values('document_id'))
+
+
+def search_candidates(queryset, raw_query):
+    """
+    Restrict a Profile queryset to resumes matching ``raw_query``, most relevant first.
+    Rows get ``search_rank`` (bm25, lower is better) and ``search_snippet`` (matches in [brackets]).
+    """
+    expression = build_match_expression(raw_query)
+    if not expression:
+        return queryset.none()
+
+    if not fts_enabled():
+        condition = Q()
+        for term in _WORD_RE.findall(raw_query):
+            condition &= Q(resume_document__text__icontains=term)
+        return queryset.filter(condition)
+
+    weights = ', '.join(str(weight) for _, weight in INDEXED_FIELDS)
+    profile_table = queryset.model._meta.db_table
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[f'{FTS_TABLE}.rowid = {profile_table}.id', f'{FTS_TABLE} MATCH %s'],
+        params=[expression],
+        select={
+            'search_rank': f'bm25({FTS_TABLE}, {weights})',
+            'search_snippet': f"snippet({FTS_TABLE}, 0, '[', ']', '...', 16)",
+        },
+        order_by=['search_rank', '-id'],
+    )
@@ -1,6 +1,9 @@
+import re
+
 from rest_framework import serializers
 from djoser.serializers import UserCreateSerializer as BaseUserCreateSerializer
-from .models import CustomUser, Profile
+from .models import ChunkedUpload, CustomUser, Profile
+from . import media, uploads
 
 class CustomUserCreateSerializer(BaseUserCreateSerializer):
     # Djoser's UserCreateSerializer already handles password confirmation.
@@ -16,7 +19,18 @@ class CustomUserSerializer(serializers.ModelSerializer):
         read_only_fields = ('is_staff',)
 
 
+class ProfileMediaField(serializers.FileField):
+    """Upload like a FileField; read back as a signed URL of the media view (users/media.py)."""
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        return media.signed_url(self.context.get('request'), value)
+
+
 class ProfileSerializer(serializers.ModelSerializer):
+    resume = ProfileMediaField(required=False, allow_null=True)
+    video_pitch = ProfileMediaField(required=False, allow_null=True)
     user_email = serializers.EmailField(source='user.email', read_only=True)
     user_name = serializers.CharField(source='user.name', read_only=True)
 
@@ -45,4 +59,58 @@ class ProfileSerializer(serializers.ModelSerializer):
 
     def validate_video_pitch(self, value):
         # Add validation for video file type, size, etc. if needed
-        return value
\ No newline at end of file
+        return value
+
+
+class ChunkedUploadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ChunkedUpload
+        fields = ('id', 'field', 'filename', 'size', 'sha256', 'offset', 'created_at', 'updated_at')
+        read_only_fields = ('offset', 'created_at', 'updated_at')
+
+    def validate_sha256(self, value):
+        if value and not re.fullmatch(r'[0-9a-fA-F]{64}', value):
+            raise serializers.ValidationError("Must be a hex SHA-256 digest.")
+        return value
+
+    def validate(self, data):
+        limit = uploads.max_size(data['field'])
+        if data['size'] > limit:
+            raise serializers.ValidationError({'size': f"Must be at most {limit} bytes for {data['field']}."})
+        if data['size'] == 0:
+            raise serializers.ValidationError({'size': "Empty files can't be uploaded."})
+        return data
+
+
+class CandidateSerializer(serializers.ModelSerializer):
+    """A seeker profile in employer candidate search, with what was found in the resume."""
+    user_name = serializers.CharField(source='user.name', read_only=True)
+    resume = ProfileMediaField(read_only=True)
+    resume_skills = serializers.SerializerMethodField()
+    snippet = serializers.SerializerMethodField()
+    resume_indexed_at = serializers.DateTimeField(source='resume_document.extracted_at', read_only=True)
+
+    class Meta:
+        model = Profile
+        fields = (
+            'id',
+            'user',
+            'user_name',
+            'bio',
+            'career_gap_years',
+            'linkedin_url',
+            'github_url',
+            'resume',
+            'resume_skills',
+            'snippet',
+            'resume_indexed_at',
+        )
+        read_only_fields = fields
+
+    def get_resume_skills(self, obj):
+        # Prefetched by CandidateSearchAPIView
+        return sorted(skill.name for skill in obj.resume_document.skills.all())
+
+    def get_snippet(self, obj):
+        # Set by users.resumes.search_candidates for ?q= searches
+        return getattr(obj, 'search_snippet', None)
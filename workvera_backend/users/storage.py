@@ -0,0 +1,245 @@
+# users/storage.py
+"""
+Content-addressed storage for Profile.resume and Profile.video_pitch.
+
+The FileFields keep their usual names (``user_<id>/resumes/cv.pdf``), so the API,
+ProfileSerializer and the media view don't change. Behind a name, the bytes live once
+per distinct content under ``MEDIA_ROOT/blobs/<aa>/<bb>/<sha256>``:
+
+- ``MediaBlob`` is one stored content with a reference count,
+- ``MediaFile`` maps a stored name to its blob.
+
+Saving a file whose SHA-256 is already known writes nothing: it only adds a MediaFile
+row and bumps the blob's refcount. The digest comes from the upload handlers below,
+which hash every chunk as the request body streams in, so usually no extra pass over
+the file is needed either. New content from a temporary upload file is moved into
+place (a rename, not a copy).
+
+Deleting a name drops its MediaFile and decrements the refcount; the bytes are
+removed later by ``manage.py gc_media_blobs`` once a blob has had no references for a
+grace period. A save takes the blob row lock (select_for_update) before checking for
+the file and bumping the refcount, and the GC removes a file only while holding the
+same lock, so a save never ends up referencing a collected blob.
+
+``path()`` and ``exists()`` remember which blob a name points to for
+PROFILE_MEDIA_LOOKUP_TTL seconds, so serving a file doesn't query MediaFile every time.
+
+Names without a MediaFile row (files saved before this storage was used, and the
+``.part`` files of resumable uploads, see users/uploads.py) are plain files at their
+name, as with FileSystemStorage.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage, storages
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+BLOB_DIR = 'blobs'
+COPY_BLOCK = 64 * 1024
+LOOKUP_CACHE_SIZE = 10000
+
+
+def _lookup_ttl():
+    return getattr(settings, 'PROFILE_MEDIA_LOOKUP_TTL', 60)
+
+
+def profile_media_storage():
+    # Callable for FileField(storage=...), so migrations don't depend on the STORAGES setting
+    return storages['profile_media']
+
+
+def blob_name(digest):
+    return f'{BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}'
+
+
+class Sha256MemoryFileUploadHandler(MemoryFileUploadHandler):
+    """MemoryFileUploadHandler that also records the SHA-256 of the file as it arrives."""
+
+    def new_file(self, *args, **kwargs):
+        self.sha256 = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.activated:
+            self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        if uploaded is not None:
+            uploaded.sha256 = self.sha256.hexdigest()
+        return uploaded
+
+
+class Sha256TemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """TemporaryFileUploadHandler that also records the SHA-256 of the file as it arrives."""
+
+    def new_file(self, *args, **kwargs):
+        self.sha256 = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        uploaded.sha256 = self.sha256.hexdigest()
+        return uploaded
+
+
+def _hash_content(content):
+    checksum = hashlib.sha256()
+    size = 0
+    for chunk in content.chunks(COPY_BLOCK):
+        checksum.update(chunk)
+        size += len(chunk)
+    return checksum.hexdigest(), size
+
+
+class ContentAddressedStorage(FileSystemStorage):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # name -> (expires, sha256) of names known to have a MediaFile; a missing name is
+        # never cached, since another process may save it at any time
+        self._digests = OrderedDict()
+        self._digests_lock = threading.Lock()
+
+    def _remember(self, name, digest):
+        with self._digests_lock:
+            self._digests[name] = (time.monotonic() + _lookup_ttl(), digest)
+            self._digests.move_to_end(name)
+            while len(self._digests) > LOOKUP_CACHE_SIZE:
+                self._digests.popitem(last=False)
+
+    def _forget(self, name):
+        with self._digests_lock:
+            self._digests.pop(name, None)
+
+    def _clear_cached_properties(self, setting, **kwargs):
+        super()._clear_cached_properties(setting, **kwargs)
+        if setting == 'MEDIA_ROOT':  # another media tree, another set of names
+            with self._digests_lock:
+                self._digests.clear()
+
+    def _digest(self, name):
+        """SHA-256 of the blob behind ``name``, or None for a plain file."""
+        from .models import MediaFile
+
+        with self._digests_lock:
+            entry = self._digests.get(name)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+        digest = MediaFile.objects.filter(name=name).values_list('blob__sha256', flat=True).first()
+        if digest is None:
+            self._forget(name)
+        else:
+            self._remember(name, digest)
+        return digest
+
+    def blob_path(self, digest):
+        return super().path(blob_name(digest))
+
+    def path(self, name):
+        digest = self._digest(name)
+        if digest is not None:
+            return self.blob_path(digest)
+        return super().path(name)
+
+    def exists(self, name):
+        return self._digest(name) is not None or os.path.lexists(super().path(name))
+
+    def _stage(self, content, digest=None):
+        """
+        Copy or move ``content`` into the blob staging directory; returns (path, digest, size).
+        A temporary upload file is moved (a rename on the same filesystem; its ``digest``
+        must be known), anything else is copied and hashed on the way.
+        """
+        tmp_dir = super().path(os.path.join(BLOB_DIR, 'tmp'))
+        os.makedirs(tmp_dir, exist_ok=True)
+        if digest is not None and hasattr(content, 'temporary_file_path'):
+            fd, staged = tempfile.mkstemp(dir=tmp_dir)
+            os.close(fd)
+            file_move_safe(content.temporary_file_path(), staged, allow_overwrite=True)
+            return staged, digest, os.path.getsize(staged)
+        checksum = hashlib.sha256()
+        size = 0
+        with tempfile.NamedTemporaryFile(dir=tmp_dir, delete=False) as handle:
+            for chunk in content.chunks(COPY_BLOCK):
+                handle.write(chunk)
+                checksum.update(chunk)
+                size += len(chunk)
+        return handle.name, checksum.hexdigest(), size
+
+    def _publish(self, staged, digest):
+        path = self.blob_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if self.file_permissions_mode is not None:
+            os.chmod(staged, self.file_permissions_mode)
+        os.replace(staged, path)  # atomic; a concurrent writer of the same content wrote the same bytes
+
+    def _save(self, name, content):
+        from .models import MediaBlob, MediaFile
+
+        # Known digest or re-readable content: hash now and only store the bytes if they're new.
+        # A stream that can be read once is staged first, which also gives its digest.
+        digest, size, staged = getattr(content, 'sha256', None), content.size, None
+        if digest is None:
+            if hasattr(content, 'temporary_file_path') or hasattr(content, 'seek'):
+                digest, size = _hash_content(content)
+            else:
+                staged, digest, size = self._stage(content)
+        try:
+            while True:
+                try:
+                    with transaction.atomic():
+                        # The row lock keeps gc_media_blobs from removing the file until we commit
+                        blob = MediaBlob.objects.select_for_update().filter(sha256=digest).first()
+                        if blob is None:
+                            blob = MediaBlob.objects.create(sha256=digest, size=size)
+                        if os.path.exists(self.blob_path(digest)):
+                            os.utime(self.blob_path(digest))  # reused: not a stray for gc_media_blobs
+                        else:
+                            if staged is None:
+                                # content hasn't been consumed: it is only moved or read here
+                                staged, _, _ = self._stage(content, digest)
+                            self._publish(staged, digest)
+                            staged = None
+                        MediaBlob.objects.filter(pk=blob.pk).update(refcount=F('refcount') + 1)
+                        MediaFile.objects.create(name=name, blob=blob)
+                except IntegrityError:
+                    if self.exists(name):
+                        name = self.get_available_name(name)  # another save took the name meanwhile
+                    elif not MediaBlob.objects.filter(sha256=digest).exists():
+                        raise
+                    # else another save created the blob row first; lock that one
+                else:
+                    break
+        finally:
+            if staged is not None:
+                os.remove(staged)  # the blob store already had this content
+        transaction.on_commit(lambda: self._remember(name, digest))
+        return name
+
+    def delete(self, name):
+        from .models import MediaBlob, MediaFile
+
+        with transaction.atomic():
+            media_file = MediaFile.objects.select_for_update().filter(name=name).first()
+            if media_file is None:
+                return super().delete(name)
+            media_file.delete()
+            self._forget(name)
+            MediaBlob.objects.filter(pk=media_file.blob_id).update(
+                refcount=F('refcount') - 1, last_released_at=timezone.now())
@@ -1,3 +1,398 @@
-from django.test import TestCase
+import hashlib
+import os
+import shutil
+import tempfile
+import zipfile
+import zlib
+from io import StringIO
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from skills.models import Skill
+from . import authentication, resume_text, resumes, uploads
+from .models import ChunkedUpload, CustomUser, MediaBlob, MediaFile, Profile, ResumeDocument
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+
+    me_url = '/api/auth/users/me/'
+
+    def setUp(self):
+        authentication.get_token_cache().clear()
+        authentication.reset_stats()
+        cache.clear()
+        self.user = CustomUser.objects.create_user(email='seeker@example.com', name='Seeker', role='seeker')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def auth_queries(self):
+        """Run GET /me/ and return the queries that touched the token table."""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.me_url)
+        self.assertEqual(response.status_code, 200)
+        return [query['sql'] for query in context.captured_queries if 'authtoken_token' in query['sql']]
+
+    def test_warm_token_needs_no_query(self):
+        self.assertEqual(len(self.auth_queries()), 1)
+        self.assertEqual(self.auth_queries(), [])
+        stats = authentication.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['hit_rate']), (1, 1, 0.5))
+
+    def test_requests_get_their_own_user_object(self):
+        self.client.get(self.me_url)
+        self.client.patch(self.me_url, {'name': 'Renamed'}, format='json')
+        self.assertEqual(self.client.get(self.me_url).data['name'], 'Renamed')
+
+    def test_logout_drops_the_token(self):
+        self.auth_queries()
+        self.assertEqual(self.client.post('/api/auth/token/logout/').status_code, 204)
+        self.assertEqual(self.client.get(self.me_url).status_code, 401)
+
+    def test_deactivation_and_role_change_drop_the_user(self):
+        self.auth_queries()
+        self.user.role = 'employer'
+        self.user.save()
+        self.assertEqual(self.client.get(self.me_url).data['role'], 'employer')
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.me_url).status_code, 401)
+
+    @override_settings(AUTH_TOKEN_CACHE_SHARED=True)
+    def test_shared_cache_serves_other_workers(self):
+        self.auth_queries()
+        authentication.get_token_cache().clear()  # as if the next request reached another process
+        self.assertEqual(self.auth_queries(), [])
+        self.assertEqual(authentication.stats()['shared_hits'], 1)
+
+        self.user.is_active = False
+        self.user.save()
+        authentication.get_token_cache().clear()
+        self.assertEqual(self.client.get(self.me_url).status_code, 401)
+
+
+class ChunkedUploadTests(APITestCase):
+
+    url = '/api/users/profile/me/uploads/'
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = CustomUser.objects.create_user(email='seeker@example.com', name='Seeker', role='seeker')
+        self.client.force_authenticate(self.user)
+        self.content = os.urandom(250_000)
+
+    def start(self, **extra):
+        data = {'field': 'video_pitch', 'filename': '../my pitch.mp4', 'size': len(self.content), **extra}
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data['id']
+
+    def put_chunk(self, upload_id, first, last, digest=None, body=None):
+        chunk = self.content[first:last + 1] if body is None else body
+        return self.client.put(
+            f'{self.url}{upload_id}/', chunk, content_type='application/octet-stream',
+            headers={'Content-Range': f'bytes {first}-{last}/{len(self.content)}',
+                     'X-Chunk-SHA256': digest or hashlib.sha256(chunk).hexdigest()})
+
+    def test_upload_in_chunks_and_resume(self):
+        upload_id = self.start(sha256=hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(self.put_chunk(upload_id, 0, 99_999).data['offset'], 100_000)
+
+        # A corrupted chunk is rejected and cut off again; a chunk from the wrong place is refused
+        response = self.put_chunk(upload_id, 100_000, 199_999, digest='0' * 64)
+        self.assertEqual((response.status_code, response.data['offset']), (422, 100_000))
+        response = self.put_chunk(upload_id, 200_000, 249_999)
+        self.assertEqual((response.status_code, response.data['offset']), (409, 100_000))
+        self.assertEqual(self.client.post(f'{self.url}{upload_id}/complete/').status_code, 409)
+
+        # Resume from the offset the server reports
+        self.assertEqual(self.client.get(f'{self.url}{upload_id}/').data['offset'], 100_000)
+        self.assertEqual(self.put_chunk(upload_id, 100_000, 199_999).status_code, 200)
+        self.assertTrue(self.put_chunk(upload_id, 200_000, 249_999).data['complete'])
+
+        response = self.client.post(f'{self.url}{upload_id}/complete/')
+        self.assertEqual(response.status_code, 200, response.data)
+        profile = Profile.objects.get(user=self.user)
+        self.assertEqual(profile.video_pitch.name, f'user_{self.user.pk}/video_pitches/my_pitch.mp4')
+        with profile.video_pitch.open('rb') as handle:
+            self.assertEqual(handle.read(), self.content)
+        self.assertFalse(ChunkedUpload.objects.exists())
+        # The part file was moved into the content-addressed blob store
+        self.assertEqual(os.listdir(os.path.join(self.media_root, f'user_{self.user.pk}', 'video_pitches')), [])
+        self.assertEqual(MediaFile.objects.get(name=profile.video_pitch.name).blob.sha256,
+                         hashlib.sha256(self.content).hexdigest())
+
+    def test_whole_file_checksum_is_checked_on_completion(self):
+        upload_id = self.start(sha256='a' * 64)
+        self.put_chunk(upload_id, 0, len(self.content) - 1)
+        self.assertEqual(self.client.post(f'{self.url}{upload_id}/complete/').status_code, 422)
+        self.assertFalse(Profile.objects.get(user=self.user).video_pitch)
+
+    def test_a_second_complete_of_the_same_upload_is_refused(self):
+        upload_id = self.start()
+        self.put_chunk(upload_id, 0, len(self.content) - 1)
+        stale = ChunkedUpload.objects.get(pk=upload_id)  # as read by a concurrent request
+        self.assertEqual(self.client.post(f'{self.url}{upload_id}/complete/').status_code, 200)
+        with self.assertRaises(uploads.UploadError) as raised:
+            uploads.complete(stale)
+        self.assertEqual(raised.exception.status, 409)
+        self.assertEqual(list(MediaBlob.objects.values_list('refcount', flat=True)), [1])
+
+    def test_limits_and_ownership(self):
+        response = self.client.post(self.url, {'field': 'resume', 'filename': 'cv.pdf', 'size': 11 * 1024 * 1024},
+                                    format='json')
+        self.assertEqual(response.status_code, 400)
+        upload_id = self.start()
+        self.assertEqual(self.put_chunk(upload_id, 0, 9, body=b'short').status_code, 400)
+
+        other = CustomUser.objects.create_user(email='other@example.com', name='Other', role='seeker')
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(f'{self.url}{upload_id}/').status_code, 404)
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.delete(f'{self.url}{upload_id}/').status_code, 204)
+        self.assertEqual(os.listdir(os.path.join(self.media_root, f'user_{self.user.pk}', 'video_pitches')), [])
+
+
+class ProfileMediaTests(APITestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = CustomUser.objects.create_user(email='seeker@example.com', name='Seeker', role='seeker')
+        self.profile = Profile.objects.get(user=self.user)
+        self.content = os.urandom(10_000)
+        self.profile.video_pitch.save('pitch.mp4', ContentFile(self.content))
+        self.client.force_authenticate(self.user)
+        self.url = self.client.get('/api/users/profile/me/').data['video_pitch']
+        self.client.force_authenticate(None)
+
+    def body(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_signed_url_serves_ranges(self):
+        response = self.client.get(self.url)
+        self.assertEqual((response.status_code, response['Content-Type']), (200, 'video/mp4'))
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(self.body(response), self.content)
+
+        response = self.client.get(self.url, headers={'Range': 'bytes=100-199'})
+        self.assertEqual((response.status_code, response['Content-Range']), (206, 'bytes 100-199/10000'))
+        self.assertEqual((response['Content-Length'], self.body(response)), ('100', self.content[100:200]))
+        response = self.client.get(self.url, headers={'Range': 'bytes=-50'})
+        self.assertEqual(self.body(response), self.content[-50:])
+        response = self.client.get(self.url, headers={'Range': 'bytes=20000-'})
+        self.assertEqual((response.status_code, response['Content-Range']), (416, 'bytes */10000'))
+
+    def test_etags(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, headers={'If-None-Match': etag}).status_code, 304)
+        # A stale If-Range gets the whole (changed) file instead of a piece of it
+        response = self.client.get(self.url, headers={'Range': 'bytes=0-9', 'If-Range': '"stale"'})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(self.url, headers={'Range': 'bytes=0-9', 'If-Range': etag})
+        self.assertEqual(response.status_code, 206)
+
+    def test_access(self):
+        path = self.url.split('?')[0]
+        self.assertEqual(self.client.get(path).status_code, 401)
+        self.assertEqual(self.client.get(self.url.replace('sig=', 'sig=x')).status_code, 403)
+        other = CustomUser.objects.create_user(email='other@example.com', name='Other', role='seeker')
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(path).status_code, 403)
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get(path).status_code, 200)
+
+        # Replacing the file invalidates links to the old one
+        self.profile.video_pitch.save('other.mp4', ContentFile(b'new'))
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    @override_settings(PROFILE_MEDIA_ACCEL_REDIRECT='/protected-media/')
+    def test_accel_redirect(self):
+        response = self.client.get(self.url)
+        digest = hashlib.sha256(self.content).hexdigest()
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/blobs/{digest[:2]}/{digest[2:4]}/{digest}')
+        self.assertEqual(response['Content-Type'], 'video/mp4')
+        self.assertEqual(response.content, b'')
+
+
+class ResumeSearchTests(APITransactionTestCase):
+    # Transactions are committed so the extraction callback thread sees the rows
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.addClassCleanup(resumes.shutdown)
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(resumes.rebuild_index, [])
+        for name in ('Python', 'Machine Learning', 'Java', 'C++'):
+            Skill.objects.create(name=name)
+        self.seeker = CustomUser.objects.create_user(email='seeker@example.com', name='Seeker', role='seeker')
+        self.employer = CustomUser.objects.create_user(email='boss@example.com', name='Boss', role='employer')
+
+    def upload_resume(self, user, filename, content):
+        self.client.force_authenticate(user)
+        response = self.client.patch('/api/users/profile/me/', {'resume': SimpleUploadedFile(filename, content)},
+                                     format='multipart')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertTrue(resumes.wait(timeout=60))
+        return ResumeDocument.objects.get(profile__user=user)
+
+    def search(self, **params):
+        self.client.force_authenticate(self.employer)
+        response = self.client.get('/api/users/candidates/', params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data['results']
+
+    def test_uploaded_resume_becomes_searchable(self):
+        text = "Senior  Python developer.\r\nMachine learning, JavaScript and C++ since 2015."
+        document = self.upload_resume(self.seeker, 'cv.txt', text.encode())
+        self.assertEqual(document.status, 'done')
+        self.assertEqual(document.text, "Senior Python developer.\nMachine learning, JavaScript and C++ since 2015.")
+        self.assertEqual(sorted(document.skills.values_list('name', flat=True)), ['C++', 'Machine Learning', 'Python'])
+
+        [result] = self.search(q='python')
+        self.assertEqual((result['user'], result['resume_skills']), (self.seeker.pk, ['C++', 'Machine Learning', 'Python']))
+        self.assertIn('[Python]', result['snippet'])
+        self.assertEqual(len(self.search(skills='python,machine learning', match='all')), 1)
+        self.assertEqual(self.search(skills='java'), [])
+        self.assertEqual(self.search(q='cobol'), [])
+
+        # Other profile edits keep the extracted text; removing the resume drops it
+        self.client.force_authenticate(self.seeker)
+        self.client.patch('/api/users/profile/me/', {'bio': 'Hi'}, format='json')
+        self.assertEqual(ResumeDocument.objects.get(pk=document.pk).status, 'done')
+        self.client.patch('/api/users/profile/me/', {'resume': None}, format='json')
+        self.assertFalse(ResumeDocument.objects.exists())
+        self.assertEqual(self.search(q='python'), [])
+
+    def test_unsupported_files_and_stale_results(self):
+        document = self.upload_resume(self.seeker, 'cv.odt', b'Python')
+        self.assertEqual(document.status, 'unsupported')
+        # A result for a resume that has been replaced since is dropped
+        self.assertFalse(resumes.store_result(document.pk, 'old.txt', {'status': 'done', 'text': 'x', 'error': ''}))
+
+        self.client.force_authenticate(self.seeker)
+        self.assertEqual(self.client.get('/api/users/candidates/').status_code, 403)
+
+    def test_docx_and_pdf_text(self):
+        docx = os.path.join(self.media_root, 'cv.docx')
+        with zipfile.ZipFile(docx, 'w') as archive:
+            archive.writestr('word/document.xml', (
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+                '<w:p><w:r><w:t>Data</w:t></w:r><w:r><w:t xml:space="preserve"> Engineer</w:t></w:r></w:p>'
+                '<w:p><w:r><w:t>Python</w:t><w:tab/><w:t>SQL</w:t></w:r></w:p></w:body></w:document>'))
+        self.assertEqual(resume_text.extract(docx)['text'], 'Data Engineer\nPython SQL')
+
+        pdf = os.path.join(self.media_root, 'cv.pdf')
+        content = b'BT /F1 12 Tf 72 712 Td (Senior Python Developer) Tj 0 -14 Td [(Dj) 20 (ango) -300 (\\(2019\\))] TJ ET'
+        with open(pdf, 'wb') as handle:
+            handle.write(b'%PDF-1.4\n1 0 obj<</Filter/FlateDecode>>stream\n' + zlib.compress(content)
+                         + b'\nendstream\nendobj\n%%EOF')
+        self.assertEqual(resume_text._builtin_pdf_text(pdf), 'Senior Python Developer Django (2019)')
+
+    def test_pdf_streams_inflate_within_the_budget(self):
+        pdf = os.path.join(self.media_root, 'cv.pdf')
+        text = zlib.compress(b'BT (Python developer) Tj ET')
+        bomb = zlib.compress(b'BT (x) Tj ET ' + b' ' * 100_000)
+        with open(pdf, 'wb') as handle:
+            for stream in (text, bomb, text):
+                handle.write(b'1 0 obj<</Filter/FlateDecode>>stream\n' + stream + b'\nendstream\nendobj\n')
+        self.assertEqual(resume_text._builtin_pdf_text(pdf, max_bytes=1000), 'Python developer')
+        self.assertEqual(resume_text._builtin_pdf_text(pdf), 'Python developer\nx\nPython developer')
+
+
+class ContentAddressedStorageTests(APITestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.users = [CustomUser.objects.create_user(email=f'seeker{i}@example.com', name='Seeker', role='seeker')
+                      for i in range(2)]
+        self.content = os.urandom(5000)
+
+    def upload(self, user, content, filename='pitch.mp4'):
+        self.client.force_authenticate(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch('/api/users/profile/me/', {'video_pitch': SimpleUploadedFile(filename, content)},
+                                         format='multipart')
+        self.assertEqual(response.status_code, 200, response.data)
+        return Profile.objects.get(user=user)
+
+    def blob_files(self):
+        return [name for _, _, names in os.walk(os.path.join(self.media_root, 'blobs')) for name in names]
+
+    def test_identical_uploads_share_one_blob(self):
+        first = self.upload(self.users[0], self.content)
+        second = self.upload(self.users[1], self.content)
+        self.assertEqual((first.video_pitch.name, second.video_pitch.name),
+                         (f'user_{self.users[0].pk}/video_pitches/pitch.mp4', f'user_{self.users[1].pk}/video_pitches/pitch.mp4'))
+        self.assertEqual(self.blob_files(), [hashlib.sha256(self.content).hexdigest()])
+        self.assertEqual(MediaBlob.objects.get().refcount, 2)
+        with second.video_pitch.open('rb') as handle:
+            self.assertEqual(handle.read(), self.content)
+
+        # Replacing a file releases the old name; the blob stays while the other profile uses it
+        self.upload(self.users[0], b'new pitch', 'take2.mp4')
+        self.assertEqual(MediaBlob.objects.get(sha256=hashlib.sha256(self.content).hexdigest()).refcount, 1)
+        self.assertFalse(MediaFile.objects.filter(name=first.video_pitch.name).exists())
+
+    def test_blob_lookups_are_cached_per_name(self):
+        profile = self.upload(self.users[0], self.content)
+        storage, name = profile.video_pitch.storage, profile.video_pitch.name
+        storage._forget(name)
+        with self.assertNumQueries(1):
+            path = storage.path(name)
+            self.assertTrue(storage.exists(name))
+            self.assertEqual(storage.path(name), path)
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.delete()
+        with self.assertNumQueries(1):
+            self.assertFalse(storage.exists(name))
+
+    def test_saving_content_whose_blob_file_was_collected(self):
+        profile = self.upload(self.users[0], self.content)
+        blob_path = profile.video_pitch.path
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.delete()
+        os.remove(blob_path)  # the row is still there, the file is gone
+        profile = self.upload(self.users[1], self.content)
+        with profile.video_pitch.open('rb') as handle:
+            self.assertEqual(handle.read(), self.content)
+        self.assertEqual(MediaBlob.objects.get().refcount, 1)
+
+    def test_gc_removes_unreferenced_blobs_after_the_grace_period(self):
+        profile = self.upload(self.users[0], self.content)
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.delete()
+        self.assertEqual(MediaBlob.objects.get().refcount, 0)
+
+        call_command('gc_media_blobs', stdout=StringIO())
+        self.assertEqual(len(self.blob_files()), 1)  # still within the grace period
+        call_command('gc_media_blobs', '--grace-hours', '0', stdout=StringIO())
+        self.assertEqual(self.blob_files(), [])
+        self.assertFalse(MediaBlob.objects.exists())
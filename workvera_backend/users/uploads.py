@@ -0,0 +1,228 @@
+# users/uploads.py
+"""
+Resumable chunked uploads for Profile.resume and Profile.video_pitch.
+
+    POST   /api/users/profile/me/uploads/                   {field, filename, size, sha256?} -> {id, offset: 0, ...}
+    PUT    /api/users/profile/me/uploads/<id>/              one chunk: raw bytes with
+                                                            Content-Range: bytes <start>-<end>/<size>
+                                                            X-Chunk-SHA256: <hex digest of the chunk>
+    GET    /api/users/profile/me/uploads/<id>/              current offset, to resume after a dropped connection
+    POST   /api/users/profile/me/uploads/<id>/complete/     move the file into the Profile field
+    DELETE /api/users/profile/me/uploads/<id>/              abort
+
+Chunks are streamed from the request straight into a ``<id>.part`` file in the
+directory the field's ``upload_to`` points at (user_<id>/resumes/, user_<id>/video_pitches/),
+COPY_BLOCK bytes at a time, so memory use doesn't depend on the chunk or file size.
+A chunk whose digest doesn't match is cut off again and has to be resent. Completing
+hands the part file to the field's storage, which moves it into place (or drops it when
+the same content is already stored, see users/storage.py), and saves the Profile field
+in one UPDATE, so the profile never points at a half-written file.
+
+Appending needs a storage with local paths (FileSystemStorage, the default).
+"""
+import base64
+import hashlib
+import os
+import re
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+try:
+    import fcntl
+except ImportError:  # Windows: no per-upload lock, concurrent chunks are caught by the offset check
+    fcntl = None
+
+from .models import ChunkedUpload, Profile
+from . import resumes
+
+COPY_BLOCK = 64 * 1024
+DEFAULT_MAX_SIZES = {
+    'resume': 10 * 1024 * 1024,
+    'video_pitch': 500 * 1024 * 1024,
+}
+_CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+
+class UploadError(Exception):
+    """An upload request that can't be applied; ``status`` is the HTTP status to answer with."""
+
+    def __init__(self, detail, status=400, offset=None):
+        super().__init__(detail)
+        self.detail = detail
+        self.status = status
+        self.offset = offset
+
+
+def max_size(field):
+    return getattr(settings, 'CHUNKED_UPLOAD_MAX_SIZES', DEFAULT_MAX_SIZES)[field]
+
+
+def max_chunk_size():
+    return getattr(settings, 'CHUNKED_UPLOAD_MAX_CHUNK_SIZE', 16 * 1024 * 1024)
+
+
+def profile_field(field):
+    return Profile._meta.get_field(field)
+
+
+def local_path(field, name):
+    try:
+        return profile_field(field).storage.path(name)
+    except NotImplementedError:
+        raise UploadError("Resumable uploads need a storage backend with local files.", status=501)
+
+
+def start(user, field, filename, size, sha256=''):
+    """Create the upload and its empty part file."""
+    profile, _ = Profile.objects.get_or_create(user=user)
+    upload = ChunkedUpload(user=user, field=field, filename=get_valid_filename(os.path.basename(filename)),
+                           size=size, sha256=sha256.lower())
+    upload.part_name = profile_field(field).generate_filename(profile, f'{upload.id}.part')
+    path = local_path(field, upload.part_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'wb').close()
+    upload.save()
+    return upload
+
+
+def parse_content_range(header, upload):
+    match = _CONTENT_RANGE_RE.match(header or '')
+    if not match:
+        raise UploadError("Content-Range must be 'bytes <start>-<end>/<size>'.")
+    first, last, total = (int(value) for value in match.groups())
+    if total != upload.size or first > last or last >= total:
+        raise UploadError(f"Content-Range doesn't fit an upload of {upload.size} bytes.")
+    if last - first + 1 > max_chunk_size():
+        raise UploadError(f"Chunks can be at most {max_chunk_size()} bytes.", status=413)
+    if first != upload.offset:
+        raise UploadError(f"Expected the chunk starting at byte {upload.offset}.", status=409, offset=upload.offset)
+    return first, last
+
+
+def expected_digest(headers):
+    """Hex SHA-256 from X-Chunk-SHA256, or from an RFC 9530 ``Content-Digest: sha-256=:<base64>:``."""
+    value = headers.get('X-Chunk-SHA256', '').strip().lower()
+    if value:
+        return value
+    for item in headers.get('Content-Digest', '').split(','):
+        algorithm, _, encoded = item.strip().partition('=')
+        if algorithm.lower() == 'sha-256' and encoded.startswith(':') and encoded.endswith(':'):
+            try:
+                return base64.b64decode(encoded[1:-1]).hex()
+            except ValueError:
+                break
+    raise UploadError("Send the chunk's SHA-256 as X-Chunk-SHA256 or Content-Digest.")
+
+
+def append_chunk(upload, stream, content_range, digest):
+    """
+    Write one chunk from ``stream`` at the upload's offset and verify it.
+    Returns the upload with its new offset.
+    """
+    first, last = parse_content_range(content_range, upload)
+    length = last - first + 1
+    path = local_path(upload.field, upload.part_name)
+    with open(path, 'r+b') as part:
+        if fcntl is not None:
+            try:
+                fcntl.flock(part, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                raise UploadError("Another chunk of this upload is being written.", status=409, offset=upload.offset)
+        # Re-read under the lock: a concurrent request may have just moved the offset
+        upload.refresh_from_db(fields=['offset'])
+        if upload.offset != first:
+            raise UploadError(f"Expected the chunk starting at byte {upload.offset}.", status=409, offset=upload.offset)
+
+        part.seek(first)
+        part.truncate()  # drop leftovers of an interrupted attempt at this chunk
+        checksum = hashlib.sha256()
+        remaining = length
+        while remaining:
+            block = stream.read(min(COPY_BLOCK, remaining)) if stream is not None else b''
+            if not block:
+                break
+            part.write(block)
+            checksum.update(block)
+            remaining -= len(block)
+        if remaining or checksum.hexdigest() != digest:
+            part.truncate(first)
+            if remaining:
+                raise UploadError(f"The body ended {remaining} bytes before the end of the Content-Range.",
+                                  offset=first)
+            raise UploadError("Chunk checksum mismatch; send it again.", status=422, offset=first)
+        part.flush()
+        os.fsync(part.fileno())
+        ChunkedUpload.objects.filter(pk=upload.pk).update(offset=last + 1, updated_at=timezone.now())
+    upload.offset = last + 1
+    return upload
+
+
+def file_sha256(path):
+    checksum = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(COPY_BLOCK), b''):
+            checksum.update(block)
+    return checksum.hexdigest()
+
+
+class PartFile(File):
+    """A finished part file, handed to the storage like a temporary upload so it is moved, not copied."""
+
+    def __init__(self, handle, path):
+        super().__init__(handle)
+        self.path = path
+
+    def temporary_file_path(self):
+        return self.path
+
+
+def complete(upload):
+    """Move the finished part file into the Profile field; returns the profile."""
+    with transaction.atomic():
+        # Concurrent completes of one upload run one at a time; the later ones find the row gone
+        locked = ChunkedUpload.objects.select_for_update().filter(pk=upload.pk).first()
+        if locked is None:
+            raise UploadError("This upload has already been completed.", status=409)
+        upload = locked
+        if upload.offset != upload.size:
+            raise UploadError(f"Only {upload.offset} of {upload.size} bytes have been received.",
+                              status=409, offset=upload.offset)
+        part_path = local_path(upload.field, upload.part_name)
+        if not os.path.exists(part_path):
+            raise UploadError("The uploaded data is gone; start a new upload.", status=410)
+        digest = file_sha256(part_path)
+        if upload.sha256 and digest != upload.sha256:
+            raise UploadError("The file's SHA-256 doesn't match the one given when the upload started.", status=422)
+
+        profile = Profile.objects.get(user_id=upload.user_id)
+        field = profile_field(upload.field)
+        old_name = getattr(profile, upload.field).name
+        with open(part_path, 'rb') as handle:
+            content = PartFile(handle, part_path)
+            content.sha256 = digest  # already computed; the content-addressed storage won't hash it again
+            name = field.storage.save(field.generate_filename(profile, upload.filename), content,
+                                      max_length=field.max_length)
+        Profile.objects.filter(pk=profile.pk).update(**{upload.field: name})
+        upload.delete()
+        # update() sends no post_save: release the replaced file and, for resumes, queue the text extraction
+        if old_name:
+            transaction.on_commit(lambda: field.storage.delete(old_name))
+        if upload.field == 'resume':
+            resumes.schedule_on_commit(profile.pk)
+    if os.path.exists(part_path):
+        os.remove(part_path)  # the storage already had this content
+    setattr(profile, upload.field, name)
+    return profile
+
+
+def abort(upload):
+    path = local_path(upload.field, upload.part_name)
+    upload.delete()
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -1,10 +1,27 @@
 from django.urls import path
-from .views import UserProfileMeAPIView, UserListAPIView
+from .views import (
+    UserProfileMeAPIView, UserListAPIView,
+    ProfileUploadCreateAPIView, ProfileUploadDetailAPIView, ProfileUploadCompleteAPIView,
+    ProfileMediaAPIView, CandidateSearchAPIView, StreamTicketAPIView,
+)
 
 app_name = 'users'
 
 urlpatterns = [
     path('profile/me/', UserProfileMeAPIView.as_view(), name='profile-me'),
+    # Resumable chunked uploads of the resume / video pitch (users/uploads.py)
+    path('profile/me/uploads/', ProfileUploadCreateAPIView.as_view(), name='profile-upload-list'),
+    path('profile/me/uploads/<uuid:pk>/', ProfileUploadDetailAPIView.as_view(), name='profile-upload-detail'),
+    path('profile/me/uploads/<uuid:pk>/complete/', ProfileUploadCompleteAPIView.as_view(), name='profile-upload-complete'),
+
+    # Resume / video pitch downloads with Range support (users/media.py)
+    path('media/<int:pk>/<str:field>/', ProfileMediaAPIView.as_view(), name='profile-media'),
+
+    # Employer search over extracted resume text (users/resumes.py)
+    path('candidates/', CandidateSearchAPIView.as_view(), name='candidate-search'),
+
+    # Ticket for opening the live update streams (workvera_backend/streams.py)
+    path('stream-ticket/', StreamTicketAPIView.as_view(), name='stream-ticket'),
 
     path('all/', UserListAPIView.as_view(), name='user-list'), 
 ]
\ No newline at end of file
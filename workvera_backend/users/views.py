@@ -1,8 +1,18 @@
 from rest_framework import generics, permissions, status
+from rest_framework.exceptions import NotAuthenticated, PermissionDenied
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from .models import Profile, CustomUser
-from .serializers import ProfileSerializer, CustomUserSerializer
+import time
+
+from django.http import Http404
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404
+from .models import ChunkedUpload, Profile, CustomUser
+from .permissions import IsEmployerOrStaff
+from .serializers import CandidateSerializer, ChunkedUploadSerializer, ProfileSerializer, CustomUserSerializer
+from . import media, resumes, uploads
+from skills.models import Skill
+from workvera_backend import streams
 
 # Djoser handles /register and /login
 # /api/auth/users/ for user creation (POST) - uses CustomUserCreateSerializer
@@ -35,3 +45,153 @@ class UserListAPIView(generics.ListAPIView):
     queryset = CustomUser.objects.all()
     serializer_class = CustomUserSerializer
     permission_classes = [permissions.IsAdminUser] 
+    cursor_ordering = ('email',)
+
+
+class StreamTicketAPIView(APIView):
+    """
+    A short-lived ticket for the live update streams, which EventSource can't send a token to.
+    POST /api/users/stream-ticket/ -> {"ticket": "...", "expires_in": 60}
+    Open the stream with ?ticket=<ticket> right away (see workvera_backend/streams.py).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        return Response({'ticket': streams.issue_ticket(request.user), 'expires_in': streams.ticket_max_age()})
+
+
+def upload_error_response(error):
+    data = {'detail': error.detail}
+    if error.offset is not None:
+        data['offset'] = error.offset
+    return Response(data, status=error.status)
+
+
+class ProfileUploadCreateAPIView(APIView):
+    """
+    Start a resumable upload of the current user's resume or video pitch (see users/uploads.py).
+    POST /api/users/profile/me/uploads/ {"field": "video_pitch", "filename": "pitch.mp4", "size": 73400320, "sha256": "..."}
+    GET /api/users/profile/me/uploads/ - unfinished uploads, to resume them
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        pending = ChunkedUpload.objects.filter(user=request.user)
+        return Response(ChunkedUploadSerializer(pending, many=True).data)
+
+    def post(self, request, *args, **kwargs):
+        serializer = ChunkedUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            upload = uploads.start(request.user, **serializer.validated_data)
+        except uploads.UploadError as error:
+            return upload_error_response(error)
+        return Response(ChunkedUploadSerializer(upload).data, status=status.HTTP_201_CREATED)
+
+
+class ProfileUploadDetailAPIView(APIView):
+    """
+    GET /api/users/profile/me/uploads/<id>/ - bytes received so far ("offset")
+    PUT /api/users/profile/me/uploads/<id>/ - append one chunk (raw body, Content-Range, X-Chunk-SHA256)
+    DELETE /api/users/profile/me/uploads/<id>/ - abort and remove the partial file
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_object(self):
+        return get_object_or_404(ChunkedUpload, pk=self.kwargs['pk'], user=self.request.user)
+
+    def get(self, request, *args, **kwargs):
+        return Response(ChunkedUploadSerializer(self.get_object()).data)
+
+    def put(self, request, *args, **kwargs):
+        upload = self.get_object()
+        try:
+            digest = uploads.expected_digest(request.headers)
+            # request.stream is read in blocks; request.data is never touched, so nothing buffers the body
+            uploads.append_chunk(upload, request.stream, request.headers.get('Content-Range'), digest)
+        except uploads.UploadError as error:
+            return upload_error_response(error)
+        return Response({'id': upload.id, 'offset': upload.offset, 'size': upload.size,
+                         'complete': upload.offset == upload.size})
+
+    def delete(self, request, *args, **kwargs):
+        uploads.abort(self.get_object())
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProfileUploadCompleteAPIView(APIView):
+    """
+    Finish an upload: the file becomes the profile's resume / video pitch.
+    POST /api/users/profile/me/uploads/<id>/complete/ - returns the updated profile
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, pk, *args, **kwargs):
+        upload = get_object_or_404(ChunkedUpload, pk=pk, user=request.user)
+        try:
+            profile = uploads.complete(upload)
+        except uploads.UploadError as error:
+            return upload_error_response(error)
+        return Response(ProfileSerializer(profile, context={'request': request}).data)
+
+
+class ProfileMediaAPIView(APIView):
+    """
+    Download a profile's resume or video pitch, with Range / ETag support (users/media.py).
+    GET /api/users/media/<profile id>/<resume|video_pitch>/?exp=...&sig=...
+    The signed URL comes from ProfileSerializer; without one only the owner and staff get the file.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, pk, field):
+        if field not in media.FIELDS:
+            raise Http404
+        profile = get_object_or_404(Profile, pk=pk)
+        field_file = getattr(profile, field)
+        if not field_file:
+            raise Http404
+
+        expires = media.check_signature(profile, field, field_file.name, request.query_params)
+        if expires is not None:
+            max_age = max(0, int(expires - time.time()))
+        elif 'sig' in request.query_params:
+            raise PermissionDenied("This link is invalid or has expired.")
+        elif not request.user.is_authenticated:
+            raise NotAuthenticated()
+        elif request.user.pk != profile.user_id and not request.user.is_staff:
+            raise PermissionDenied()
+        else:
+            max_age = 0
+        return media.file_response(request, field_file, max_age=max_age)
+
+
+class CandidateSearchAPIView(generics.ListAPIView):
+    """
+    Search seekers by the text of their resumes (users/resumes.py). Employers and staff only.
+    GET /api/users/candidates/?q=python "data engineer" devel*   - Relevance-ranked full-text search,
+        each result has a "snippet" with the matches in [brackets].
+    GET /api/users/candidates/?skills=python,django&match=all    - Skills found in the resume; match is 'any' or 'all'.
+    Only resumes whose text has been extracted are searchable.
+    """
+    serializer_class = CandidateSerializer
+    permission_classes = [IsEmployerOrStaff]
+
+    def get_cursor_ordering(self):
+        # Relevance-ranked results use page numbers (see workvera_backend.pagination)
+        if self.request.query_params.get('q', '').strip():
+            return None
+        return ('-id',)
+
+    def get_queryset(self):
+        params = self.request.query_params
+        queryset = (Profile.objects
+                    .filter(user__role='seeker', user__is_active=True, resume_document__status='done')
+                    .select_related('user', 'resume_document')
+                    .prefetch_related(Prefetch('resume_document__skills', queryset=Skill.objects.only('id', 'name'))))
+        skills = [name for name in params.get('skills', '').split(',') if name.strip()]
+        if skills:
+            queryset = resumes.filter_by_skills(queryset, skills, params.get('match', 'any'))
+        query = params.get('q', '').strip()
+        if query:
+            return resumes.search_candidates(queryset, query)
+        return queryset.order_by('-id')
@@ -3,6 +3,10 @@ ASGI config for workvera_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The live update streams (Server-Sent Events, see workvera_backend/streams.py) need
+to be served through this entry point, e.g.:
+    uvicorn workvera_backend.asgi:application
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
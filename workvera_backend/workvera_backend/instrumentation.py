@@ -0,0 +1,317 @@
+"""
+Per-request performance instrumentation (enabled with ``PERF_INSTRUMENTATION_ENABLED``).
+
+``RequestInstrumentationMiddleware`` records, for every request:
+- the resolved view, viewset action and URL route,
+- the number of SQL queries and the time spent in them,
+- the time spent building serializer output (``serializer.data``),
+- the response size and the total latency.
+
+Records go into a bounded ring buffer (the last ``PERF_BUFFER_SIZE`` requests) and into
+a latency histogram per endpoint (method + route), from which p50/p95/p99 are read.
+Both live in process memory, so each worker reports on its own requests. Staff read
+them at GET /api/admin_analytics/admin/performance/.
+
+With ``PERF_SLOW_REQUEST_MS`` set, requests slower than that are logged on the
+``workvera.performance`` logger with their slowest SQL statements.
+
+SQL is timed by a database execute wrapper installed on every connection and
+serializers by a wrapper around ``BaseSerializer.data``; both only look up the
+current request in a context variable (which also follows async views into
+``sync_to_async`` threads) and do nothing outside an instrumented request.
+"""
+import bisect
+import contextvars
+import functools
+import logging
+import re
+import threading
+import time
+from collections import deque
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger('workvera.performance')
+
+_current = contextvars.ContextVar('instrumented_request', default=None)
+
+# Histogram bucket upper bounds in ms: 0.5ms to ~70s, each 25% wider than the last
+BUCKETS = []
+_bound = 0.5
+while _bound < 70000:
+    BUCKETS.append(round(_bound, 3))
+    _bound *= 1.25
+del _bound
+
+SLOW_SQL_LOGGED = 10  # statements included in a slow request's log entry
+
+
+@functools.lru_cache(maxsize=1024)
+def endpoint_route(route):
+    """'api/jobs/posts/(?P<pk>[^/.]+)/$' (a DRF router regex) -> '/api/jobs/posts/<pk>/'"""
+    route = re.sub(r'\(\?P<(\w+)>[^)]*\)', r'<\1>', route)
+    return '/' + route.replace('^', '').replace('$', '')
+
+
+class RequestRecord:
+    __slots__ = ('method', 'path', 'endpoint', 'view', 'action', 'status', 'duration_ms',
+                 'sql_count', 'sql_ms', 'serializer_ms', 'serializer_depth', 'response_bytes',
+                 'queries', 'started_at')
+
+    def __init__(self, method, path, keep_queries):
+        self.method = method
+        self.path = path
+        self.endpoint = f'{method} <unresolved>'
+        self.view = None
+        self.action = None
+        self.status = None
+        self.duration_ms = 0.0
+        self.sql_count = 0
+        self.sql_ms = 0.0
+        self.serializer_ms = 0.0
+        self.serializer_depth = 0
+        self.response_bytes = None
+        self.queries = [] if keep_queries else None  # (ms, sql), only when slow requests are logged
+        self.started_at = time.time()
+
+    def as_dict(self):
+        return {
+            'method': self.method,
+            'path': self.path,
+            'endpoint': self.endpoint,
+            'view': self.view,
+            'action': self.action,
+            'status': self.status,
+            'duration_ms': round(self.duration_ms, 3),
+            'sql_count': self.sql_count,
+            'sql_ms': round(self.sql_ms, 3),
+            'serializer_ms': round(self.serializer_ms, 3),
+            'response_bytes': self.response_bytes,
+            'started_at': self.started_at,
+        }
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # the last bucket holds everything slower
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.sql_count = 0
+        self.sql_ms = 0.0
+        self.serializer_ms = 0.0
+
+    def add(self, record):
+        self.counts[bisect.bisect_left(BUCKETS, record.duration_ms)] += 1
+        self.count += 1
+        self.total_ms += record.duration_ms
+        self.max_ms = max(self.max_ms, record.duration_ms)
+        self.sql_count += record.sql_count
+        self.sql_ms += record.sql_ms
+        self.serializer_ms += record.serializer_ms
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of requests (at most 25% high)."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return round(min(BUCKETS[index], self.max_ms) if index < len(BUCKETS) else self.max_ms, 3)
+        return round(self.max_ms, 3)
+
+    def summary(self):
+        count = self.count or 1
+        return {
+            'count': self.count,
+            'p50_ms': self.percentile(0.50),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': round(self.max_ms, 3),
+            'avg_ms': round(self.total_ms / count, 3),
+            'avg_sql_count': round(self.sql_count / count, 2),
+            'avg_sql_ms': round(self.sql_ms / count, 3),
+            'avg_serializer_ms': round(self.serializer_ms / count, 3),
+        }
+
+
+class Recorder:
+    """Ring buffer of recent requests plus a histogram per endpoint."""
+
+    def __init__(self, size=500):
+        self.lock = threading.Lock()
+        self.recent = deque(maxlen=size)
+        self.endpoints = {}
+
+    def add(self, record):
+        with self.lock:
+            self.recent.append(record)
+            histogram = self.endpoints.get(record.endpoint)
+            if histogram is None:
+                histogram = self.endpoints[record.endpoint] = LatencyHistogram()
+            histogram.add(record)
+
+    def snapshot(self, recent=50):
+        with self.lock:
+            endpoints = [{'endpoint': endpoint, **histogram.summary()}
+                         for endpoint, histogram in self.endpoints.items()]
+            latest = [record.as_dict() for record in list(self.recent)[-recent:]] if recent else []
+        endpoints.sort(key=lambda row: row['avg_ms'] * row['count'], reverse=True)  # most total time first
+        latest.reverse()
+        return {'buffer_size': self.recent.maxlen, 'endpoints': endpoints, 'recent': latest}
+
+    def reset(self):
+        with self.lock:
+            self.recent.clear()
+            self.endpoints.clear()
+
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+def get_recorder():
+    global _recorder
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = Recorder(getattr(settings, 'PERF_BUFFER_SIZE', 500))
+        return _recorder
+
+
+def is_enabled():
+    return getattr(settings, 'PERF_INSTRUMENTATION_ENABLED', False)
+
+
+# Hooks --------------------------------------------------------------------
+
+def _time_query(execute, sql, params, many, context):
+    record = _current.get()
+    if record is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        record.sql_count += 1
+        record.sql_ms += elapsed
+        if record.queries is not None:
+            record.queries.append((elapsed, sql))
+
+
+def _add_query_timer(connection, **kwargs):
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _time_query)
+
+
+def _timed_data_property(data):
+    def timed_data(serializer):
+        record = _current.get()
+        if record is None:
+            return data.fget(serializer)
+        # Nested .data calls (a serializer used inside another one) are already being timed
+        record.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return data.fget(serializer)
+        finally:
+            record.serializer_depth -= 1
+            if not record.serializer_depth:
+                record.serializer_ms += (time.perf_counter() - start) * 1000
+    timed_data._instrumented = True
+    return property(timed_data)
+
+
+_installed = False
+
+
+def install():
+    """Add the SQL and serializer hooks (idempotent; called when the middleware loads)."""
+    global _installed
+    if _installed:
+        return
+    from rest_framework.serializers import BaseSerializer
+
+    connection_created.connect(_add_query_timer, dispatch_uid='workvera.instrumentation')
+    for connection in connections.all(initialized_only=True):
+        _add_query_timer(connection)
+    if not getattr(BaseSerializer.data.fget, '_instrumented', False):
+        BaseSerializer.data = _timed_data_property(BaseSerializer.data)
+    _installed = True
+
+
+# Middleware ---------------------------------------------------------------
+
+class RequestInstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not is_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, 'PERF_SLOW_REQUEST_MS', None)
+        self.recorder = get_recorder()
+        install()
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        record = RequestRecord(request.method, request.path, keep_queries=self.slow_ms is not None)
+        token = _current.set(record)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(record, request, response, start)
+        return response
+
+    async def __acall__(self, request):
+        record = RequestRecord(request.method, request.path, keep_queries=self.slow_ms is not None)
+        token = _current.set(record)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(record, request, response, start)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        record = _current.get()
+        if record is None:
+            return None
+        match = request.resolver_match
+        view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+        target = view_class or view_func
+        record.view = f'{target.__module__}.{target.__qualname__}'
+        actions = getattr(view_func, 'actions', None)  # DRF viewsets: {'get': 'list', ...}
+        if actions:
+            record.action = actions.get(request.method.lower())
+        record.endpoint = f'{request.method} {endpoint_route(match.route)}' if match and match.route else f'{request.method} {record.view}'
+        return None
+
+    def finish(self, record, request, response, start):
+        record.duration_ms = (time.perf_counter() - start) * 1000
+        record.status = response.status_code
+        if not response.streaming:
+            record.response_bytes = len(response.content)
+        self.recorder.add(record)
+        if self.slow_ms is not None and record.duration_ms >= self.slow_ms:
+            slowest = sorted(record.queries, reverse=True)[:SLOW_SQL_LOGGED]
+            logger.warning(
+                "Slow request %s %s: %.1fms (%d queries, %.1fms SQL, %.1fms serializers)%s",
+                record.method, record.path, record.duration_ms, record.sql_count, record.sql_ms,
+                record.serializer_ms,
+                ''.join(f'\n  {ms:.1f}ms  {sql}' for ms, sql in slowest),
+            )
+        record.queries = None  # don't keep the SQL of every buffered request
@@ -0,0 +1,69 @@
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination, PageNumberPagination
+
+
+class LegacyPageNumberPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class LegacyLimitOffsetPagination(LimitOffsetPagination):
+    default_limit = 20
+    max_limit = 100
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Default pagination for every list endpoint (see REST_FRAMEWORK in settings.py).
+
+    Views declare the keyset with ``cursor_ordering`` (or ``get_cursor_ordering()``),
+    e.g. ``('-posted_at', '-id')``, backed by a matching composite index. Fetching
+    page N is then an indexed range scan from the cursor, so it costs the same as page 1:
+        GET /api/jobs/posts/                 -> {"next": "...?cursor=...", "previous": null, "results": [...]}
+        GET /api/jobs/posts/?cursor=<next>   -> following page
+
+    Offset mode, kept as a fallback for older clients:
+        ?page=2&page_size=10   -> page-number pagination with "count"
+        ?limit=10&offset=20    -> limit/offset pagination with "count"
+    A view whose ordering can't be expressed as a keyset (e.g. relevance-ranked
+    search) returns None from get_cursor_ordering() and always gets page numbers.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-pk',)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.legacy_paginator = None
+        cursor_ordering = self.get_view_ordering(view)
+        params = request.query_params
+        if cursor_ordering is None or 'page' in params:
+            self.legacy_paginator = LegacyPageNumberPagination()
+        elif 'offset' in params or 'limit' in params:
+            self.legacy_paginator = LegacyLimitOffsetPagination()
+        if self.legacy_paginator is not None:
+            page = self.legacy_paginator.paginate_queryset(queryset, request, view)
+            self.display_page_controls = getattr(self.legacy_paginator, 'display_page_controls', False)
+            return page
+        self.view_ordering = cursor_ordering
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_view_ordering(self, view):
+        if view is None:
+            return self.ordering
+        if hasattr(view, 'get_cursor_ordering'):
+            return view.get_cursor_ordering()
+        return getattr(view, 'cursor_ordering', self.ordering)
+
+    def get_ordering(self, request, queryset, view):
+        return tuple(self.view_ordering)
+
+    def get_paginated_response(self, data):
+        if self.legacy_paginator is not None:
+            return self.legacy_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.legacy_paginator is not None:
+            return self.legacy_paginator.to_html()
+        return super().to_html()
@@ -0,0 +1,107 @@
+"""
+In-process publish/subscribe used to push live updates to Server-Sent Events streams
+(see workvera_backend/streams.py).
+
+    subscription = pubsub.get_broker().subscribe('community.post.7')   # in an async view
+    message = await subscription.get(timeout=15)
+    pubsub.publish_on_commit('community.post.7', {'event': 'comment', 'data': {...}})  # anywhere
+
+Subscribers are asyncio queues on the event loop of the ASGI server; ``publish`` is
+thread-safe, so sync views and signal handlers (which Django runs in a worker thread
+under ASGI) can publish directly.
+
+The in-process broker only reaches subscribers in the same process. To fan out across
+several ASGI workers, point ``PUBSUB_BROKER`` at a class with the same
+``subscribe()`` / ``publish()`` interface backed by a local broker (Redis, NATS, ...).
+"""
+import asyncio
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+class Subscription:
+    def __init__(self, broker, topic, loop, max_pending):
+        self.broker = broker
+        self.topic = topic
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_pending)
+        self.dropped = 0  # messages lost because the client was too slow
+
+    def _deliver(self, message):
+        # Runs on the subscriber's loop. A client that can't keep up loses its oldest messages.
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout=None):
+        """Next message, or None after ``timeout`` seconds without one."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    def __init__(self, max_pending=100):
+        self.max_pending = max_pending
+        self.lock = threading.Lock()
+        self.subscriptions = {}  # topic -> set of Subscription
+
+    def subscribe(self, topic):
+        """Must be called from a coroutine: messages are delivered on the running loop."""
+        subscription = Subscription(self, topic, asyncio.get_running_loop(), self.max_pending)
+        with self.lock:
+            self.subscriptions.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscribers = self.subscriptions.get(subscription.topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self.subscriptions[subscription.topic]
+
+    def publish(self, topic, message):
+        """Send ``message`` to every current subscriber of ``topic``; returns how many there were."""
+        with self.lock:
+            subscribers = list(self.subscriptions.get(topic, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, message)
+            except RuntimeError:
+                self.unsubscribe(subscription)  # its event loop has been closed
+        return len(subscribers)
+
+    def subscriber_count(self, topic):
+        with self.lock:
+            return len(self.subscriptions.get(topic, ()))
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            broker_class = import_string(getattr(settings, 'PUBSUB_BROKER', 'workvera_backend.pubsub.InProcessBroker'))
+            _broker = broker_class()
+        return _broker
+
+
+def publish(topic, message):
+    return get_broker().publish(topic, message)
+
+
+def publish_on_commit(topic, message):
+    """Publish once the current transaction commits, so clients never see rolled-back rows."""
+    transaction.on_commit(lambda: publish(topic, message))
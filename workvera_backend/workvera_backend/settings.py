@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -55,6 +56,8 @@ CORS_ALLOWED_ORIGINS = [
     "http://127.0.0.1:3000",
 ]
 MIDDLEWARE = [
+    # First, so its timings cover the whole stack (no-op unless PERF_INSTRUMENTATION_ENABLED)
+    'workvera_backend.instrumentation.RequestInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -144,16 +147,19 @@ AUTH_USER_MODEL = 'users.CustomUser'
 # Django REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        # TokenAuthentication with the Token + user lookup cached (users/authentication.py)
+        'users.authentication.CachedTokenAuthentication',
         # If I want to use session authentication for browsable API, add it:
         # 'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         # read-only
         'rest_framework.permissions.IsAuthenticatedOrReadOnly', 
-    ]
-    # 'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    # 'PAGE_SIZE': 10
+    ],
+    # Cursor (keyset) pagination keyed on each view's cursor_ordering;
+    # ?page= / ?limit=&offset= keep the old offset behaviour (see workvera_backend/pagination.py)
+    'DEFAULT_PAGINATION_CLASS': 'workvera_backend.pagination.KeysetPagination',
+    'PAGE_SIZE': 20
 }
 
 # Djoser settings 
@@ -186,9 +192,89 @@ SWAGGER_SETTINGS = {
     'LOGOUT_URL': '/admin/logout/', 
 }
 
+# Job recommendations (jobs/recommendations.py)
+# Seconds before a worker reloads its in-memory job feature matrix from the database
+RECOMMENDATION_MATRIX_MAX_AGE = 300
+# Seconds a seeker's ranked job ids are cached
+RECOMMENDATION_CACHE_TIMEOUT = 300
+
+# Caches. Local memory is per process; to share the job listing cache (jobs/list_cache.py)
+# between several workers use e.g. a file-based cache:
+#     'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+#     'LOCATION': BASE_DIR / 'cache',
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'workvera',
+    },
+}
+# Seconds an anonymous GET /api/jobs/posts/ response is cached; JobPost writes invalidate it sooner
+JOBS_LIST_CACHE_TIMEOUT = 600
+
+# Seconds the admin dashboard stats snapshot is cached (signals keep it current in between)
+ADMIN_STATS_SNAPSHOT_TTL = 300
+
+# Cached token authentication (users/authentication.py)
+# Seconds a token's user is reused without a query; other workers may see a logout this late
+AUTH_TOKEN_CACHE_TTL = 60
+# Tokens kept per process
+AUTH_TOKEN_CACHE_SIZE = 10000
+# Also share cached tokens between workers through CACHES['default'] (use with a shared backend)
+AUTH_TOKEN_CACHE_SHARED = False
+
+# Live updates over Server-Sent Events (workvera_backend/streams.py, served via asgi.py)
+# Broker class for the pubsub fan-out; the default only reaches streams in the same process
+PUBSUB_BROKER = 'workvera_backend.pubsub.InProcessBroker'
+# Seconds between keep-alive comments on an idle stream
+LIVE_STREAM_HEARTBEAT = 15
+# Seconds a stream ticket (POST /api/users/stream-ticket/) can be used to open a stream
+LIVE_STREAM_TICKET_MAX_AGE = 60
+
+# Per-request timings (workvera_backend/instrumentation.py), shown at /api/admin_analytics/admin/performance/
+# Off unless the environment sets PERF_INSTRUMENTATION_ENABLED=1: it wraps every DB connection and serializer.data
+PERF_INSTRUMENTATION_ENABLED = os.environ.get('PERF_INSTRUMENTATION_ENABLED') == '1'
+# Number of recent requests kept in memory
+PERF_BUFFER_SIZE = 500
+# Log requests slower than this many ms with their slowest queries (None: don't log)
+PERF_SLOW_REQUEST_MS = 1000
+
 # MEDIA_URL and MEDIA_ROOT are defined for file uploads
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    # Profile resumes and video pitches, deduplicated by SHA-256 (users/storage.py)
+    'profile_media': {'BACKEND': 'users.storage.ContentAddressedStorage'},
+}
+# Django's default handlers, plus a SHA-256 of each uploaded file computed as it streams in
+FILE_UPLOAD_HANDLERS = [
+    'users.storage.Sha256MemoryFileUploadHandler',
+    'users.storage.Sha256TemporaryFileUploadHandler',
+]
+
+# Resumable profile uploads (users/uploads.py): largest file per Profile field, and largest chunk
+CHUNKED_UPLOAD_MAX_SIZES = {
+    'resume': 10 * 1024 * 1024,
+    'video_pitch': 500 * 1024 * 1024,
+}
+CHUNKED_UPLOAD_MAX_CHUNK_SIZE = 16 * 1024 * 1024
+# Profile files are served by users.media (MEDIA_URL isn't routed): signed links stay valid 1-2x this many seconds
+PROFILE_MEDIA_URL_MAX_AGE = 3600
+# Internal nginx location for the files, e.g. '/protected-media/'; None: the app sends them itself
+PROFILE_MEDIA_ACCEL_REDIRECT = None
+# Seconds each process remembers which blob a stored media name points to (users/storage.py)
+PROFILE_MEDIA_LOOKUP_TTL = 60
+# Worker processes that extract resume text for candidate search (users/resumes.py)
+RESUME_EXTRACTION_WORKERS = 2
+# Extracted resume text is cut off after this many characters
+RESUME_TEXT_MAX_CHARS = 200_000
+# Bulk user import (admin_analytics/user_import.py): password hashing processes (None: one per CPU)
+USER_IMPORT_HASH_WORKERS = None
+# Largest file accepted by POST /api/admin_analytics/admin/users/import/
+USER_IMPORT_MAX_BYTES = 100 * 1024 * 1024
+
 # Email Configuration
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
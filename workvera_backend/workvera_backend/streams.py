@@ -0,0 +1,105 @@
+"""
+Server-Sent Events helpers for the live update endpoints:
+- GET /api/community/posts/<id>/stream/   new comments on a post (community/streams.py)
+- GET /api/jobs/applications/stream/      status changes of the seeker's applications (jobs/streams.py)
+
+Each open stream is an async generator parked on a pubsub subscription, so an idle
+client costs no thread and no queries. These views must be served by an ASGI
+server (e.g. ``uvicorn workvera_backend.asgi:application``); under WSGI every stream
+would hold a worker thread for as long as it is open.
+
+Browsers' EventSource can't send an Authorization header, so streams that need a user
+take a stream ticket instead: ``?ticket=<ticket>``, from POST /api/users/stream-ticket/.
+A ticket is the user id, timestamped and signed; it is only checked when the stream
+opens and expires after LIVE_STREAM_TICKET_MAX_AGE seconds, so the auth token itself
+never ends up in URLs or access logs.
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from . import pubsub
+
+# Clients reconnect after this many milliseconds if the connection drops
+RETRY_MS = 5000
+
+_signer = signing.TimestampSigner(salt='workvera_backend.streams')
+
+
+def format_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+async def event_stream(topic, heartbeat=None):
+    """Yield SSE frames for every message published on ``topic`` until the client disconnects."""
+    heartbeat = heartbeat or getattr(settings, 'LIVE_STREAM_HEARTBEAT', 15)
+    subscription = pubsub.get_broker().subscribe(topic)
+    try:
+        # Sent right after subscribing, so a client that got it won't miss later events
+        yield f"retry: {RETRY_MS}\n\n"
+        while True:
+            message = await subscription.get(timeout=heartbeat)
+            if message is None:
+                yield ": keep-alive\n\n"  # stops proxies from closing an idle connection
+            else:
+                yield format_event(message['event'], message['data'])
+    finally:
+        subscription.close()
+
+
+def stream_response(topic):
+    response = StreamingHttpResponse(event_stream(topic), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx: don't buffer the stream
+    return response
+
+
+def error_response(detail, status):
+    return JsonResponse({'detail': detail}, status=status)
+
+
+def ticket_max_age():
+    return getattr(settings, 'LIVE_STREAM_TICKET_MAX_AGE', 60)
+
+
+def issue_ticket(user):
+    """A short-lived ticket that opens ``user``'s streams without an Authorization header."""
+    return _signer.sign(str(user.pk))
+
+
+def ticket_user_id(ticket):
+    """The user id in a valid, unexpired ticket, else None."""
+    try:
+        return int(_signer.unsign(ticket, max_age=ticket_max_age()))
+    except (signing.BadSignature, ValueError):
+        return None
+
+
+@sync_to_async
+def _authenticate_header(request):
+    # Same authentication classes as the API views (CachedTokenAuthentication by default)
+    authenticators = [auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    try:
+        user = Request(request, authenticators=authenticators).user
+    except APIException:
+        return None
+    return user if user.is_authenticated else None
+
+
+async def authenticate(request):
+    """The active user for ``?ticket=`` or the Authorization header, else None."""
+    ticket = request.GET.get('ticket')
+    if not ticket:
+        return await _authenticate_header(request)
+    user_id = ticket_user_id(ticket)
+    if user_id is None:
+        return None
+    return await get_user_model().objects.filter(pk=user_id, is_active=True).afirst()
@@ -0,0 +1,55 @@
+"""
+Test helpers shared by the apps' tests.py modules.
+
+QueryBudgetMixin catches N+1 queries: it requests an endpoint at two page sizes
+(growing the data in between) and fails if the number of SQL queries changes.
+
+    class JobPostQueryTests(QueryBudgetMixin, APITestCase):
+        def test_list(self):
+            self.assertConstantQueries('/api/jobs/posts/', self.create_jobs)
+
+``grow(n)`` must create ``n`` more rows that the endpoint will return.
+"""
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    # (rows on the first request, rows on the second request)
+    query_budget_sizes = (2, 12)
+
+    def count_queries(self, url, params=None, method='get', data=None):
+        """Run one request through self.client and return (response, captured queries)."""
+        with CaptureQueriesContext(connection) as context:
+            if method == 'get':
+                response = self.client.get(url, params or {})
+            else:
+                response = getattr(self.client, method)(url, data, format='json')
+        return response, context.captured_queries
+
+    def assertConstantQueries(self, url, grow, params=None, max_queries=None, status_code=200):
+        """
+        Assert that ``url`` costs the same number of queries for a small and a large page.
+        Returns the query count so callers can pin it further if they want.
+        """
+        small, large = self.query_budget_sizes
+        grow(small)
+        response, small_queries = self.count_queries(url, {**(params or {}), 'page_size': small})
+        self.assertEqual(response.status_code, status_code, response.content[:500])
+
+        grow(large - small)
+        response, large_queries = self.count_queries(url, {**(params or {}), 'page_size': large})
+        self.assertEqual(response.status_code, status_code, response.content[:500])
+
+        if len(small_queries) != len(large_queries):
+            sql = '\n'.join(query['sql'] for query in large_queries)
+            self.fail(
+                f"{url} ran {len(small_queries)} queries for {small} rows but "
+                f"{len(large_queries)} for {large} rows; likely an N+1. Queries:\n{sql}"
+            )
+        if max_queries is not None:
+            self.assertLessEqual(
+                len(large_queries), max_queries,
+                f"{url} ran {len(large_queries)} queries, budget is {max_queries}",
+            )
+        return len(large_queries)
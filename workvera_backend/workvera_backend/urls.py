@@ -1,7 +1,5 @@
 from django.contrib import admin
 from django.urls import path, include, re_path
-from django.conf import settings 
-from django.conf.urls.static import static 
 
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
@@ -42,5 +40,4 @@ urlpatterns = [
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
 ]
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+# Media isn't served from MEDIA_URL: profile files need access checks, see users/media.py
\ No newline at end of file
@@ -39,4 +39,18 @@ apiClient.interceptors.response.use(
   }
 );
 
+// List endpoints return one page at a time ({next, previous, results}, 20 rows by default),
+// keyset-paginated: "next" carries a cursor, so each following page costs the same as the first.
+// Pages that show a whole list follow the "next" links, 100 rows per request, and get one array.
+export const fetchAllPages = async (url, config = {}) => {
+  let response = await apiClient.get(url, { ...config, params: { ...config.params, page_size: 100 } });
+  const rows = [];
+  for (;;) {
+    if (Array.isArray(response.data)) return response.data; // unpaginated endpoint
+    rows.push(...(response.data.results || []));
+    if (!response.data.next) return rows;
+    response = await apiClient.get(response.data.next); // keeps the filters and page_size
+  }
+};
+
 export default apiClient;
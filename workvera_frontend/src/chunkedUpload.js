@@ -0,0 +1,61 @@
+import apiClient from './api';
+
+// Resumable upload of a profile file (resume / video_pitch) in chunks.
+// See workvera_backend/users/uploads.py for the protocol.
+const CHUNK_SIZE = 4 * 1024 * 1024; // 4MB
+const MAX_RETRIES = 5;
+
+const sha256Hex = async (blob) => {
+  const digest = await crypto.subtle.digest('SHA-256', await blob.arrayBuffer());
+  return Array.from(new Uint8Array(digest)).map((b) => b.toString(16).padStart(2, '0')).join('');
+};
+
+// Remember the upload id per file, so a reload or dropped connection continues where it stopped
+const storageKey = (file, field) => `chunkedUpload:${field}:${file.name}:${file.size}:${file.lastModified}`;
+
+const findPendingUpload = async (file, field) => {
+  const id = localStorage.getItem(storageKey(file, field));
+  if (!id) return null;
+  try {
+    return (await apiClient.get(`/users/profile/me/uploads/${id}/`)).data;
+  } catch (err) {
+    localStorage.removeItem(storageKey(file, field)); // finished, aborted or purged
+    return null;
+  }
+};
+
+export const uploadProfileFile = async (file, field, onProgress = () => {}) => {
+  let upload = await findPendingUpload(file, field);
+  if (!upload) {
+    const response = await apiClient.post('/users/profile/me/uploads/', { field, filename: file.name, size: file.size });
+    upload = response.data;
+    localStorage.setItem(storageKey(file, field), upload.id);
+  }
+
+  let offset = upload.offset;
+  let retries = 0;
+  while (offset < file.size) {
+    const chunk = file.slice(offset, Math.min(offset + CHUNK_SIZE, file.size));
+    try {
+      const response = await apiClient.put(`/users/profile/me/uploads/${upload.id}/`, chunk, {
+        headers: {
+          'Content-Type': 'application/octet-stream',
+          'Content-Range': `bytes ${offset}-${offset + chunk.size - 1}/${file.size}`,
+          'X-Chunk-SHA256': await sha256Hex(chunk),
+        },
+      });
+      offset = response.data.offset;
+      retries = 0;
+      onProgress(offset / file.size);
+    } catch (err) {
+      // The server answers with the offset it expects next (409 / 422); otherwise ask for it
+      retries += 1;
+      if (retries > MAX_RETRIES) throw err;
+      offset = err.response?.data?.offset ?? (await apiClient.get(`/users/profile/me/uploads/${upload.id}/`)).data.offset;
+    }
+  }
+
+  const response = await apiClient.post(`/users/profile/me/uploads/${upload.id}/complete/`);
+  localStorage.removeItem(storageKey(file, field));
+  return response.data; // the updated profile
+};
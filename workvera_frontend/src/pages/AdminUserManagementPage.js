@@ -1,6 +1,6 @@
 import React, { useState, useEffect, useMemo } from 'react';
 import { Link } from 'react-router-dom';
-import apiClient from '../api'; 
+import { fetchAllPages } from '../api'; 
 import { useAuth } from '../contexts/AuthContext'; 
 import LoadingSpinner from '../components/LoadingSpinner'; 
 import AlertMessage from '../components/AlertMessage'; 
@@ -70,8 +70,7 @@ const AdminUserManagementPage = () => {
       if (filters.search) params.search = filters.search; 
 
       // The backend API /api/core/admin/users/ should handle authorization (admin only)
-      const response = await apiClient.get('/admin_analytics/admin/users/', { params });
-      setUsers(response.data.results || response.data || []); 
+      setUsers(await fetchAllPages('/admin_analytics/admin/users/', { params }));
     } catch (err) {
       console.error("Failed to fetch users:", err);
       if (err.response && err.response.status === 403) {
@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useRef } from 'react';
 import { Link, useNavigate } from 'react-router-dom';
 import apiClient from '../api'; 
+import { uploadProfileFile } from '../chunkedUpload';
 import { useAuth } from '../contexts/AuthContext'; 
 import LoadingSpinner from '../components/LoadingSpinner'; 
 import AlertMessage from '../components/AlertMessage'; 
@@ -21,6 +22,7 @@ const EditProfilePage = () => {
   const [videoFile, setVideoFile] = useState(null);
   const [isLoading, setIsLoading] = useState(true); 
   const [isSaving, setIsSaving] = useState(false); 
+  const [uploadProgress, setUploadProgress] = useState(null);
   const [error, setError] = useState('');
   const [success, setSuccess] = useState('');
   const navigate = useNavigate();
@@ -110,9 +112,8 @@ const EditProfilePage = () => {
     }
 
 
-    if (videoFile) {
-      profilePayload.append('video_pitch', videoFile);
-    } else if (!profileData.existingVideoUrl && videoFile !== undefined) {
+    // A new video pitch is sent separately in resumable chunks (see chunkedUpload.js)
+    if (!videoFile && !profileData.existingVideoUrl && videoFile !== undefined) {
       profilePayload.append('video_pitch', '');
     }
 
@@ -124,7 +125,13 @@ const EditProfilePage = () => {
         setAuthUser(userUpdateResponse.data); 
       }
 
-      // 2. Update Profile fields
+      // 2. Upload a new video pitch in chunks
+      if (videoFile) {
+        await uploadProfileFile(videoFile, 'video_pitch', setUploadProgress);
+        setUploadProgress(null);
+      }
+
+      // 3. Update Profile fields
       const profileUpdateResponse = await apiClient.put('/users/profile/me/', profilePayload, {
         headers: { 'Content-Type': 'multipart/form-data' },
       });
@@ -260,6 +267,7 @@ const EditProfilePage = () => {
                 accept="video/mp4,video/quicktime,video/x-msvideo,video/webm" onChange={handleFileChange}
                 className="block w-full text-sm text-gray-600 file:mr-4 file:py-2 file:px-4 file:rounded-md file:border-0 file:text-sm file:font-semibold file:bg-indigo-100 file:text-indigo-700 hover:file:bg-indigo-200 cursor-pointer" />
             {videoFile && <p className="text-xs text-green-600 mt-1">New file selected: {videoFile.name}</p>}
+            {uploadProgress !== null && <p className="text-xs text-blue-600 mt-1">Uploading video pitch: {Math.round(uploadProgress * 100)}%</p>}
         </div>
 
         <div className="pt-5">
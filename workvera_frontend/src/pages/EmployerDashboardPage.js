@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
-import apiClient from '../api'; 
+import { fetchAllPages } from '../api'; 
 import { useAuth } from '../contexts/AuthContext'; 
 import LoadingSpinner from '../components/LoadingSpinner'; 
 import AlertMessage from '../components/AlertMessage'; 
@@ -23,23 +23,11 @@ const EmployerDashboardPage = () => {
       setError('');
       try {
         // Fetch job posts by this employer
-        const jobsRes = await apiClient.get('/jobs/posts/'); 
-        const posts = jobsRes.data.results || jobsRes.data;
+        const posts = await fetchAllPages('/jobs/posts/my-posts/');
         setJobPosts(posts);
 
-  
-        let totalApps = 0;
-        if (posts.length > 0) {
-          
-          // Consider a backend endpoint like /api/employer/dashboard-summary/
-          const appCountPromises = posts.map(post =>
-            apiClient.get(`/jobs/applications/`, { params: { job_id: post.id, limit: 1 } }) 
-              .then(res => res.data.count || (res.data.results || res.data).length) 
-              .catch(() => 0) 
-          );
-          const counts = await Promise.all(appCountPromises);
-          totalApps = counts.reduce((sum, count) => sum + count, 0);
-        }
+        // Each of the employer's own posts carries its application funnel counts
+        const totalApps = posts.reduce((sum, post) => sum + ((post.application_counts || {}).total || 0), 0);
         setApplicationsCount(totalApps);
 
       } catch (err) {
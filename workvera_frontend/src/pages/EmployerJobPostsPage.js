@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
-import apiClient from '../api'; 
+import { fetchAllPages } from '../api'; 
 import { useAuth } from '../contexts/AuthContext'; 
 import LoadingSpinner from '../components/LoadingSpinner'; 
 import AlertMessage from '../components/AlertMessage'; 
@@ -50,8 +50,7 @@ const EmployerJobPostsPage = () => {
     setError('');
     try {
       // Calls the new dedicated endpoint for employer's own posts
-      const response = await apiClient.get('/jobs/posts/my-posts/'); 
-      setJobPosts(response.data.results || response.data || []); 
+      setJobPosts(await fetchAllPages('/jobs/posts/my-posts/'));
     } catch (err) {
       console.error("Failed to fetch employer job posts:", err);
       setError('Failed to load your job posts. Please try again.');
@@ -1,6 +1,6 @@
 import React, { useState, useEffect, useMemo } from 'react';
 import { Link } from 'react-router-dom';
-import apiClient from '../api'; 
+import { fetchAllPages } from '../api'; 
 import { useAuth } from '../contexts/AuthContext'; 
 import LoadingSpinner from '../components/LoadingSpinner'; 
 import AlertMessage from '../components/AlertMessage'; 
@@ -77,12 +77,11 @@ const ForumPage = () => {
       setIsLoading(true);
       setError('');
       try {
-        const params = {};
+        const params = { sort: 'hot' }; // most active discussions first
         // if (searchTerm) params.search = searchTerm; 
         // if (filterCategory && filterCategory !== "All") params.category = filterCategory; 
 
-        const response = await apiClient.get('/community/posts/', { params });
-        setAllPosts(response.data.results || response.data || []); 
+        setAllPosts(await fetchAllPages('/community/posts/', { params }));
       } catch (err) {
         console.error("Failed to fetch forum posts:", err);
         setError('Failed to load forum posts. Please try again later.');
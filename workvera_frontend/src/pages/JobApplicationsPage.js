@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useParams, Link } from 'react-router-dom';
-import apiClient from '../api'; 
+import apiClient, { fetchAllPages } from '../api'; 
 import LoadingSpinner from '../components/LoadingSpinner';
 import AlertMessage from '../components/AlertMessage'; 
 import { useAuth } from '../contexts/AuthContext'; 
@@ -120,7 +120,7 @@ const JobApplicationsPage = () => {
       try {
         const [jobRes, appsRes] = await Promise.all([
           apiClient.get(`/jobs/posts/${jobId}/`), 
-          apiClient.get(`/jobs/applications/`, { params: { job_id: jobId } }) // Fetch applications for this job
+          fetchAllPages(`/jobs/applications/`, { params: { job: jobId } }) // Fetch applications for this job
         ]);
         
         // Ensure the current employer owns this job post
@@ -130,7 +130,7 @@ const JobApplicationsPage = () => {
             setApplications([]);
         } else {
             setJobDetails(jobRes.data);
-            setApplications(appsRes.data.results || appsRes.data || []); 
+            setApplications(appsRes);
         }
 
       } catch (err) {
@@ -31,9 +31,8 @@ const JobDetailPage = () => {
         // Check if user has already applied (if logged in and seeker)
         if (user && user.role === 'seeker') {
             try {
-                const applicationsResponse = await apiClient.get('/jobs/applications/'); 
-                const userApplications = applicationsResponse.data.results || applicationsResponse.data;
-                if (userApplications.some(app => app.job === parseInt(jobId))) {
+                const applicationsRes = await apiClient.get('/jobs/applications/', { params: { job: jobId, page_size: 1 } });
+                if (applicationsRes.data.results.length > 0) {
                     setIsApplied(true);
                 } else {
                     setIsApplied(false);
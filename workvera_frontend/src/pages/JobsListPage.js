@@ -128,7 +128,7 @@ const JobsListPage = () => {
   const [jobs, setJobs] = useState([]);
   const [isLoading, setIsLoading] = useState(true); 
   const [error, setError] = useState('');
-  const [filters, setFilters] = useState({ skill_tags: '', gap_friendly: '', search: '' }); 
+  const [filters, setFilters] = useState({ skill_tags: '', skill_match: 'any', gap_friendly: '', search: '' }); 
   const [applyingJobId, setApplyingJobId] = useState(null);
   const [applicationStatus, setApplicationStatus] = useState({}); 
   const { user } = useAuth();
@@ -146,8 +146,11 @@ const JobsListPage = () => {
     // console.log(`[FETCH_JOBS] Page: ${page}, Filters:`, filters); 
     try {
       const params = { page }; 
-      if (filters.search) params.search = filters.search;
-      if (filters.skill_tags) params.skill_tags__icontains = filters.skill_tags; 
+      if (filters.search) params.q = filters.search; // ranked full-text search on the backend
+      if (filters.skill_tags) { // whole skills, case-insensitive ("java" doesn't match "JavaScript")
+        params.skills = filters.skill_tags;
+        params.match = filters.skill_match;
+      }
       if (filters.gap_friendly === 'true') params.gap_friendly = true;
       if (filters.gap_friendly === 'false') params.gap_friendly = false;
 
@@ -277,15 +280,28 @@ const JobsListPage = () => {
             <label htmlFor="skill_tags" className="block text-sm font-medium text-gray-700 mb-1">
               <Tag size={16} className="inline mr-1.5 text-gray-500" /> Skill Tags (comma-separated)
             </label>
-            <input
-              type="text"
-              name="skill_tags"
-              id="skill_tags"
-              value={filters.skill_tags}
-              onChange={handleFilterChange}
-              placeholder="e.g., React, Python"
-              className="w-full px-3 py-2.5 border border-gray-300 rounded-md shadow-sm focus:ring-2 focus:ring-teal-500 focus:border-teal-500 text-sm"
-            />
+            <div className="flex gap-2">
+              <input
+                type="text"
+                name="skill_tags"
+                id="skill_tags"
+                value={filters.skill_tags}
+                onChange={handleFilterChange}
+                placeholder="e.g., React, Python"
+                className="flex-1 min-w-0 px-3 py-2.5 border border-gray-300 rounded-md shadow-sm focus:ring-2 focus:ring-teal-500 focus:border-teal-500 text-sm"
+              />
+              <select
+                name="skill_match"
+                id="skill_match"
+                value={filters.skill_match}
+                onChange={handleFilterChange}
+                title="Jobs with any or all of these skills"
+                className="px-2 py-2.5 border border-gray-300 rounded-md shadow-sm focus:ring-2 focus:ring-teal-500 focus:border-teal-500 text-sm bg-white"
+              >
+                <option value="any">Any</option>
+                <option value="all">All</option>
+              </select>
+            </div>
           </div>
           <div>
             <label htmlFor="gap_friendly" className="block text-sm font-medium text-gray-700 mb-1">
@@ -1,7 +1,7 @@
 // src/pages/MyApplicationsPage.js (Seeker's view of their applications)
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
-import apiClient from '../api'; 
+import apiClient, { fetchAllPages } from '../api'; 
 import LoadingSpinner from '../components/LoadingSpinner'; 
 import AlertMessage from '../components/AlertMessage'; 
 import { useAuth } from '../contexts/AuthContext'; 
@@ -101,8 +101,7 @@ const MyApplicationsPage = () => {
       setIsLoading(true);
       setError('');
       try {
-        const response = await apiClient.get('/jobs/applications/'); 
-        setApplications(response.data.results || response.data || []); 
+        setApplications(await fetchAllPages('/jobs/applications/'));
       } catch (err) {
         console.error("Failed to fetch applications:", err);
         setError('Failed to load your applications. Please try again.');
@@ -114,6 +113,42 @@ const MyApplicationsPage = () => {
     fetchApplications();
   }, [user, authLoading]); // Depend on user and authLoading
 
+  // Live status changes (Server-Sent Events) instead of re-fetching the list
+  useEffect(() => {
+    if (authLoading || !user || user.role !== 'seeker' || typeof EventSource === 'undefined') return undefined;
+    let source = null;
+    let closed = false;
+    // EventSource can't send the auth token, so each connection opens with a short-lived stream ticket
+    const connect = async () => {
+      if (closed) return;
+      try {
+        const { data } = await apiClient.post('/users/stream-ticket/');
+        if (closed) return;
+        source = new EventSource(
+          `${apiClient.defaults.baseURL}/jobs/applications/stream/?ticket=${encodeURIComponent(data.ticket)}`
+        );
+      } catch (err) {
+        console.error("Failed to open the application status stream:", err);
+        return;
+      }
+      source.addEventListener('status', (event) => {
+        const change = JSON.parse(event.data);
+        setApplications(prevApplications => prevApplications.map(application => (
+          application.id === change.id ? { ...application, status: change.status } : application
+        )));
+      });
+      source.onerror = () => {
+        // A reconnect with the used ticket is refused once it expired; get a new one
+        if (source.readyState === EventSource.CLOSED && !closed) setTimeout(connect, 5000);
+      };
+    };
+    connect();
+    return () => {
+      closed = true;
+      if (source) source.close();
+    };
+  }, [user, authLoading]);
+
   if (isLoading || authLoading) return ( // Show loader if either data is loading or auth is still loading
     <div className="flex flex-col justify-center items-center min-h-[calc(100vh-10rem)]">
       <LoadingSpinner size={48} text="Loading Your Applications..." />
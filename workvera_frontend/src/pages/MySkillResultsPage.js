@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
-import apiClient from '../api'; 
+import { fetchAllPages } from '../api'; 
 import LoadingSpinner from '../components/LoadingSpinner'; 
 import AlertMessage from '../components/AlertMessage'; 
 import { useAuth } from '../contexts/AuthContext'; 
@@ -50,8 +50,7 @@ const MySkillResultsPage = () => {
       setError('');
       try {
         // This endpoint should return results for the authenticated user
-        const response = await apiClient.get('/skills/results/me/');
-        setResults(response.data || []); 
+        setResults(await fetchAllPages('/skills/results/me/'));
       } catch (err) {
         console.error("Failed to fetch skill results:", err);
         setError('Failed to load your skill test results. Please try again.');
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useParams, Link, useNavigate, useLocation } from 'react-router-dom';
-import apiClient from '../api'; 
+import apiClient, { fetchAllPages } from '../api'; 
 import { useAuth } from '../contexts/AuthContext'; 
 import LoadingSpinner from '../components/LoadingSpinner'; 
 import AlertMessage from '../components/AlertMessage'; 
@@ -45,8 +45,7 @@ const PostDetailPage = () => {
       setPost(postResponse.data);
       
       // Fetch comments for the post using the custom action:
-      const commentsResponse = await apiClient.get(`/community/posts/${postId}/comments/`);
-      setComments(commentsResponse.data.results || commentsResponse.data || []); 
+      setComments(await fetchAllPages(`/community/posts/${postId}/comments/`));
 
     } catch (err) {
       console.error("Failed to fetch post details or comments:", err);
@@ -68,6 +67,20 @@ const PostDetailPage = () => {
     }
   }, [postId]);
 
+  // Live comments (Server-Sent Events) instead of re-fetching the list
+  useEffect(() => {
+    if (!postId || typeof EventSource === 'undefined') return undefined;
+    const source = new EventSource(`${apiClient.defaults.baseURL}/community/posts/${postId}/stream/`);
+    source.addEventListener('comment', (event) => {
+      const comment = JSON.parse(event.data);
+      if (comment.parent_comment) return; // only top-level comments are listed here
+      setComments(prevComments => (
+        prevComments.some(existing => existing.id === comment.id) ? prevComments : [comment, ...prevComments]
+      ));
+    });
+    return () => source.close();
+  }, [postId]);
+
   const handleCommentSubmit = async (e) => {
     e.preventDefault();
     if (!newComment.trim()) {
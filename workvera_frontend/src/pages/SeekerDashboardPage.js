@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
-import apiClient from '../api'; 
+import apiClient, { fetchAllPages } from '../api'; 
 import { useAuth } from '../contexts/AuthContext'; 
 import LoadingSpinner from '../components/LoadingSpinner'; 
 import AlertMessage from '../components/AlertMessage'; 
@@ -27,8 +27,8 @@ const SeekerDashboardPage = () => {
         const results = await Promise.allSettled([
           apiClient.get('/users/profile/me/'),
           // For applications, backend should filter by the authenticated user (seeker)
-          apiClient.get('/jobs/applications/'), 
-          apiClient.get('/skills/results/me/')
+          fetchAllPages('/jobs/applications/'),
+          fetchAllPages('/skills/results/me/')
         ]);
 
         if (results[0].status === 'fulfilled') {
@@ -39,13 +39,13 @@ const SeekerDashboardPage = () => {
         }
 
         if (results[1].status === 'fulfilled') {
-          setApplications(results[1].value.data.results || results[1].value.data); 
+          setApplications(results[1].value);
         } else {
           console.error("Failed to fetch applications:", results[1].reason);
         }
 
         if (results[2].status === 'fulfilled') {
-          setSkillResults(results[2].value.data);
+          setSkillResults(results[2].value);
         } else {
           console.error("Failed to fetch skill results:", results[2].reason);
         }
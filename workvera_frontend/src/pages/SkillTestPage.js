@@ -50,8 +50,8 @@ const SkillTestPage = () => {
         setTestDetails(testDetailsResponse.data);
         
         // Check if user already submitted for this test
-        const resultsResponse = await apiClient.get('/skills/results/me/'); 
-        const previousAttempt = resultsResponse.data.find(result => result.test === parseInt(testId));
+        const attemptsRes = await apiClient.get('/skills/results/me/', { params: { test: testId, page_size: 1 } });
+        const previousAttempt = attemptsRes.data.results[0];
         if (previousAttempt) {
             setIsAttempted(true);
             setSubmissionResult({ 
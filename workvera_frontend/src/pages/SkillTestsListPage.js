@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
-import apiClient from '../api'; 
+import { fetchAllPages } from '../api'; 
 import LoadingSpinner from '../components/LoadingSpinner'; 
 import AlertMessage from '../components/AlertMessage'; 
 import { useAuth } from '../contexts/AuthContext'; 
@@ -43,8 +43,7 @@ const SkillTestsListPage = () => {
       setError('');
       try {
         // Add filter params if implemented: { params: filters }
-        const response = await apiClient.get('/skills/tests/');
-        setTests(response.data.results || response.data || []); 
+        setTests(await fetchAllPages('/skills/tests/'));
       } catch (err) {
         console.error("Failed to fetch skill tests:", err);
         setError('Failed to load skill tests. Please try again later.');